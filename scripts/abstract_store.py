@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for talk and publication abstracts.
+
+The same talk is often given at many venues with an identical abstract.
+Records keep only the abstract's id (a hash of its text) and the text is
+kept once, in the store, and resolved when a page or CV section is written.
+The CV data (data/cv/, see cv_data.py) carries `abstract_id` in place of
+`abstract`; data/abstracts.json maps each id to its text (in Hugo:
+`index site.Data.abstracts .abstract_id`).
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from paths import PROJECT_DIR
+
+ABSTRACTS_PATH = PROJECT_DIR / "data" / "abstracts.json"
+
+ID_LENGTH = 16  # hex digits of sha256
+
+
+def abstract_id(text):
+    """Id of an abstract's text ("" for no abstract)."""
+    if not text:
+        return ""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:ID_LENGTH]
+
+
+class AbstractStore:
+    """id → abstract text, each distinct text stored once."""
+
+    def __init__(self):
+        self.texts = {}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def put(self, text):
+        """Store `text` and return its id."""
+        ref = abstract_id(text)
+        if ref:
+            self.texts.setdefault(ref, text)
+        return ref
+
+    def get(self, ref):
+        """The text for an id ("" for no abstract)."""
+        return self.texts.get(ref, "") if ref else ""
+
+    def save(self, path=ABSTRACTS_PATH, ids=None):
+        """Write {id: text} for `ids` (default: all), sorted by id.
+
+        Ids not stored in this process (their collection was not rebuilt) keep
+        the text already in the file. The file is left untouched if its
+        content would not change; returns whether it was written.
+        """
+        path = Path(path)
+        old = path.read_text(encoding="utf-8") if path.exists() else ""
+        saved = json.loads(old) if old else {}
+        ids = self.texts if ids is None else ids
+        texts = {ref: self.texts.get(ref, saved.get(ref, "")) for ref in sorted(ids) if ref}
+        data = json.dumps(texts, indent=2, ensure_ascii=False) + "\n"
+        if data == old:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(data, encoding="utf-8")
+        return True
+
+
+# Shared by every record built in this process (see records.py)
+ABSTRACTS = AbstractStore()
+
+
+def store_abstract(entry, store=ABSTRACTS):
+    """Copy of a JSON entry with its "abstract" text replaced by "abstract_id"."""
+    return {
+        ("abstract_id" if key == "abstract" else key): (store.put(value) if key == "abstract" else value)
+        for key, value in entry.items()
+    }
@@ -1,16 +1,17 @@
 #!/usr/bin/env python3
 """
-build-cv.py — Generate a moderncv LaTeX CV from data/cv.json and compile to PDF.
+build-cv.py — Generate a moderncv LaTeX CV from data/cv/ and compile to PDF.
 Generates the .tex from scratch (no external template needed).
 """
 
-import json
 import re
 import shutil
 import subprocess
 import sys
 from pathlib import Path
-from collections import OrderedDict
+
+from coauthors import is_self, parse_authors
+from cv_data import load_cv
 
 ENABLED_SECTIONS = {
     "positions": True,
@@ -24,6 +25,13 @@ ENABLED_SECTIONS = {
     "conferences": True,
 }
 
+# Section → the data/cv/ collection it is built from
+SECTION_DATA = {
+    "publications": "publications",
+    "talks": "series",
+    "conferences": "conferences",
+}
+
 
 def tex_escape(s: str) -> str:
     for old, new in [
@@ -35,12 +43,9 @@ def tex_escape(s: str) -> str:
     return s
 
 
-def highlight_name(authors: str) -> str:
-    escaped = tex_escape(authors)
-    for pat in ["Jaume de Dios Pont", "de Dios Pont, J.", "Jaume de Dios"]:
-        esc_pat = tex_escape(pat)
-        escaped = escaped.replace(esc_pat, r"\textbf{" + esc_pat + "}")
-    return escaped
+def highlight_name(author_list) -> str:
+    return ", ".join(r"\textbf{" + tex_escape(a) + "}" if is_self(a) else tex_escape(a)
+                     for a in author_list)
 
 
 def build_publications_tex(pubs):
@@ -49,7 +54,7 @@ def build_publications_tex(pubs):
     lines = [r"\section{Publications \& Preprints}", r"\begin{enumerate}[leftmargin=*, label={[\arabic*]}]"]
     for p in pubs:
         title = tex_escape(p.get("title", ""))
-        authors = highlight_name(p.get("authors", ""))
+        authors = highlight_name(p.get("author_list") or parse_authors(p.get("authors", "")))
         journal = tex_escape(p.get("journal", ""))
         arxiv_url = p.get("arxiv_url", "")
         link = f" \\href{{{arxiv_url}}}{{arXiv}}" if arxiv_url else ""
@@ -58,25 +63,23 @@ def build_publications_tex(pubs):
     return "\n".join(lines)
 
 
-def build_talks_tex(talks):
-    if not talks:
+def build_talks_tex(series, pubs=()):
+    """One item per talk series (data/cv/series.json), most recently given first,
+    citing the [n] of its related papers in the publications list."""
+    if not series:
         return ""
-    grouped = OrderedDict()
-    for t in sorted(talks, key=lambda x: x.get("date", ""), reverse=True):
-        title = t.get("title", "").strip()
-        if not title:
-            continue
-        if title not in grouped:
-            grouped[title] = []
-        event = t.get("event", "")
-        date = t.get("date", "")[:10] if t.get("date") else ""
-        grouped[title].append(f"{tex_escape(event)} ({date})")
+    numbers = {p.get("title", ""): i + 1 for i, p in enumerate(pubs)}
     lines = [r"\section{Selected Talks}", r"\begin{itemize}[leftmargin=*, nosep]"]
-    for title, venues in grouped.items():
+    for s in sorted(series, key=lambda x: x.get("last", ""), reverse=True):
+        title = s.get("title", "")
+        deliveries = sorted(s.get("deliveries", []), key=lambda d: d.get("date", ""), reverse=True)
+        venues = [f"{tex_escape(d.get('event', ''))} ({d.get('date', '')[:10]})" for d in deliveries]
         venues_str = "; ".join(venues[:5])
         if len(venues) > 5:
             venues_str += f" +{len(venues)-5} more"
-        lines.append(f"  \\item \\textit{{{tex_escape(title)}}}. {venues_str}.")
+        cited = sorted(numbers[t] for t in s.get("papers", []) if t in numbers)
+        cite = f" [{', '.join(str(n) for n in cited)}]" if cited else ""
+        lines.append(f"  \\item \\textit{{{tex_escape(title)}}}{cite}. {venues_str}.")
     lines.append(r"\end{itemize}")
     return "\n".join(lines)
 
@@ -96,7 +99,7 @@ def build_conferences_tex(confs):
 
 def generate_cv_tex(data):
     pubs = data.get("publications", [])
-    talks = data.get("talks", [])
+    series = data.get("series", [])
     confs = data.get("conferences", [])
     sections = []
 
@@ -144,7 +147,8 @@ Harmonic Analysis, Elliptic PDEs \& Spectral Theory, Convex Geometry, AI for Mat
     if ENABLED_SECTIONS.get("publications"):
         sections.append(build_publications_tex(pubs))
     if ENABLED_SECTIONS.get("talks"):
-        sections.append(build_talks_tex(talks))
+        # Related papers are cited by number only when the list is printed
+        sections.append(build_talks_tex(series, pubs if ENABLED_SECTIONS.get("publications") else ()))
 
     if ENABLED_SECTIONS.get("teaching"):
         sections.append(r"""\section{Teaching}
@@ -174,11 +178,11 @@ Referee for: Transactions of the AMS, Proceedings of the AMS, Mathematical Stati
 
 
 def main():
-    data_file = Path("data/cv.json")
     output_dir = Path("cv/output")
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    data = json.loads(data_file.read_text()) if data_file.exists() else {}
+    # Only the collections of enabled sections
+    data = load_cv(*(name for section, name in SECTION_DATA.items() if ENABLED_SECTIONS.get(section)))
     tex_content = generate_cv_tex(data)
 
     processed = output_dir / "cv.tex"
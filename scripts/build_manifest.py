@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Input-hash build manifest shared by the generator scripts.
+
+Each pipeline stage (e.g. "sync_spreadsheet:talks page", "generate_cv:gen_talks")
+records a hash of everything it reads — tab CSVs, the generating script and
+every local module it imports (templates, record types, indexes), and the
+environment settings that change its output (CONFIG_ENV) — plus a hash of
+each file it wrote. On the next run a stage is
+skipped when its input hash is unchanged and its outputs are still exactly what
+it wrote last time.
+
+The manifest lives in cache/build-manifest.json.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from paths import PROJECT_DIR
+
+MANIFEST_PATH = PROJECT_DIR / "cache" / "build-manifest.json"
+
+# Read size for hashing large files
+CHUNK_SIZE = 1 << 16
+
+# Environment settings that change what stages write: the sheet read (see
+# paths.py) and the name variants rendered as the site owner (coauthors.py)
+CONFIG_ENV = ("SHEET_ID", "SELF_NAMES")
+
+
+def file_hash(path):
+    """sha256 of a file's bytes, or "" if it does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return ""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def relpath(path):
+    """Path relative to the project root (as recorded in the manifest)."""
+    path = Path(path).resolve()
+    try:
+        return str(path.relative_to(PROJECT_DIR.resolve()))
+    except ValueError:
+        return str(path)
+
+
+def config_values():
+    """This run's CONFIG_ENV settings, as input-hash values."""
+    return [f"{name}={os.environ.get(name, '')}" for name in CONFIG_ENV]
+
+
+@lru_cache(maxsize=None)
+def module_closure(script):
+    """`script` and every scripts/ module it imports, directly or not, sorted.
+
+    Found by reading the import statements (including ones inside
+    functions), so the result does not depend on what happens to be loaded.
+    """
+    seen = set()
+    todo = [Path(script).resolve()]
+    while todo:
+        path = todo.pop()
+        if path in seen or not path.exists():
+            continue
+        seen.add(path)
+        tree = ast.parse(path.read_text(encoding="utf-8"), str(path))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                todo.append(path.parent / f"{name.split('.')[0]}.py")
+    return tuple(sorted(seen))
+
+
+def input_hash(files=(), values=()):
+    """Combined hash of the given input files and extra string values."""
+    h = hashlib.sha256()
+    for path in files:
+        h.update(relpath(path).encode("utf-8") + b"\0")
+        h.update(file_hash(path).encode("ascii") + b"\0")
+    for value in values:
+        h.update(str(value).encode("utf-8") + b"\0")
+    return h.hexdigest()
+
+
+class BuildManifest:
+    """Per-stage input/output hashes from the previous run.
+
+    With force=True every stage is treated as stale (the --force flag).
+    """
+
+    def __init__(self, path=MANIFEST_PATH, force=False):
+        self.path = Path(path)
+        self.force = force
+        self.reused = []
+        self.built = []
+        self.stages = {}
+        if self.path.exists():
+            try:
+                self.stages = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError:
+                print(f"WARNING: ignoring unreadable {self.path}", file=sys.stderr)
+
+    def is_current(self, stage, key, outputs):
+        """True if `stage` last ran with input hash `key` and its outputs are intact."""
+        entry = self.stages.get(stage)
+        if self.force or not entry or entry.get("inputs") != key:
+            return False
+        recorded = entry.get("outputs", {})
+        for path in outputs:
+            if recorded.get(relpath(path)) != file_hash(path):
+                return False
+        # Files written last time that are gone or edited since
+        for path, digest in recorded.items():
+            if file_hash(PROJECT_DIR / path) != digest:
+                return False
+        self.reused.append(stage)
+        return True
+
+    def record(self, stage, key, outputs):
+        """Record a stage that has just written `outputs` from inputs hashing to `key`."""
+        self.stages[stage] = {
+            "inputs": key,
+            "outputs": {relpath(p): file_hash(p) for p in outputs},
+        }
+        self.built.append(stage)
+
+    def save(self):
+        self.path.parent.mkdir(exist_ok=True)
+        self.path.write_text(json.dumps(self.stages, indent=2, sort_keys=True) + "\n",
+                             encoding="utf-8")
+
+    def report(self):
+        """Print which stages were rebuilt and which were reused."""
+        if self.reused:
+            print(f"  Reused {len(self.reused)} unchanged stage(s): {', '.join(self.reused)}")
+        if self.built:
+            print(f"  Rebuilt {len(self.built)} stage(s): {', '.join(self.built)}")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Co-author index: author lists parsed once, with an inverted index from each
+co-author to the publications you share.
+
+Publication records parse their `authors` string once (records.Publication
+.author_list); every renderer works from that list:
+  - data/cv/publications.json gets `authors` joined from it
+  - generate_cv.format_authors and build-cv.py mark the site owner's name
+    with is_self() instead of searching the string for name variants
+  - data/cv/coauthors.json and the pages under content/coauthors/ come from
+    the CoauthorIndex (records.Collection.coauthors)
+
+Names are matched on a normalized key (case, accents, dots and "Last, First"
+order ignored), so "José Madrid" and "Jose Madrid" are one co-author.
+"""
+
+import os
+import re
+import unicodedata
+
+# How the site owner's name appears in author lists; SELF_NAMES in the
+# environment ("; "-separated) replaces them for another site (see farm.py)
+SELF_NAMES = tuple(n.strip() for n in os.environ.get("SELF_NAMES", "").split(";") if n.strip()) or (
+    "Jaume de Dios Pont",
+    "J. de Dios Pont",
+    "de Dios Pont, J.",
+    "de Dios Pont, Jaume",
+    "Jaume de Dios",
+    "J. de Dios",
+)
+
+
+# The "First" of a "Last, First" name: one word, or initials ("J.", "J. M.")
+GIVEN_NAME = re.compile(r"[^\W\d_][\w'-]*|(?:[^\W\d_]{1,2}\.\s*(?:-\s*)?)+", re.UNICODE)
+
+
+def parse_authors(authors):
+    """Split an author string into names: on ";" if it has any, else on ",",
+    keeping "Last, First" names ("de Dios Pont, J.") whole."""
+    if ";" in authors:
+        return tuple(name.strip() for name in authors.split(";") if name.strip())
+    names = []
+    joined = False  # whether names[-1] already has its given name
+    for part in (p.strip() for p in authors.split(",")):
+        if not part:
+            continue
+        if names and not joined and GIVEN_NAME.fullmatch(part):
+            names[-1] = f"{names[-1]}, {part}"
+            joined = True
+        else:
+            names.append(part)
+            joined = False
+    return tuple(names)
+
+
+def name_key(name):
+    """Normalized identity of a name."""
+    if "," in name:
+        last, _, first = name.partition(",")
+        name = f"{first} {last}"
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(ch for ch in name if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[.\s]+", " ", name.lower()).split())
+
+
+SELF_KEYS = frozenset(name_key(n) for n in SELF_NAMES)
+
+
+def is_self(name):
+    return name_key(name) in SELF_KEYS
+
+
+def slugify(text):
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^\w\s-]", "", text.lower().strip())
+    return re.sub(r"[\s_-]+", "-", text).strip("-")[:80]
+
+
+class Coauthor:
+    """One co-author and the shared publications, in sheet order."""
+
+    __slots__ = ("key", "name", "slug", "publications")
+
+    def __init__(self, key, name):
+        self.key = key
+        self.name = name
+        self.slug = ""
+        self.publications = []
+
+    @property
+    def count(self):
+        return len(self.publications)
+
+
+class CoauthorIndex:
+    """Co-authors of a publications collection, keyed by normalized name."""
+
+    def __init__(self, publications):
+        self.by_key = {}
+        for p in publications:
+            for name in p.author_list:
+                key = name_key(name)
+                if not key or key in SELF_KEYS:
+                    continue
+                coauthor = self.by_key.get(key)
+                if coauthor is None:
+                    coauthor = self.by_key[key] = Coauthor(key, name)
+                if not coauthor.publications or coauthor.publications[-1] is not p:
+                    coauthor.publications.append(p)
+        taken = set()
+        for coauthor in self.by_key.values():
+            base = slugify(coauthor.name) or "coauthor"
+            slug, n = base, 1
+            while slug in taken:
+                n += 1
+                slug = f"{base}-{n}"
+            taken.add(slug)
+            coauthor.slug = slug
+
+    def __len__(self):
+        return len(self.by_key)
+
+    def __iter__(self):
+        return iter(self.by_key.values())
+
+    def get(self, name):
+        """The Coauthor for a name in any of its spellings, or None."""
+        return self.by_key.get(name_key(name))
+
+    def publications_with(self, name):
+        coauthor = self.get(name)
+        return list(coauthor.publications) if coauthor else []
+
+    def by_count(self):
+        """Co-authors, most joint publications first, then by name."""
+        return sorted(self.by_key.values(), key=lambda c: (-c.count, c.key))
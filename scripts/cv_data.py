@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+The CV data under data/cv/: one file per collection plus a small index.
+
+  data/cv/publications.json   [entry, ...]
+  data/cv/conferences.json
+  data/cv/talks.json
+  data/cv/series.json         talks grouped into series (talk_series.py)
+  data/cv/coauthors.json      co-authors and joint publications (coauthors.py)
+  data/cv/index.json          {collection: {"file", "count", "sha256", "abstracts"}}
+
+Hugo sees each collection as site.Data.cv.<collection>. Every collection is
+written on its own (sync_spreadsheet.py gives each its own pipeline stage), so
+a change to one talk rewrites talks.json and the index and nothing else; a
+file whose content would not change is left untouched. The index lists each
+collection's abstract ids, from which data/abstracts.json is kept in step.
+
+The data is date-independent: entries carry their dates but no status such
+as "Current"/"Past", which renderers derive from the build date. The same
+rows always give the same bytes, so these files only change with the sheet.
+
+Consumers call load_cv("talks", ...) to read only the collections they need.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from abstract_store import ABSTRACTS, ABSTRACTS_PATH
+from build_manifest import file_hash
+from paths import PROJECT_DIR
+
+CV_DIR = PROJECT_DIR / "data" / "cv"
+INDEX_NAME = "index.json"
+
+# Before the split everything lived in one file
+LEGACY_PATH = PROJECT_DIR / "data" / "cv.json"
+
+COLLECTIONS = ("publications", "conferences", "talks", "series", "coauthors")
+
+
+def iter_list_chunks(entries):
+    """Yield json.dumps(list(entries), indent=2, ensure_ascii=False) one entry at a time."""
+    empty = True
+    for entry in entries:
+        yield "[\n" if empty else ",\n"
+        text = json.dumps(entry, indent=2, ensure_ascii=False)
+        yield "\n".join("  " + line for line in text.split("\n"))
+        empty = False
+    yield "[]" if empty else "\n]"
+
+
+def read_index(cv_dir=CV_DIR):
+    path = Path(cv_dir) / INDEX_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_if_changed(path, text):
+    """Write `text` to `path` unless it already holds exactly that; returns whether written."""
+    path = Path(path)
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def write_collection(name, entries, cv_dir=CV_DIR, abstracts_path=ABSTRACTS_PATH):
+    """Stream `entries` to data/cv/<name>.json, then update the index and abstracts.
+
+    The file is only replaced if its content changed. Returns whether it was.
+    """
+    cv_dir = Path(cv_dir)
+    cv_dir.mkdir(parents=True, exist_ok=True)
+    path = cv_dir / f"{name}.json"
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    digest = hashlib.sha256()
+    count = 0
+    abstract_ids = set()
+
+    def counted(entries):
+        nonlocal count
+        for entry in entries:
+            count += 1
+            if entry.get("abstract_id"):
+                abstract_ids.add(entry["abstract_id"])
+            yield entry
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for chunk in iter_list_chunks(counted(entries)):
+            f.write(chunk)
+            digest.update(chunk.encode("utf-8"))
+    digest = digest.hexdigest()
+
+    changed = file_hash(path) != digest
+    if changed:
+        os.replace(tmp_path, path)
+        print(f"  Updated {path}")
+    else:
+        tmp_path.unlink()
+        print(f"  {path.name} unchanged")
+
+    index = read_index(cv_dir)
+    index[name] = {
+        "file": path.name,
+        "count": count,
+        "sha256": digest,
+        "abstracts": sorted(abstract_ids),
+    }
+    write_if_changed(cv_dir / INDEX_NAME, json.dumps(index, indent=2, sort_keys=True) + "\n")
+
+    # Keep exactly the abstracts some collection refers to
+    ids = {ref for entry in index.values() for ref in entry.get("abstracts", ())}
+    if ABSTRACTS.save(abstracts_path, ids):
+        print(f"  Updated {abstracts_path}")
+    return changed
+
+
+def load_cv(*names, cv_dir=CV_DIR):
+    """{collection: entries} for the named collections (default: all).
+
+    Falls back to the old single data/cv.json if data/cv/ does not exist.
+    """
+    names = names or COLLECTIONS
+    cv_dir = Path(cv_dir)
+    if not cv_dir.exists() and LEGACY_PATH.exists():
+        data = json.loads(LEGACY_PATH.read_text(encoding="utf-8"))
+        return {name: data.get(name, []) for name in names}
+    data = {}
+    for name in names:
+        path = cv_dir / f"{name}.json"
+        data[name] = json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+    return data
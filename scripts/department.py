@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Department calendar: many researchers' upcoming talks and travel, merged.
+
+Each member's site publishes static/upcoming.json (sync_spreadsheet.py's
+"upcoming feed" stage): their talks from today on, sorted by date, and their
+trips not yet over, sorted by start. Each feed is sorted again on load (a
+cheap pass over rows already in order) so a hand-made or older feed cannot
+put the merge out of order; the streams are then k-way merged lazily
+(heapq.merge), so the merge stops at the last row that makes it onto the
+pages.
+
+Config (JSON):
+  {
+    "title": "Mathematics",
+    "members": [
+      {"name": "Jaume de Dios Pont", "feed": "https://jaume.dedios.cat/upcoming.json",
+       "url": "https://jaume.dedios.cat"},
+      {"name": "...", "feed": "path/to/site/static/upcoming.json"}
+    ]
+  }
+
+Writes into --out (default content/department/):
+  _index.md   upcoming talks
+  travel.md   who is travelling where, now and next
+  feed.json   the merged streams
+
+Usage: python3 scripts/department.py CONFIG [--out DIR] [--days N] [--limit N] [--today YYYY-MM-DD]
+  --days N: only look N days ahead (default: 180)
+  --limit N: at most N talks and N trips (default: no limit)
+"""
+
+import heapq
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from itertools import islice, takewhile
+from pathlib import Path
+
+import http_client
+from cv_data import write_if_changed
+from paths import PROJECT_DIR
+from sheet_data import FETCH_WORKERS, build_date, get_option, write_lines
+from sync_spreadsheet import format_date_range, format_month_day
+from templates import table_escape, yaml_escape
+
+OUT_DIR = PROJECT_DIR / "content" / "department"
+
+DEFAULT_DAYS = 180
+
+
+# ─── Member feeds ───
+
+def load_feed(source):
+    """A member's upcoming.json, from a URL (through the HTTP cache) or a path."""
+    if source.startswith(("http://", "https://")):
+        resp = http_client.get(source)
+        resp.raise_for_status()
+        return json.loads(resp.content)
+    return json.loads(Path(source).read_text(encoding="utf-8"))
+
+
+def parse_feed(member, feed):
+    """A member's feed as {"talks": [(day, talk)], "travel": [(start, end, trip)]},
+    sorted by day and start (ties keep feed order); entries without a valid
+    date (or a talk title) are skipped."""
+    def day(entry, field):
+        return date.fromisoformat(entry[field])
+
+    talks, travel, skipped = [], [], 0
+    for talk in feed.get("talks", ()):
+        try:
+            if not talk["title"]:
+                raise ValueError("no title")
+            talks.append((day(talk, "date"), talk))
+        except (KeyError, TypeError, ValueError):
+            skipped += 1
+    for trip in feed.get("travel", ()):
+        try:
+            start, end = day(trip, "start"), day(trip, "end")
+            if end < start:
+                raise ValueError("ends before it starts")
+            travel.append((start, end, trip))
+        except (KeyError, TypeError, ValueError):
+            skipped += 1
+    if skipped:
+        print(f"  Warning: skipped {skipped} malformed entries in {member['name']}'s feed",
+              file=sys.stderr)
+    talks.sort(key=lambda item: item[0])
+    travel.sort(key=lambda item: item[0])
+    return {"talks": talks, "travel": travel}
+
+
+def load_feeds(members, workers=FETCH_WORKERS):
+    """Parsed feeds (parse_feed) of every member, in config order; a member whose
+    feed fails is skipped."""
+    def load(member):
+        try:
+            feed = load_feed(member["feed"])
+            if not isinstance(feed, dict):
+                raise ValueError("not a JSON object")
+        except (OSError, ValueError, http_client.HTTPError) as e:
+            print(f"  Warning: no feed for {member['name']}: {e}", file=sys.stderr)
+            feed = {}
+        return parse_feed(member, feed)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(load, members))
+
+
+def talk_stream(member, feed, today):
+    """(day, member, talk) for a member's talks from today on, in date order."""
+    for day, talk in feed["talks"]:
+        if day >= today:  # the feed may be a few days old
+            yield day, member, talk
+
+
+def trip_stream(member, feed, today):
+    """(start, end, member, trip) for a member's trips not yet over, by start."""
+    for start, end, trip in feed["travel"]:
+        if end >= today:
+            yield start, end, member, trip
+
+
+def merged(streams, until, limit=None):
+    """The streams' items by date, up to day `until` (and `limit` items).
+
+    Items on the same day keep the order of the streams (members in config order).
+    """
+    items = heapq.merge(*streams, key=lambda item: item[0])
+    items = takewhile(lambda item: item[0] <= until, items)
+    return list(islice(items, limit))
+
+
+# ─── Pages ───
+
+def speaker(member):
+    return f"[{member['name']}]({member['url']})" if member.get("url") else member["name"]
+
+
+def table_row(*cells):
+    return "| " + " | ".join(table_escape(cell) for cell in cells) + " |"
+
+
+def talks_page_lines(title, talks):
+    yield from ['---', f'title: "{yaml_escape(title)}: upcoming talks"', '---', '']
+    if not talks:
+        yield 'No upcoming talks.'
+        return
+    yield '| Date | Speaker | Talk | Where |'
+    yield '|---|---|---|---|'
+    for day, member, t in talks:
+        talk = f"[{t['title']}]({t['url']})" if t.get("url") else t["title"]
+        where = ", ".join(x for x in (t.get("event"), t.get("location")) if x)
+        yield table_row(f"{format_month_day(day)}, {day.year}", speaker(member), talk, where)
+
+
+def travel_page_lines(title, trips, today):
+    yield from ['---', f'title: "{yaml_escape(title)}: who is travelling where"', '---', '']
+    away = [trip for trip in trips if trip[0] <= today]
+    later = [trip for trip in trips if trip[0] > today]
+    for heading, rows in (("Away now", away), ("Coming up", later)):
+        if not rows:
+            continue
+        yield f'## {heading}'
+        yield ''
+        yield '| Dates | Who | Where | What |'
+        yield '|---|---|---|---|'
+        for start, end, member, t in rows:
+            dates = format_date_range(start, end) if end != start else format_month_day(start)
+            what = f"[{t['title']}]({t['url']})" if t.get("url") else t.get("title") or ""
+            yield table_row(dates, speaker(member), t.get("location") or "", what)
+        yield ''
+    if not trips:
+        yield 'Nobody is travelling.'
+
+
+def feed_json(talks, trips):
+    return {
+        "talks": [dict(t, speaker=member["name"]) for _, member, t in talks],
+        "travel": [dict(t, who=member["name"]) for _, _, member, t in trips],
+    }
+
+
+# ─── Main ───
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1].startswith("--"):
+        print(__doc__)
+        sys.exit(2)
+    config_path = Path(sys.argv[1])
+    try:
+        config = json.loads(config_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot read {config_path}: {e}")
+        sys.exit(1)
+    out_dir = Path(get_option("--out", OUT_DIR))
+    limit = get_option("--limit", None)
+    limit = int(limit) if limit else None
+    today = build_date()
+    until = today + timedelta(days=int(get_option("--days", DEFAULT_DAYS)))
+    title = config.get("title", "Department")
+    members = config.get("members", [])
+
+    print(f"Merging upcoming talks and travel of {len(members)} members...")
+    feeds = load_feeds(members)
+    talks = merged([talk_stream(m, f, today) for m, f in zip(members, feeds)], until, limit)
+    trips = merged([trip_stream(m, f, today) for m, f in zip(members, feeds)], until, limit)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    write_lines(out_dir / "_index.md", talks_page_lines(title, talks))
+    write_lines(out_dir / "travel.md", travel_page_lines(title, trips, today))
+    write_if_changed(out_dir / "feed.json",
+                     json.dumps(feed_json(talks, trips), indent=2, ensure_ascii=False) + "\n")
+    print(f"  {len(talks)} talks and {len(trips)} trips → {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
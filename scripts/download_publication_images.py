@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 
-import requests
 import os
 import re
 from pathlib import Path
 import time
 
+import http_client
+from offline_bundle import bundle_from_args
+
 # Image data from browser extraction
 publication_images = [
     {
@@ -56,19 +58,26 @@ publication_images = [
 ]
 
 def download_image(url, filename):
-    """Download an image from URL to filename"""
+    """Download an image from URL to filename (or copy it out of --bundle PATH)"""
+    bundle = bundle_from_args()
+    if bundle:
+        bundle.extract_url(url, filename)
+        print(f"Extracted from bundle: {filename}")
+        return True
+
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         with open(filename, 'wb') as f:
-            f.write(response.content)
+            for chunk in response.iter_content():
+                f.write(chunk)
         
-        print(f"Downloaded: {filename}")
+        print(f"{'Cached' if response.from_cache else 'Downloaded'}: {filename}")
         return True
     except Exception as e:
         print(f"Error downloading {url}: {e}")
@@ -120,9 +129,11 @@ def main():
             }
             
             # Be nice to the server
-            time.sleep(0.5)
+            if not bundle_from_args():
+                time.sleep(0.5)
     
     print(f"\nDownloaded {len(downloaded_images)} images successfully")
+    http_client.report()
     
     # Save mapping for use in updating Hugo files
     import json
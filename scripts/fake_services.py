@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Offline stand-ins for every external service the scripts talk to.
+
+  serve    an HTTP server that replays recorded responses: gviz CSV exports,
+           the XLSX workbook export, arXiv Atom feeds, event pages, images
+  record   add live responses to a recordings directory
+  run      run a script with every HTTP request sent to the server
+  gog      a fake `gog sheets clear|update` that edits local tab CSVs
+
+Responses come from an offline bundle (--bundle, see offline_bundle.py), a
+recordings directory (--recordings, filled by `record`) and/or a directory of
+tab CSVs (--sheet-dir) that answers gviz requests by gid and is what the fake
+gog writes to, so a merge script's sheet updates show up in the next fetch.
+
+Scripts are pointed at the server by `run`, which replaces http_client's
+`connect` before running them; the fake gog is picked up by putting
+scripts/fake-bin first on PATH with FAKE_GOG_SHEET_DIR set.
+
+Usage:
+  python3 scripts/fake_services.py serve [--port 8765] [--bundle PATH]
+      [--recordings DIR] [--sheet-dir DIR] [--latency MS] [--jitter MS]
+      [--fail-rate P] [--fail-first N] [--fail-status CODE] [--drop-rate P]
+  python3 scripts/fake_services.py record DIR URL...
+  python3 scripts/fake_services.py run HOST:PORT SCRIPT [ARGS...]
+
+  python3 scripts/fake_services.py run 127.0.0.1:8765 scripts/sync_spreadsheet.py --cv
+  PATH=scripts/fake-bin:$PATH FAKE_GOG_SHEET_DIR=/tmp/sheet python3 scripts/merge_travel_data.py
+
+Failure injection (serve):
+  --latency MS / --jitter MS: delay every response by MS plus up to jitter ms
+  --fail-rate P: answer a fraction P of requests with --fail-status (default 503)
+  --fail-first N: fail the first N requests
+  --drop-rate P: close the connection without answering a fraction P of requests
+The fake gog reads FAKE_GOG_LATENCY_MS and FAKE_GOG_FAIL_RATE likewise.
+"""
+
+import csv
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from sheet_data import TABS, get_option
+
+DEFAULT_PORT = 8765
+
+GOG_LOG = "gog.log"
+
+
+# ─── Recordings ───
+
+class Recordings:
+    """URL → response body, from a bundle, a recordings dir and a sheet dir."""
+
+    def __init__(self, bundle=None, recordings=None, sheet_dir=None):
+        self.bodies = {}
+        self.dirs = []
+        self.sheet_dir = Path(sheet_dir) if sheet_dir else None
+        self.tab_by_gid = {gid: name for name, gid in TABS.items()}
+        if bundle:
+            zf = zipfile.ZipFile(bundle)
+            manifest = json.loads(zf.read("manifest.json"))
+            for entry in manifest["entries"]:
+                if entry.get("url"):
+                    self.bodies[entry["url"]] = (zf, entry["name"])
+        if recordings:
+            self.dirs.append(Path(recordings))
+
+    def find(self, host, path):
+        """Body recorded for a request, or None."""
+        parts = urlsplit(path)
+        if self.sheet_dir and "/gviz/" in parts.path:
+            tab = self.tab_by_gid.get(parse_qs(parts.query).get("gid", [""])[0])
+            csv_file = self.sheet_dir / f"{tab}.csv"
+            if tab and csv_file.exists():
+                return csv_file.read_bytes()
+        for scheme in ("https", "http"):
+            url = f"{scheme}://{host}{path}"
+            for d in self.dirs:
+                index = d / "index.json"
+                if index.exists():
+                    name = json.loads(index.read_text(encoding="utf-8")).get(url)
+                    if name and (d / name).exists():
+                        return (d / name).read_bytes()
+            if url in self.bodies:
+                zf, name = self.bodies[url]
+                return zf.read(name)
+        return None
+
+
+def record(directory, urls):
+    """Fetch `urls` live and add them to a recordings directory."""
+    import http_client
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    index_file = directory / "index.json"
+    index = json.loads(index_file.read_text(encoding="utf-8")) if index_file.exists() else {}
+    for url in urls:
+        resp = http_client.get(url, timeout=60, cache=False)
+        if not resp.ok:
+            print(f"  ERROR {resp.status} for {url}", file=sys.stderr)
+            continue
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        (directory / name).write_bytes(resp.content)
+        index[url] = name
+        print(f"  Recorded {url} ({len(resp.content)} bytes)")
+    index_file.write_text(json.dumps(index, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+# ─── Server ───
+
+class Faults:
+    """Latency and failure injection settings for the server."""
+
+    def __init__(self, latency=0, jitter=0, fail_rate=0.0, fail_first=0, fail_status=503,
+                 drop_rate=0.0):
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.fail_rate = fail_rate
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.drop_rate = drop_rate
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def next(self):
+        """Sleep for the configured latency, then say how to answer: "ok", "fail" or "drop"."""
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+        with self.lock:
+            self.requests += 1
+            first = self.requests <= self.fail_first
+        if first or random.random() < self.fail_rate:
+            return "fail"
+        if random.random() < self.drop_rate:
+            return "drop"
+        return "ok"
+
+
+def handler(recordings, faults):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            host = self.headers.get("Host", "")
+            outcome = faults.next()
+            if outcome == "drop":
+                self.log(f"DROP {host}{self.path}")
+                self.close_connection = True
+                return
+            if outcome == "fail":
+                self.log(f"FAIL {host}{self.path}")
+                return self.reply(faults.fail_status, b"")
+
+            body = recordings.find(host, self.path)
+            if body is None:
+                self.log(f"MISS {host}{self.path}")
+                return self.reply(404, b"not recorded\n")
+            etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+            if self.headers.get("If-None-Match") == etag:
+                self.log(f"304  {host}{self.path}")
+                return self.reply(304, b"", {"ETag": etag})
+            self.log(f"200  {host}{self.path}")
+            headers = {"ETag": etag}
+            if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                body = gzip.compress(body)
+                headers["Content-Encoding"] = "gzip"
+            self.reply(200, body, headers)
+
+        def reply(self, status, body, headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log(self, line):
+            print(f"  {line[:120]}", flush=True)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve():
+    port = int(get_option("--port", DEFAULT_PORT))
+    recordings = Recordings(get_option("--bundle", None), get_option("--recordings", None),
+                            get_option("--sheet-dir", None))
+    faults = Faults(
+        latency=float(get_option("--latency", 0)),
+        jitter=float(get_option("--jitter", 0)),
+        fail_rate=float(get_option("--fail-rate", 0)),
+        fail_first=int(get_option("--fail-first", 0)),
+        fail_status=int(get_option("--fail-status", 503)),
+        drop_rate=float(get_option("--drop-rate", 0)),
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler(recordings, faults))
+    print(f"Serving fake services on 127.0.0.1:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+# ─── Running scripts against the server ───
+
+def run(address, script, args):
+    """Run `script` in this process with every new connection opened to `address`.
+
+    Requests keep their Host header and path, which is what the server looks
+    recordings up by. Subprocesses the script starts are not redirected.
+    """
+    import http.client
+    import runpy
+
+    import http_client
+
+    host, _, port = address.partition(":")
+
+    def connect(scheme, _host, _port, timeout):
+        return http.client.HTTPConnection(host, int(port or DEFAULT_PORT), timeout=timeout)
+
+    http_client.connect = connect
+    sys.argv = [script, *args]
+    sys.path.insert(0, str(Path(script).resolve().parent))
+    runpy.run_path(script, run_name="__main__")
+
+
+# ─── Fake gog ───
+
+def column_number(letters):
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + ord(ch) - ord("A") + 1
+    return n
+
+
+def parse_range(spec):
+    """'talks!A2:F2' → ("talks", first_col, first_row, last_col, last_row); rows may be None."""
+    sheet, _, cells = spec.partition("!")
+    m = re.fullmatch(r"([A-Z]+)(\d*)(?::([A-Z]+)(\d*))?", cells.upper())
+    if not m:
+        raise ValueError(f"bad range {spec!r}")
+    c1, r1, c2, r2 = m.groups()
+    if c2 is None:  # a single cell
+        r2 = r1
+    return (sheet.lower(), column_number(c1), int(r1) if r1 else None,
+            column_number(c2 or c1), int(r2) if r2 else None)
+
+
+def read_grid(path):
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def write_grid(path, grid):
+    # Drop trailing empty rows, then write in the gviz layout
+    while grid and not any(grid[-1]):
+        grid.pop()
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerows(grid)
+
+
+def gog(args):
+    """Apply a `gog sheets clear|update SHEET_ID RANGE [VALUES...]` to local CSVs."""
+    sheet_dir = Path(os.environ.get("FAKE_GOG_SHEET_DIR", "."))
+    time.sleep(float(os.environ.get("FAKE_GOG_LATENCY_MS", 0)) / 1000)
+    with open(sheet_dir / GOG_LOG, "a", encoding="utf-8") as log:
+        log.write(json.dumps(args) + "\n")
+    if random.random() < float(os.environ.get("FAKE_GOG_FAIL_RATE", 0)):
+        print("fake gog: injected failure", file=sys.stderr)
+        return 1
+
+    positional = []
+    skip = False
+    for a in args:
+        if skip:
+            skip = False
+        elif a.startswith("--"):
+            skip = "=" not in a
+        else:
+            positional.append(a)
+    if len(positional) < 4 or positional[0] != "sheets" or positional[1] not in ("clear", "update"):
+        print(f"fake gog: unsupported command {' '.join(args)}", file=sys.stderr)
+        return 2
+    command, _sheet_id, spec, values = positional[1], positional[2], positional[3], positional[4:]
+
+    tab, c1, r1, c2, r2 = parse_range(spec)
+    path = sheet_dir / f"{tab}.csv"
+    grid = read_grid(path)
+    if command == "clear":
+        rows = range(r1 or 1, (r2 or len(grid)) + 1)
+        for r in rows:
+            if r <= len(grid):
+                row = grid[r - 1]
+                for c in range(c1, min(c2, len(row)) + 1):
+                    row[c - 1] = ""
+    else:
+        # Either one argument per cell of a single row, or TSV text with a row per line
+        if any("\n" in v or "\t" in v for v in values):
+            new_rows = [line.split("\t") for v in values for line in v.splitlines()]
+        else:
+            new_rows = [values]
+        for i, new in enumerate(new_rows):
+            r = (r1 or 1) + i
+            while len(grid) < r:
+                grid.append([])
+            row = grid[r - 1]
+            for j, value in enumerate(new[: c2 - c1 + 1]):
+                c = c1 + j
+                row.extend([""] * (c - len(row)))
+                row[c - 1] = value
+    write_grid(path, grid)
+    return 0
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("serve", "record", "run", "gog"):
+        print(__doc__)
+        sys.exit(2)
+    command = sys.argv[1]
+    if command == "serve":
+        serve()
+    elif command == "record":
+        if len(sys.argv) < 4:
+            print("Usage: python3 scripts/fake_services.py record DIR URL...")
+            sys.exit(2)
+        record(sys.argv[2], sys.argv[3:])
+    elif command == "run":
+        if len(sys.argv) < 4:
+            print("Usage: python3 scripts/fake_services.py run HOST:PORT SCRIPT [ARGS...]")
+            sys.exit(2)
+        run(sys.argv[2], sys.argv[3], sys.argv[4:])
+    else:
+        sys.exit(gog(sys.argv[2:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Build farm: refresh many researchers' sites in one run.
+
+Each tenant is a site checkout (the same layout as this repository) with its
+own Google Sheet. Tenants build concurrently, each step in its own process
+with the tenant's environment (see sheet_data.py):
+  SITE_DIR=<root>  SHEET_ID=<sheet>  SELF_NAMES=<name variants>
+so a tenant only ever reads and writes its own root; a failing tenant does
+not stop the others. Shared between tenants, under cache/farm/:
+  http/  the HTTP response cache (http_client.py; arXiv responses included)
+  tex/   precompiled LaTeX formats of cv/main.tex's preamble (up to
+         \\endofdump, via mylatexformat), one per distinct preamble
+  hugo/  Hugo's --cacheDir
+
+Tenants (JSON):
+  [
+    {"name": "jaume", "root": "sites/jaume", "sheet_id": "1X7V...",
+     "self_names": ["Jaume de Dios Pont", "J. de Dios Pont", "de Dios Pont, J."]},
+    {"name": "...", "root": "...", "sheet_id": "...", "args": ["--max-age", "3600"]}
+  ]
+Relative roots are relative to the tenants file. Tabs are fetched as one
+workbook export (--xlsx), so tenants' sheets need the same tab names, not the
+same gids. "args" are passed on to sync_spreadsheet.py.
+
+Usage: python3 scripts/farm.py TENANTS.json [--jobs N] [--pdf] [--hugo] [--only NAME,...]
+  --jobs N: tenants built at once (default: number of CPUs)
+  --pdf: compile each tenant's cv/main.tex and copy it to static/cv.pdf
+  --hugo: build each tenant's site into <root>/public
+  --only NAME,...: build only these tenants
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from paths import PROJECT_DIR, SCRIPT_DIR
+from sheet_data import get_option
+
+FARM_DIR = PROJECT_DIR / "cache" / "farm"
+
+# Seconds a single step may take before the tenant is failed
+STEP_TIMEOUT = 900
+
+# The preamble of cv/main.tex that goes into the shared format ends here
+DUMP_MARKER = r"\csname endofdump\endcsname"
+
+
+def load_tenants(path):
+    """Tenant configs from a JSON list, with roots made absolute."""
+    try:
+        tenants = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot read {path}: {e}")
+        sys.exit(1)
+    names = set()
+    for t in tenants:
+        if not t.get("name") or not t.get("root") or t["name"] in names:
+            print(f"Error: every tenant needs a unique name and a root: {t}")
+            sys.exit(1)
+        names.add(t["name"])
+        t["root"] = (Path(path).parent / t["root"]).resolve()
+    return tenants
+
+
+def tenant_env(tenant):
+    env = dict(os.environ)
+    env["SITE_DIR"] = str(tenant["root"])
+    env["HTTP_CACHE_DIR"] = str(FARM_DIR / "http")
+    if tenant.get("sheet_id"):
+        env["SHEET_ID"] = tenant["sheet_id"]
+    if tenant.get("self_names"):
+        env["SELF_NAMES"] = "; ".join(tenant["self_names"])
+    return env
+
+
+# ─── Shared TeX formats ───
+
+def format_name(cv_dir):
+    """Name of the format for a cv/ directory's preamble, or None if it has no
+    DUMP_MARKER. Hashes the preamble and the local class/style files."""
+    main = cv_dir / "main.tex"
+    if not main.exists():
+        return None
+    text = main.read_text(encoding="utf-8")
+    if DUMP_MARKER not in text:
+        return None
+    h = hashlib.sha256(text.split(DUMP_MARKER)[0].encode("utf-8"))
+    for path in sorted(cv_dir.glob("*.cls")) + sorted(cv_dir.glob("*.sty")):
+        h.update(path.name.encode("utf-8"))
+        h.update(path.read_bytes())
+    return f"cv-{h.hexdigest()[:16]}"
+
+
+def build_formats(tenants, workers):
+    """Precompile each distinct preamble once; returns {tenant name: format path}."""
+    if not shutil.which("pdflatex") or not shutil.which("kpsewhich"):
+        return {}
+    found = subprocess.run(["kpsewhich", "mylatexformat.ltx"], capture_output=True, text=True)
+    if not found.stdout.strip():
+        print("  mylatexformat not installed; compiling without shared formats")
+        return {}
+    tex_dir = FARM_DIR / "tex"
+    tex_dir.mkdir(parents=True, exist_ok=True)
+    wanted = {}
+    for t in tenants:
+        name = format_name(t["root"] / "cv")
+        if name:
+            wanted.setdefault(name, t["root"] / "cv")
+
+    def build(item):
+        name, cv_dir = item
+        if (tex_dir / f"{name}.fmt").exists():
+            return name, True
+        result = subprocess.run(
+            ["pdflatex", "-ini", "-interaction=nonstopmode", f"-jobname={name}",
+             f"-output-directory={tex_dir}", "&pdflatex", "mylatexformat.ltx", "main.tex"],
+            cwd=cv_dir, capture_output=True, timeout=STEP_TIMEOUT)
+        return name, result.returncode == 0 and (tex_dir / f"{name}.fmt").exists()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        built = {name for name, ok in pool.map(build, wanted.items()) if ok}
+    print(f"  TeX formats: {len(built)} of {len(wanted)} preambles precompiled")
+    return {t["name"]: tex_dir / f"{format_name(t['root'] / 'cv')}.fmt" for t in tenants
+            if format_name(t["root"] / "cv") in built}
+
+
+# ─── Tenant builds ───
+
+def run_step(tenant, log, name, cmd, cwd, timings):
+    """Run one build step, appending its output to the tenant's log."""
+    start = time.monotonic()
+    log.write(f"$ {' '.join(str(c) for c in cmd)}\n")
+    log.flush()
+    try:
+        result = subprocess.run(cmd, cwd=cwd, env=tenant_env(tenant), stdout=log,
+                                stderr=subprocess.STDOUT, timeout=STEP_TIMEOUT)
+        ok = result.returncode == 0
+    except (OSError, subprocess.TimeoutExpired) as e:
+        log.write(f"{e}\n")
+        ok = False
+    timings[name] = time.monotonic() - start
+    if not ok:
+        raise RuntimeError(f"{name} failed")
+
+
+def build_tenant(tenant, formats, pdf, hugo):
+    """Build one tenant; returns (name, error or None, {step: seconds})."""
+    root = tenant["root"]
+    timings = {}
+    if not (root / "content").is_dir():
+        return tenant["name"], f"no site at {root}", timings
+    (root / "cache").mkdir(exist_ok=True)
+    with open(root / "cache" / "farm.log", "w", encoding="utf-8") as log:
+        try:
+            run_step(tenant, log, "sync", [sys.executable, SCRIPT_DIR / "sync_spreadsheet.py",
+                                           "--cv", "--xlsx", *tenant.get("args", [])],
+                     root, timings)
+            if pdf and shutil.which("pdflatex"):
+                fmt = formats.get(tenant["name"])
+                cmd = ["pdflatex", "-interaction=nonstopmode"]
+                if fmt:
+                    cmd.append(f"-fmt={fmt.with_suffix('')}")
+                run_step(tenant, log, "pdf", cmd + ["main.tex"], root / "cv", timings)
+                (root / "static").mkdir(exist_ok=True)
+                shutil.copy(root / "cv" / "main.pdf", root / "static" / "cv.pdf")
+            if hugo and shutil.which("hugo"):
+                run_step(tenant, log, "hugo", ["hugo", "--minify", "--source", root,
+                                               "--cacheDir", FARM_DIR / "hugo"], root, timings)
+        except RuntimeError as e:
+            return tenant["name"], f"{e} (see {root / 'cache' / 'farm.log'})", timings
+    return tenant["name"], None, timings
+
+
+# ─── Main ───
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1].startswith("--"):
+        print(__doc__)
+        sys.exit(2)
+    tenants = load_tenants(sys.argv[1])
+    only = get_option("--only", None)
+    if only:
+        tenants = [t for t in tenants if t["name"] in only.split(",")]
+    workers = int(get_option("--jobs", os.cpu_count() or 1))
+    pdf = "--pdf" in sys.argv
+    hugo = "--hugo" in sys.argv
+
+    print(f"Building {len(tenants)} sites, {workers} at a time...")
+    start = time.monotonic()
+    formats = build_formats(tenants, workers) if pdf else {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda t: build_tenant(t, formats, pdf, hugo), tenants))
+
+    steps = ("sync", "pdf", "hugo")
+    print(f"\n{'tenant':<24}" + "".join(f"{s:>8}" for s in steps) + f"{'total':>8}  status")
+    failed = 0
+    for name, error, timings in results:
+        cells = "".join(f"{timings[s]:>7.1f}s" if s in timings else f"{'-':>8}" for s in steps)
+        print(f"{name:<24}{cells}{sum(timings.values()):>7.1f}s  {error or 'ok'}")
+        failed += error is not None
+    print(f"\n{len(results) - failed} built, {failed} failed in {time.monotonic() - start:.1f}s")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
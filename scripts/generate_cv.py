@@ -2,76 +2,25 @@
 """
 Generate LaTeX CV sections from the unified Google Sheets spreadsheet.
 
-Usage: python3 scripts/generate_cv.py [--cached]
-  --cached: use local TSV cache instead of fetching from Google Sheets
+Usage: python3 scripts/generate_cv.py [options]
+
+See scripts/sheet_data.py for the options (--cached, --jobs, --max-age,
+--force, --from-snapshot, --save-snapshot).
 
 Outputs gen_*.tex files into tex/ directory.
 """
 
-import subprocess
-import json
-import csv
-import io
-import os
 import sys
 import re
-from pathlib import Path
 from collections import defaultdict
 
-SCRIPT_DIR = Path(__file__).parent
-PROJECT_DIR = SCRIPT_DIR.parent
-TEX_DIR = PROJECT_DIR / "cv"
-CACHE_DIR = PROJECT_DIR / "cache"
-
-SHEET_ID = "1X7VKV3pwBoYjQoUHpxckYJAgaErCYkevc47bJoMV0J0"
-ACCOUNT = "manolo.assistant@gmail.com"
-
-# Tab name → gid (for fetching)
-TABS = {
-    "publications": "948751242",
-    "talks": "508483272",
-    "travel": "1947229337",
-    "teaching": "733600881",
-    "grants_awards": "534833029",
-    "education": "741365414",
-    "positions": "1595934787",
-    "service": "756633452",
-}
-
-
-def fetch_tab(tab_name):
-    """Fetch a tab from Google Sheets via public CSV export (no auth needed)."""
-    import urllib.request
-    
-    cache_file = CACHE_DIR / f"{tab_name}.csv"
-
-    if "--cached" in sys.argv and cache_file.exists():
-        with open(cache_file) as f:
-            return list(csv.DictReader(f))
-
-    gid = TABS[tab_name]
-    url = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/gviz/tq?tqx=out:csv&gid={gid}"
-
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            text = resp.read().decode("utf-8")
-    except Exception as e:
-        print(f"ERROR fetching {tab_name}: {e}", file=sys.stderr)
-        if cache_file.exists():
-            print(f"  Falling back to cache", file=sys.stderr)
-            with open(cache_file) as f:
-                return list(csv.DictReader(f))
-        sys.exit(1)
-
-    records = list(csv.DictReader(io.StringIO(text)))
+from coauthors import SELF_NAMES, is_self, parse_authors
+from paths import PROJECT_DIR
+from related import links
+from sheet_data import build_date, run_pipeline, write_lines
+from templates import Templates
 
-    # Cache locally
-    CACHE_DIR.mkdir(exist_ok=True)
-    with open(cache_file, "w", newline="") as f:
-        f.write(text)
-
-    return records
+TEX_DIR = PROJECT_DIR / "cv"
 
 
 def tex_escape(s):
@@ -102,27 +51,15 @@ def tex_escape_light(s):
     return s
 
 
-def format_authors(authors_str):
-    """Format author string, highlighting Jaume's name."""
-    if not authors_str:
-        return ""
-    # Replace Jaume's name variants with \me macro
-    s = authors_str
-    for pattern in [
-        "Jaume de Dios Pont",
-        "J. de Dios Pont",
-        "de Dios Pont, J.",
-        "de Dios Pont, Jaume",
-        "Jaume de Dios",
-        "J. de Dios",
-    ]:
-        s = s.replace(pattern, "\\me")
-    # Convert semicolons to " & " for last author, ", " for others (LaTeX convention)
-    parts = [p.strip() for p in s.split(";") if p.strip()]
+def format_authors(author_list):
+    """Format a parsed author list, highlighting Jaume's name."""
+    # Jaume's name becomes the \me macro
+    parts = ["\\me" if is_self(name) else name for name in author_list]
+    # ", " between authors and " & " before the last (LaTeX convention)
     if len(parts) > 1:
         s = ", ".join(parts[:-1]) + " & " + parts[-1]
-    elif parts:
-        s = parts[0]
+    else:
+        s = "".join(parts)
     return tex_escape_light(s)
 
 
@@ -196,16 +133,26 @@ def format_date_year(date_str):
     return m.group(1) if m else date_str
 
 
+# ─── Templates ───
+#
+# Repeated entries (see templates.py); fields are escaped with tex_escape_light.
+
+TEX = Templates({
+    "talk_item": r"  \item {{event}} ({{date|compact}})",
+    "visit": r"  \cventry{show}{{{dates}}}{{{location}}}{{{title}}}{}{}{}%",
+}, escape=tex_escape_light, filters={"compact": format_date_compact})
+
+
 # ─── Generators ───
 
 def gen_positions(records):
-    lines = ["\\section{Employment}", "  \\medskip"]
+    yield from ["\\section{Employment}", "  \\medskip"]
     for r in records:
-        title = tex_escape_light(r.get("title", ""))
-        institution = tex_escape_light(r.get("institution", ""))
-        start = r.get("start", "")
-        end = r.get("end", "")
-        details = tex_escape_light(r.get("details", ""))
+        title = tex_escape_light(r.title)
+        institution = tex_escape_light(r.institution)
+        start = r.start
+        end = r.end
+        details = tex_escape_light(r.details)
 
         # Compact date: "May--Sep '23" for same-year month ranges
         start_fmt = format_date_compact(start) if "-" in start else start
@@ -224,18 +171,17 @@ def gen_positions(records):
             date_str = f"{start_fmt}--"
 
         details_part = f". {details.rstrip('.')}" if details else ""
-        lines.append(f"  \\cvitem{{show}}{{{date_str}}}{{\\textbf{{{institution}}}, \\emph{{{title}}}{details_part}}}%")
-    return "\n".join(lines) + "\n"
+        yield f"  \\cvitem{{show}}{{{date_str}}}{{\\textbf{{{institution}}}, \\emph{{{title}}}{details_part}}}%"
 
 
 def gen_education(records):
-    lines = ["\\section{Education}", "  \\medskip"]
+    yield from ["\\section{Education}", "  \\medskip"]
     for r in records:
-        degree = tex_escape_light(r.get("degree", ""))
-        institution = tex_escape_light(r.get("institution", ""))
-        year = r.get("year", "")
-        details = tex_escape_light(r.get("details", ""))
-        rank = r.get("rank", "").strip()
+        degree = tex_escape_light(r.degree)
+        institution = tex_escape_light(r.institution)
+        year = r.year
+        details = tex_escape_light(r.details)
+        rank = r.rank
 
         if rank:
             rank_str = f"\\hspace*{{\\fill}}({tex_escape_light(rank)})"
@@ -243,51 +189,47 @@ def gen_education(records):
             rank_str = ""
 
         details_clean = details.rstrip('.')
-        lines.append(
+        yield (
             f"  \\cventry{{show}}{{{year}}}{{{degree}}}{{{institution}}}"
             f"{{{rank_str}}}{{}}"
             f"{{{details_clean}}}%"
         )
-    return "\n".join(lines) + "\n"
 
 
 def gen_awards(records):
-    lines = ["\\vspace{.5em}", "\\section{Postgraduate Awards and Scholarships}", "  \\medskip"]
+    yield from ["\\vspace{.5em}", "\\section{Postgraduate Awards and Scholarships}", "  \\medskip"]
     for r in records:
-        award = tex_escape_light(r.get("award", ""))
-        year = r.get("year", "")
-        institution = tex_escape_light(r.get("institution", ""))
-        details = tex_escape_light(r.get("details", ""))
+        award = tex_escape_light(r.award)
+        year = r.year
+        institution = tex_escape_light(r.institution)
+        details = tex_escape_light(r.details)
 
         parts = [f"\\textbf{{{award}}}"]
         if institution:
             parts.append(institution)
         if details:
             parts.append(details.rstrip('.'))
-        lines.append(f"  \\cvitem{{show}}{{{year}}}{{{', '.join(parts)}}}%")
-    return "\n".join(lines) + "\n"
+        yield f"  \\cvitem{{show}}{{{year}}}{{{', '.join(parts)}}}%"
 
 
 def gen_publications(records):
-    lines = [
+    yield from [
         "\\vspace{1em}",
         "\\section{Papers and Preprints}",
     ]
     for i, r in enumerate(records):
         num = i + 1
-        title = tex_escape_light(r.get("title", ""))
-        authors = format_authors(r.get("authors", ""))
-        arxiv_raw = r.get("arxiv", "").strip()
+        title = tex_escape_light(r.title)
+        authors = format_authors(r.author_list)
+        arxiv_raw = r.arxiv
         # Strip "arXiv:" prefix if present
         if arxiv_raw.lower().startswith("arxiv:"):
             arxiv_raw = arxiv_raw.split(":", 1)[1].strip()
-        pub_type = r.get("type", "").strip()
-        date = r.get("date", "")
-        url = r.get("url", "").strip()
-        arxiv = extract_arxiv_from_url(url, arxiv_raw)
+        pub_type = r.type
+        arxiv = extract_arxiv_from_url(r.url, arxiv_raw)
 
         # Publication status line
-        year = format_date_year(date)
+        year = format_date_year(r.date)
         if pub_type and pub_type.lower() != "preprint":
             status = tex_escape_light(pub_type)
         else:
@@ -297,43 +239,39 @@ def gen_publications(records):
         if arxiv:
             arxiv_str = f"\\href{{https://arxiv.org/abs/{arxiv}}}{{arXiv:{arxiv}}}"
 
-        lines.append(
+        yield (
             f"  \\cventry{{show}}{{[{num}]}}{{{title}}}{{{authors}}}"
             f"{{{status}}}{{{arxiv_str}}}{{}}%"
         )
-    return "\n".join(lines) + "\n"
 
 
-def gen_talks(records):
+def gen_talks(records, publications):
     """Generate talks section grouped by block, matching the original CV layout.
     
     Original format uses \talk{}{Bold Title}{} then \talkplace{venue}{date} inline.
     The \talkplace macro produces: "venue (date)," as inline text with \leftskip indentation.
+    Research blocks cite the papers their talks are about by their [n] in
+    gen_publications.
     """
-    lines = [
+    yield from [
         "\\section{Talks}",
         "",
     ]
 
-    from datetime import date as _date
-    today = _date.today()
-    # Filter empty rows and future talks
-    records = [r for r in records if r.get("title", "").strip()]
-    records = [r for r in records if not r.get("date", "") or r.get("date", "")[:10] <= today.isoformat()]
-
-    # Group by block
-    blocks = defaultdict(list)
-    block_order = []
-    for r in records:
-        block = r.get("block", "").strip() or "Other"
-        if block not in blocks:
-            block_order.append(block)
-        blocks[block].append(r)
+    # Group by block (the series index's topics), leaving out future talks
+    future = {id(r) for r in records.timeline.after(build_date())}
+    blocks = {}
+    for block, talks in records.series.topics(keep=lambda r: id(r) not in future):
+        blocks.setdefault(block or "Other", []).extend(talks)
+    block_order = list(blocks)
 
     # Separate research vs expository/minicourse
     research_blocks = [b for b in block_order if b not in ("Expository", "Minicourse")]
     expository_blocks = [b for b in block_order if b in ("Expository", "Minicourse")]
 
+    related = links(records, publications)
+    numbers = {id(p): i + 1 for i, p in enumerate(publications)}
+
     # Map block names to display titles
     block_titles = {
         "The Hot Spots Conjecture": "Spectral theory and the hot spots conjecture",
@@ -342,98 +280,81 @@ def gen_talks(records):
 
     def emit_block(block_name, talks):
         display_title = block_titles.get(block_name, 
-                        tex_escape_light(talks[0].get("title", block_name)))
-        lines.append(f"\\textbf{{{display_title}}}")
-        lines.append("\\nopagebreak")
-        lines.append("\\begin{small}")
-        lines.append("\\begin{multicols}{2}")
-        lines.append("\\begin{itemize}\\setlength\\itemsep{0pt}")
+                        tex_escape_light(talks[0].title))
+        papers = {}
         for t in talks:
-            event = tex_escape_light(t.get("event", ""))
-            date = format_date_compact(t.get("date", ""))
-            lines.append(f"  \\item {event} ({date})")
-        lines.append("\\end{itemize}")
-        lines.append("\\end{multicols}")
-        lines.append("\\end{small}")
-        lines.append("")
+            for p in related.papers(records.series.of(t)):
+                papers[numbers[id(p)]] = p
+        cite = f" {{\\small[{', '.join(str(n) for n in sorted(papers))}]}}" if papers else ""
+        yield f"\\textbf{{{display_title}}}{cite}"
+        yield "\\nopagebreak"
+        yield "\\begin{small}"
+        yield "\\begin{multicols}{2}"
+        yield "\\begin{itemize}\\setlength\\itemsep{0pt}"
+        yield from TEX.render_all("talk_item", ({"event": t.event, "date": t.date} for t in talks))
+        yield "\\end{itemize}"
+        yield "\\end{multicols}"
+        yield "\\end{small}"
+        yield ""
 
     if research_blocks:
-        lines.append("\\subsection{\\textbf{\\color{color1} Research talks}}")
-        lines.append("")
+        yield "\\subsection{\\textbf{\\color{color1} Research talks}}"
+        yield ""
         for b in research_blocks:
-            emit_block(b, blocks[b])
+            yield from emit_block(b, blocks[b])
 
     if expository_blocks:
-        lines.append("\\subsection{\\textbf{\\color{color1} Expository talks}}")
-        lines.append("")
+        yield "\\subsection{\\textbf{\\color{color1} Expository talks}}"
+        yield ""
         # Expository: flat list with title, venue, date — no grouping by topic
-        lines.append("\\begin{small}")
-        lines.append("\\begin{itemize}\\setlength\\itemsep{0pt}")
+        yield "\\begin{small}"
+        yield "\\begin{itemize}\\setlength\\itemsep{0pt}"
         for b in expository_blocks:
             for t in blocks[b]:
-                title = tex_escape_light(t.get("title", ""))
-                event = tex_escape_light(t.get("event", ""))
-                date = format_date_compact(t.get("date", ""))
-                lines.append(f"  \\item \\textbf{{{title}}}, {event} ({date})")
-        lines.append("\\end{itemize}")
-        lines.append("\\end{small}")
-        lines.append("")
+                title = tex_escape_light(t.title)
+                event = tex_escape_light(t.event)
+                date = format_date_compact(t.date)
+                yield f"  \\item \\textbf{{{title}}}, {event} ({date})"
+        yield "\\end{itemize}"
+        yield "\\end{small}"
+        yield ""
 
-    lines.append("\\emph{Talks are grouped by topic, even when the covered material changed between instances.}")
-    lines.append("")
+    yield "\\emph{Talks are grouped by topic, even when the covered material changed between instances.}"
+    yield ""
 
-    return "\n".join(lines) + "\n"
 
 
 def gen_travel(records):
-    from datetime import datetime, date as _date
-    today = _date.today()
     # Filter out future travel
-    records = [r for r in records if not r.get("date", "") or r.get("date", "")[:10] <= today.isoformat()]
-    lines = [
+    future = {id(r) for r in records.timeline.after(build_date())}
+    records = (r for r in records if id(r) not in future)
+    yield from [
         "\\vspace{1em}",
         "\\section{Research Visits ($> 1$ week)}",
     ]
-    for r in records:
-        title = tex_escape_light(r.get("title", ""))
-        location = tex_escape_light(r.get("location", ""))
-        date_raw = r.get("date", "")
-        date_end_raw = r.get("date_end", "")
-        
-        # Strictly filter: must be > 7 days
-        if date_raw and date_end_raw:
-            try:
-                d1 = datetime.strptime(date_raw[:10], "%Y-%m-%d")
-                d2 = datetime.strptime(date_end_raw[:10], "%Y-%m-%d")
-                if (d2 - d1).days < 8:
-                    continue
-            except (ValueError, TypeError):
-                pass
-
-        # Compact date format for hint column
-        date_str = format_date_compact(date_raw)
-        if date_end_raw:
-            end_compact = format_date_compact(date_end_raw)
-            # If same month, just show "Mon 'YY"
-            if date_str == end_compact:
-                pass  # just use single date
-            else:
-                date_str += f" -- {end_compact}"
+    # Strictly filter: must be > 7 days
+    visits = (r for r in records if not (r.day and r.end_day and (r.end_day - r.day).days < 8))
+    yield from TEX.render_all("visit", (visit_view(r) for r in visits))
 
-        lines.append(
-            f"  \\cventry{{show}}{{{date_str}}}{{{location}}}{{{title}}}{{}}{{}}{{}}%"
-        )
-    return "\n".join(lines) + "\n"
+
+def visit_view(r):
+    # Compact date format for hint column; a visit within one month shows just "Mon 'YY"
+    date_str = format_date_compact(r.date)
+    if r.date_end:
+        end_compact = format_date_compact(r.date_end)
+        if date_str != end_compact:
+            date_str += f" -- {end_compact}"
+    return {"dates": date_str, "location": r.location, "title": r.title}
 
 
 def gen_teaching(records):
-    lines = ["\\section{Teaching Experience}"]
+    yield "\\section{Teaching Experience}"
 
     # Group by institution
     by_inst = defaultdict(list)
     inst_order = []
     for r in records:
-        inst = r.get("institution", "").strip()
+        inst = r.institution
         if inst not in by_inst:
             inst_order.append(inst)
         by_inst[inst].append(r)
@@ -444,80 +365,104 @@ def gen_teaching(records):
         roles = defaultdict(list)
         role_order = []
         for c in courses:
-            role = c.get("role", "Teaching Assistant")
+            role = c.role
             if role not in roles:
                 role_order.append(role)
             roles[role].append(c)
 
         for role in role_order:
             role_courses = roles[role]
-            lines.append(f"\\subsection{{\\textbf{{\\color{{color1}} {tex_escape_light(inst)} ({tex_escape_light(role)})}}}}")
+            yield f"\\subsection{{\\textbf{{\\color{{color1}} {tex_escape_light(inst)} ({tex_escape_light(role)})}}}}"
 
             if len(role_courses) > 3:
-                lines.append("\\begin{minipage}{\\textwidth}")
-                lines.append("\\begin{multicols}{2}")
-                lines.append("\\begin{itemize}")
+                yield "\\begin{minipage}{\\textwidth}"
+                yield "\\begin{multicols}{2}"
+                yield "\\begin{itemize}"
                 for c in role_courses:
-                    name = tex_escape_light(c.get("course", ""))
-                    term = tex_escape_light(c.get("term", ""))
-                    lines.append(f"  \\item \\textbf{{{name}}} \\hfill {term}")
-                lines.append("\\end{itemize}")
-                lines.append("\\end{multicols}")
-                lines.append("\\end{minipage}")
+                    name = tex_escape_light(c.course)
+                    term = tex_escape_light(c.term)
+                    yield f"  \\item \\textbf{{{name}}} \\hfill {term}"
+                yield "\\end{itemize}"
+                yield "\\end{multicols}"
+                yield "\\end{minipage}"
             else:
-                lines.append("\\begin{itemize}")
+                yield "\\begin{itemize}"
                 for c in role_courses:
-                    name = tex_escape_light(c.get("course", ""))
-                    term = tex_escape_light(c.get("term", ""))
-                    lines.append(f"  \\item \\textbf{{{name}}} \\qquad {term}")
-                lines.append("\\end{itemize}")
+                    name = tex_escape_light(c.course)
+                    term = tex_escape_light(c.term)
+                    yield f"  \\item \\textbf{{{name}}} \\qquad {term}"
+                yield "\\end{itemize}"
 
-        lines.append("\\vspace{1em}")
+        yield "\\vspace{1em}"
 
-    return "\n".join(lines) + "\n"
 
 
 def gen_service(records):
-    lines = ["\\section{Reviewing}"]
+    yield "\\section{Reviewing}"
     # Service sheet has columns: type, details, year
     # Filter out placeholder rows
     skip_phrases = ["to be populated", "add reviewing", "(to be populated)"]
-    journals = [tex_escape_light(r.get("details", "")) for r in records
-                if r.get("details") and not any(p in r.get("details", "").lower() for p in skip_phrases)]
+    journals = [tex_escape_light(r.details) for r in records
+                if r.details and not any(p in r.details.lower() for p in skip_phrases)]
     if journals:
-        lines.append("Reviewer for: " + ", ".join(journals) + ".")
+        yield "Reviewer for: " + ", ".join(journals) + "."
     else:
         # Hardcode from known data since sheet may be sparse
-        lines.append("Reviewer for: Transactions of the AMS, Proceedings of the AMS, "
-                      "Mathematical Statistics and Learning, Discrete Mathematics, "
-                      "Journal of the London Mathematical Society, AMS Contemporary Mathematics.")
-    return "\n".join(lines) + "\n"
+        yield ("Reviewer for: Transactions of the AMS, Proceedings of the AMS, "
+               "Mathematical Statistics and Learning, Discrete Mathematics, "
+               "Journal of the London Mathematical Society, AMS Contemporary Mathematics.")
 
 
 # ─── Main ───
 
-def main():
-    print("Fetching spreadsheet data...")
+# Section → (tab or tabs it reads, generator)
+GENERATORS = {
+    "gen_positions": ("positions", gen_positions),
+    "gen_education": ("education", gen_education),
+    "gen_awards": ("grants_awards", gen_awards),
+    "gen_publications": ("publications", gen_publications),
+    "gen_talks": (("talks", "publications"), gen_talks),
+    "gen_travel": ("travel", gen_travel),
+    "gen_teaching": ("teaching", gen_teaching),
+    "gen_service": ("service", gen_service),
+}
 
-    generators = {
-        "gen_positions": ("positions", gen_positions),
-        "gen_education": ("education", gen_education),
-        "gen_awards": ("grants_awards", gen_awards),
-        "gen_publications": ("publications", gen_publications),
-        "gen_talks": ("talks", gen_talks),
-        "gen_travel": ("travel", gen_travel),
-        "gen_teaching": ("teaching", gen_teaching),
-        "gen_service": ("service", gen_service),
-    }
+# Sections that filter on today's date, so the date is part of their input hash
+DATE_DEPENDENT = {"gen_talks", "gen_travel"}
 
-    for output_name, (tab_name, gen_func) in generators.items():
-        print(f"  {tab_name} → {output_name}.tex")
-        records = fetch_tab(tab_name)
-        tex = gen_func(records)
-        out_path = TEX_DIR / f"{output_name}.tex"
-        out_path.write_text(tex, encoding="utf-8")
 
-    print(f"\nDone! Generated {len(generators)} files in {TEX_DIR}/")
+def section_writer(output_name, gen_func):
+    """Stage function that streams one section's lines into cv/<output_name>.tex."""
+    def write(*records):
+        write_lines(TEX_DIR / f"{output_name}.tex", gen_func(*records))
+    return write
+
+
+def check_self_names():
+    """Warn about SELF_NAMES variants that would not render as \\me, alone or
+    first in a comma-separated author list (once per run, before the stages)."""
+    for name in SELF_NAMES:
+        alone = format_authors(parse_authors(name))
+        first = format_authors(parse_authors(f"{name}, A. N. Other"))
+        if alone != "\\me" or not first.startswith("\\me \\& "):
+            print(f"  Warning: self name {name!r} renders as {alone!r}", file=sys.stderr)
+
+
+def cv_stages():
+    """Pipeline stages (see sheet_data.run_pipeline) for every LaTeX section."""
+    return [
+        (f"{output_name}.tex", [tabs] if isinstance(tabs, str) else list(tabs),
+         section_writer(output_name, gen_func),
+         [TEX_DIR / f"{output_name}.tex"], output_name in DATE_DEPENDENT)
+        for output_name, (tabs, gen_func) in GENERATORS.items()
+    ]
+
+
+def main():
+    check_self_names()
+    print("Fetching spreadsheet data...")
+    run_pipeline(cv_stages())
+    print(f"\nDone! Sections are in {TEX_DIR}/")
     print("Next: cd tex && pdflatex main.tex")
 
 
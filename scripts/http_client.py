@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the build scripts.
+
+Every request the scripts make goes through get():
+  - connections are pooled and kept alive per host, with at most
+    HOST_LIMITS[host] (default DEFAULT_HOST_LIMIT) requests in flight to a host
+  - gzip/deflate (and br, if the optional brotli module is installed) are
+    negotiated and decoded as the body streams in
+  - GET responses are kept in an on-disk cache (cache/http/, or
+    $HTTP_CACHE_DIR, which several sites' builds can share) following the
+    RFC 9111 rules for a private cache: Cache-Control max-age / no-store /
+    no-cache, Expires, heuristic freshness from Last-Modified, Vary, and
+    revalidation with ETag / Last-Modified
+  - HTTP_PROXY / HTTPS_PROXY / NO_PROXY are honoured: plain HTTP requests go
+    to the proxy in absolute form, HTTPS ones through a CONNECT tunnel
+  - STATS counts cache hits, revalidations, misses and bytes saved; report()
+    prints them
+
+New connections are opened by the module-level `connect` (connection() by
+default), which a test harness can replace to send every request elsewhere.
+
+  from http_client import get
+  resp = get(url, headers={"User-Agent": ...}, timeout=10)
+  resp.raise_for_status()
+  data = resp.content
+
+Only the stdlib is required.
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.request
+import zlib
+from base64 import b64encode
+from email.message import Message
+from email.utils import parsedate_to_datetime
+from urllib.parse import unquote, urljoin, urlsplit
+
+from paths import HTTP_CACHE_DIR
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+USER_AGENT = "academic-site-builder/1.0"
+REQUEST_TIMEOUT = 30
+MAX_REDIRECTS = 5
+
+# Read size for response bodies
+CHUNK_SIZE = 1 << 16
+
+# Requests in flight per host; arXiv asks API clients to go one at a time
+DEFAULT_HOST_LIMIT = 4
+HOST_LIMITS = {
+    "docs.google.com": 8,
+    "export.arxiv.org": 1,
+}
+
+# Heuristic freshness (RFC 9111 §4.2.2): 10% of the time since Last-Modified,
+# capped at a day
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX = 24 * 3600
+
+# Statuses and methods that are stored in the cache
+CACHEABLE_STATUS = {200, 203}
+
+ACCEPT_ENCODING = "gzip, deflate" + (", br" if brotli else "")
+
+
+class HTTPError(Exception):
+    """A response with a 4xx/5xx status (see Response.raise_for_status)."""
+
+    def __init__(self, url, code, reason, headers):
+        super().__init__(f"HTTP Error {code}: {reason} ({url})")
+        self.url = url
+        self.code = code
+        self.headers = headers
+
+
+# ─── Statistics ───
+
+class Stats:
+    """Counters for every get() in this process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_from_cache = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+
+    def add(self, **counts):
+        with self.lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    @property
+    def bytes_saved(self):
+        """Bytes not transferred thanks to the cache and compression."""
+        return self.bytes_from_cache + max(0, self.bytes_decoded - self.bytes_received)
+
+
+STATS = Stats()
+
+
+def report():
+    """Print cache hit/miss counts and bytes saved, if any requests were made."""
+    s = STATS
+    if s.hits + s.revalidated + s.misses:
+        print(f"  HTTP: {s.hits} cache hit(s), {s.revalidated} revalidated, {s.misses} miss(es); "
+              f"{s.bytes_received / 1024:.0f} KB received, {s.bytes_saved / 1024:.0f} KB saved")
+
+
+# ─── Connections ───
+
+def proxy_for(scheme, host):
+    """The proxy URL from the environment for a request to `host`, or None."""
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    return proxy if "://" in proxy else f"http://{proxy}"
+
+
+def connection(scheme, host, port, timeout):
+    """A new connection to a host, through the environment's proxy if it names one.
+
+    Connections through a proxy to a plain-HTTP host have `absolute_form` set:
+    the request line must carry the full URL.
+    """
+    cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    proxy = proxy_for(scheme, host)
+    if not proxy:
+        return cls(host, port, timeout=timeout)
+    p = urlsplit(proxy)
+    auth = {}
+    if p.username:
+        credentials = f"{unquote(p.username)}:{unquote(p.password or '')}"
+        auth["Proxy-Authorization"] = "Basic " + b64encode(credentials.encode()).decode("ascii")
+    proxy_port = p.port or (443 if p.scheme == "https" else 80)
+    if scheme == "https":
+        conn = cls(p.hostname, proxy_port, timeout=timeout)
+        conn.set_tunnel(host, port, headers=auth)
+    else:
+        conn = http.client.HTTPConnection(p.hostname, proxy_port, timeout=timeout)
+        conn.absolute_form = True
+        conn.proxy_headers = auth
+    return conn
+
+
+# Opens every new connection, as connect(scheme, host, port, timeout)
+connect = connection
+
+
+class Pool:
+    """Idle keep-alive connections and a concurrency cap per host."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.idle = {}
+        self.slots = {}
+
+    def slot(self, host):
+        with self.lock:
+            if host not in self.slots:
+                limit = HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT)
+                self.slots[host] = threading.BoundedSemaphore(limit)
+            return self.slots[host]
+
+    def checkout(self, key, timeout):
+        """An idle connection for `key` (reused=True) or a new one."""
+        with self.lock:
+            idle = self.idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return connect(*key, timeout), False
+        conn.timeout = timeout
+        if conn.sock:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def checkin(self, key, conn):
+        with self.lock:
+            self.idle.setdefault(key, []).append(conn)
+
+
+POOL = Pool()
+
+
+class Inflater:
+    """Incremental gzip/deflate decoder.
+
+    wbits 32+ accepts both gzip and zlib framing; some servers send
+    "deflate" as a raw stream without the zlib header, so input that neither
+    framing accepts before any output is decoded again as raw deflate.
+    """
+
+    def __init__(self):
+        self.d = zlib.decompressobj(32 + zlib.MAX_WBITS)
+        self.head = b""  # input so far, until the framing is known to be right
+
+    def decompress(self, chunk):
+        if self.head is None:
+            return self.d.decompress(chunk)
+        self.head += chunk
+        try:
+            data = self.d.decompress(chunk)
+        except zlib.error:
+            self.d = zlib.decompressobj(-zlib.MAX_WBITS)
+            data = self.d.decompress(self.head)
+        if data:
+            self.head = None
+        return data
+
+    def flush(self):
+        return self.d.flush()
+
+
+def decoder(encoding):
+    """Incremental decoder for a Content-Encoding, or None for identity."""
+    encoding = (encoding or "").strip().lower()
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        d = Inflater()
+        return d.decompress, d.flush
+    if encoding == "br" and brotli:
+        d = brotli.Decompressor()
+        return d.process, lambda: b""
+    return None
+
+
+def send(method, url, headers, timeout):
+    """Send one request on a pooled connection; returns a streaming Response."""
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.hostname, parts.port)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    slot = POOL.slot(parts.hostname)
+    slot.acquire()
+    try:
+        while True:
+            conn, reused = POOL.checkout(key, timeout)
+            target, extra = path, {}
+            if getattr(conn, "absolute_form", False):
+                target, extra = url, conn.proxy_headers
+            try:
+                conn.request(method, target, headers={"Host": parts.netloc, **extra, **headers})
+                resp = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server closed an idle keep-alive connection; retry on a new one
+                conn.close()
+                if not reused:
+                    raise
+            except Exception:
+                conn.close()
+                raise
+    except Exception:
+        slot.release()
+        raise
+
+    return Response(url, resp.status, resp.reason, resp.msg, Body(resp, key, conn, slot))
+
+
+class Body:
+    """The streaming body of a live response.
+
+    The connection goes back to the pool once the body has been read to the
+    end, and is closed if the body is abandoned; either way the host's slot
+    is released exactly once.
+    """
+
+    def __init__(self, resp, key, conn, slot):
+        self.resp = resp
+        self.key = key
+        self.conn = conn
+        self.slot = slot
+        self.released = False
+
+    def __iter__(self):
+        try:
+            decode = decoder(self.resp.getheader("Content-Encoding"))
+            while True:
+                chunk = self.resp.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                data = decode[0](chunk) if decode else chunk
+                STATS.add(bytes_received=len(chunk), bytes_decoded=len(data))
+                if data:
+                    yield data
+            if decode:
+                tail = decode[1]()
+                if tail:
+                    STATS.add(bytes_decoded=len(tail))
+                    yield tail
+            self.close(reusable=not self.resp.will_close)
+        finally:
+            self.close()
+
+    def close(self, reusable=False):
+        if self.released:
+            return
+        self.released = True
+        if reusable:
+            POOL.checkin(self.key, self.conn)
+        else:
+            self.conn.close()
+        self.slot.release()
+
+
+# ─── Responses ───
+
+class Response:
+    """A response whose body is read lazily, from the network or the cache."""
+
+    def __init__(self, url, status, reason, headers, chunks, from_cache=False):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.from_cache = from_cache
+        self._chunks = chunks
+        self._content = None
+
+    @property
+    def ok(self):
+        return self.status < 400
+
+    def iter_content(self):
+        """Yield the decoded body in chunks (once; use .content to keep it)."""
+        if self._content is not None:
+            yield self._content
+            return
+        yield from self._chunks
+
+    @property
+    def content(self):
+        if self._content is None:
+            self._content = b"".join(self._chunks)
+        return self._content
+
+    @property
+    def text(self):
+        charset = self.headers.get_content_charset()
+        return self.content.decode(charset or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        """Release the connection without reading the rest of the body."""
+        if isinstance(self._chunks, Body):
+            self._chunks.close()
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise HTTPError(self.url, self.status, self.reason, self.headers)
+
+
+def request(method, url, headers, timeout):
+    """Send a request, following redirects."""
+    for _ in range(MAX_REDIRECTS + 1):
+        resp = send(method, url, headers, timeout)
+        location = resp.headers.get("Location")
+        if resp.status not in (301, 302, 303, 307, 308) or not location:
+            return resp
+        resp.content  # drain so the connection can be reused
+        url = urljoin(url, location)
+        if resp.status == 303:
+            method = "GET"
+    raise HTTPError(url, resp.status, "too many redirects", resp.headers)
+
+
+# ─── Cache ───
+
+def cache_control(value):
+    """Parse a Cache-Control header into {directive: value or True}."""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else True
+    return directives
+
+
+def http_date(value):
+    """Seconds since the epoch for an HTTP date header, or None."""
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def as_message(pairs):
+    msg = Message()
+    for name, value in pairs:
+        msg[name] = value
+    return msg
+
+
+class CacheEntry:
+    """A stored response: metadata in <key>.json, body in <key>.body."""
+
+    def __init__(self, meta_file, meta):
+        self.meta_file = meta_file
+        self.body_file = meta_file.with_suffix(".body")
+        self.meta = meta
+        self.headers = as_message(meta["headers"])
+
+    def age(self):
+        """Current age (RFC 9111 §4.2.3)."""
+        m = self.meta
+        date = http_date(self.headers.get("Date")) or m["response_time"]
+        apparent = max(0, m["response_time"] - date)
+        corrected = int(self.headers.get("Age", 0) or 0) + (m["response_time"] - m["request_time"])
+        return max(apparent, corrected) + (time.time() - m["response_time"])
+
+    def lifetime(self):
+        """Freshness lifetime (RFC 9111 §4.2.1), heuristic if none is given."""
+        cc = cache_control(self.headers.get("Cache-Control"))
+        if "max-age" in cc:
+            try:
+                return int(cc["max-age"])
+            except ValueError:
+                return 0
+        date = http_date(self.headers.get("Date")) or self.meta["response_time"]
+        if "Expires" in self.headers:
+            expires = http_date(self.headers["Expires"])
+            return max(0, expires - date) if expires else 0
+        last_modified = http_date(self.headers.get("Last-Modified"))
+        if last_modified:
+            return min(HEURISTIC_MAX, max(0, date - last_modified) * HEURISTIC_FRACTION)
+        return 0
+
+    def is_fresh(self):
+        if "no-cache" in cache_control(self.headers.get("Cache-Control")):
+            return False
+        return self.lifetime() > self.age()
+
+    def matches(self, headers):
+        """True if the request headers agree with the stored Vary values."""
+        lower = {k.lower(): v for k, v in headers.items()}
+        return all(lower.get(name) == value for name, value in self.meta["vary"].items())
+
+    def validators(self):
+        v = {}
+        if self.headers.get("ETag"):
+            v["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            v["If-Modified-Since"] = self.headers["Last-Modified"]
+        return v
+
+    def refresh(self, headers, request_time):
+        """Merge the headers of a 304 into the stored response."""
+        merged = {k.lower(): (k, v) for k, v in self.meta["headers"]}
+        for k, v in headers.items():
+            if k.lower() not in ("content-length", "content-encoding", "transfer-encoding"):
+                merged[k.lower()] = (k, v)
+        self.meta["headers"] = list(merged.values())
+        self.meta["request_time"] = request_time
+        self.meta["response_time"] = time.time()
+        self.headers = as_message(self.meta["headers"])
+        write_json(self.meta_file, self.meta)
+
+    def response(self, saved=True):
+        """The stored response; saved=False when its body was just downloaded."""
+        def body():
+            with open(self.body_file, "rb") as f:
+                yield from iter(lambda: f.read(CHUNK_SIZE), b"")
+
+        if saved:
+            STATS.add(bytes_from_cache=self.body_file.stat().st_size)
+        return Response(self.meta["url"], self.meta["status"], "OK", self.headers, body(),
+                        from_cache=True)
+
+
+def write_json(path, data):
+    # Per-process part files: processes may share the cache (farm.py)
+    part = path.with_name(f"{path.name}.{os.getpid()}.part")
+    part.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    os.replace(part, path)
+
+
+def cache_key(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+
+def lookup(url, headers):
+    """The stored response for `url` matching `headers`, or None."""
+    meta_file = HTTP_CACHE_DIR / f"{cache_key(url)}.json"
+    if not meta_file.exists():
+        return None
+    try:
+        entry = CacheEntry(meta_file, json.loads(meta_file.read_text(encoding="utf-8")))
+    except (ValueError, KeyError):
+        return None
+    if not entry.body_file.exists() or not entry.matches(headers):
+        return None
+    return entry
+
+
+def store(url, headers, resp, request_time):
+    """Write a cacheable response to the cache and return it read back from there.
+
+    Uncacheable responses are returned with their body read, so the
+    connection and the host's slot are released whether or not the caller
+    reads it.
+    """
+    cc = cache_control(resp.headers.get("Cache-Control"))
+    vary = [v.strip().lower() for v in (resp.headers.get("Vary") or "").split(",") if v.strip()]
+    if resp.status not in CACHEABLE_STATUS or "no-store" in cc or "*" in vary:
+        resp.content
+        return resp
+
+    HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    meta_file = HTTP_CACHE_DIR / f"{cache_key(url)}.json"
+    body_file = meta_file.with_suffix(".body")
+    part = body_file.with_name(f"{body_file.name}.{os.getpid()}.part")
+    with open(part, "wb") as f:
+        for chunk in resp.iter_content():
+            f.write(chunk)
+    os.replace(part, body_file)
+
+    lower = {k.lower(): v for k, v in headers.items()}
+    meta = {
+        "url": url,
+        "status": resp.status,
+        # The stored body is decoded, so drop the headers describing the wire form
+        "headers": [(k, v) for k, v in resp.headers.items()
+                    if k.lower() not in ("content-length", "content-encoding", "transfer-encoding")],
+        "vary": {name: lower.get(name) for name in vary},
+        "request_time": request_time,
+        "response_time": time.time(),
+    }
+    write_json(meta_file, meta)
+    return CacheEntry(meta_file, meta).response(saved=False)
+
+
+# ─── API ───
+
+def get(url, headers=None, timeout=REQUEST_TIMEOUT, cache=True, stream=False):
+    """GET `url` through the pool and, unless cache=False, the on-disk cache.
+
+    With stream=True the body is left on the connection for iter_content()
+    and nothing is cached (for callers that keep their own copy, like
+    sheet_data's per-tab CSVs). The response is returned whatever its
+    status; call raise_for_status() to turn 4xx/5xx into HTTPError.
+    """
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING, **(headers or {})}
+    request_cc = cache_control(headers.get("Cache-Control"))
+    use_cache = cache and not stream and "no-store" not in request_cc
+
+    entry = lookup(url, headers) if use_cache else None
+    if entry and entry.is_fresh() and "no-cache" not in request_cc:
+        STATS.add(hits=1)
+        return entry.response()
+
+    request_time = time.time()
+    resp = request("GET", url, {**headers, **(entry.validators() if entry else {})}, timeout)
+    if resp.status == 304 and entry:
+        resp.content
+        entry.refresh(resp.headers, request_time)
+        STATS.add(revalidated=1)
+        return entry.response()
+
+    STATS.add(misses=1)
+    if stream:
+        return resp
+    try:
+        if use_cache:
+            return store(url, headers, resp, request_time)
+        resp.content
+        return resp
+    finally:
+        resp.close()  # no-op once the body is read; releases the slot if storing failed
@@ -8,7 +8,7 @@ import re
 import subprocess
 from datetime import datetime
 from pathlib import Path
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import time
 
@@ -338,8 +338,8 @@ def search_for_abstract(talk):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
+        response = http_client.get(url, headers=headers, timeout=10)
+        if response.status == 200:
             soup = BeautifulSoup(response.content, 'html.parser')
             
             # Remove script and style elements
@@ -370,7 +370,8 @@ def search_for_abstract(talk):
                     print(f"Found abstract for {talk['title']}")
                     return abstract[:1000]  # Limit length
         
-        time.sleep(1)  # Be nice to servers
+        if not response.from_cache:
+            time.sleep(1)  # Be nice to servers
         
     except Exception as e:
         print(f"Error searching for abstract at {url}: {e}")
@@ -577,6 +578,7 @@ def main():
             abstract = search_for_abstract(talk)
             if abstract:
                 talk['abstract'] = abstract
+    http_client.report()
     
     # Update Google Sheet
     print("\n=== Updating Google Sheet ===")
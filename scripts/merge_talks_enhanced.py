@@ -8,7 +8,6 @@ import re
 import subprocess
 from datetime import datetime
 from pathlib import Path
-import requests
 from bs4 import BeautifulSoup
 import time
 
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Offline snapshot bundles: every external input of a build in one file.
+
+A bundle is a zip holding the raw responses of every URL the build reads
+(Google Sheets tabs, the published sync-drive CSVs, the arXiv API query,
+publication images) plus the local static/bib/ files, and a manifest.json
+listing each entry with its source, size and sha256. Replaying a bundle also
+renders pages as of its capture date (see sheet_data.build_date).
+
+Usage:
+  python3 scripts/offline_bundle.py capture [PATH]   # default: snapshots/<date>.zip
+  python3 scripts/offline_bundle.py verify PATH
+  python3 scripts/offline_bundle.py restore PATH     # write static/bib/ from the bundle
+
+Builds replay a bundle with zero network calls by passing --bundle PATH:
+  python3 scripts/sync_spreadsheet.py --cv --bundle snapshots/2026-10-18.zip
+  python3 scripts/sync-drive.py --bundle snapshots/2026-10-18.zip
+"""
+
+import hashlib
+import importlib
+import json
+import sys
+import zipfile
+from datetime import date
+from pathlib import Path
+
+from paths import PROJECT_DIR
+
+SNAPSHOT_DIR = PROJECT_DIR / "snapshots"
+BIB_DIR = PROJECT_DIR / "static" / "bib"
+
+# Bump when the bundle layout changes
+BUNDLE_VERSION = 1
+
+# Fixed member timestamp so the same inputs give a byte-identical bundle
+ZIP_DATE = (2020, 1, 1, 0, 0, 0)
+
+USER_AGENT = "academic-site-builder/1.0"
+
+
+def url_key(url):
+    """Archive member name for a URL's response body."""
+    return "urls/" + hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+
+class Bundle:
+    """Read side of a bundle: URL and file lookups against a captured zip."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.zip = zipfile.ZipFile(self.path)
+        self.manifest = json.loads(self.zip.read("manifest.json"))
+        if self.manifest.get("version") != BUNDLE_VERSION:
+            print(f"ERROR: {self.path} is bundle version {self.manifest.get('version')}, "
+                  f"expected {BUNDLE_VERSION}", file=sys.stderr)
+            sys.exit(1)
+        self.urls = {e["url"]: e for e in self.manifest["entries"] if e.get("url")}
+
+    def read_url(self, url):
+        """Captured response body for `url`; exits if the bundle lacks it."""
+        entry = self.urls.get(url)
+        if entry is None:
+            print(f"ERROR: {url} is not in bundle {self.path}", file=sys.stderr)
+            sys.exit(1)
+        return self.zip.read(entry["name"])
+
+    def extract_url(self, url, dest):
+        """Write the captured body for `url` to `dest` (skipped if already identical)."""
+        entry = self.urls.get(url)
+        dest = Path(dest)
+        if entry is not None and dest.exists() and file_sha256(dest) == entry["sha256"]:
+            return dest
+        body = self.read_url(url)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(body)
+        return dest
+
+    def files(self, prefix):
+        """Manifest entries for bundled local files under `prefix`."""
+        return [e for e in self.manifest["entries"]
+                if e.get("path", "").startswith(prefix)]
+
+
+_bundle = None
+
+
+def bundle_from_args():
+    """The Bundle named by --bundle PATH on the command line, or None."""
+    global _bundle
+    if _bundle is None and "--bundle" in sys.argv:
+        i = sys.argv.index("--bundle")
+        if i + 1 < len(sys.argv):
+            _bundle = Bundle(sys.argv[i + 1])
+    return _bundle
+
+
+def file_sha256(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+# ─── Capture ───
+
+def external_urls():
+    """Every URL a full build reads, as (kind, url) pairs."""
+    import sheet_data
+    sync_drive = importlib.import_module("sync-drive")
+    images = importlib.import_module("download_publication_images")
+
+    urls = [("sheet", sheet_data.tab_url(tab)) for tab in sheet_data.TABS]
+    urls.append(("sheet", sheet_data.workbook_url()))
+    urls += [("sheet", url) for url in sync_drive.PUBLISHED_CSVS.values()]
+    urls.append(("arxiv", sync_drive.arxiv_query_url(sync_drive.ARXIV_IDS)))
+    urls += [("image", img["src"]) for img in images.publication_images]
+    return urls
+
+
+def download(url):
+    """Current upstream body of `url` (bypassing the HTTP cache)."""
+    import http_client
+
+    resp = http_client.get(url, headers={"User-Agent": USER_AGENT}, timeout=60, cache=False)
+    resp.raise_for_status()
+    return resp.content
+
+
+def capture(path):
+    """Download every external input and write them, with a manifest, to `path`."""
+    entries = []
+    members = {}
+    failed = 0
+
+    for kind, url in external_urls():
+        try:
+            body = download(url)
+        except Exception as e:
+            print(f"  ERROR fetching {url}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        name = url_key(url)
+        members[name] = body
+        entries.append({"name": name, "kind": kind, "url": url, "size": len(body),
+                        "sha256": hashlib.sha256(body).hexdigest()})
+        print(f"  {kind}: {url} ({len(body)} bytes)")
+
+    for bib in sorted(BIB_DIR.glob("*.bib")):
+        body = bib.read_bytes()
+        rel = str(bib.relative_to(PROJECT_DIR))
+        name = "files/" + rel
+        members[name] = body
+        entries.append({"name": name, "kind": "file", "path": rel, "size": len(body),
+                        "sha256": hashlib.sha256(body).hexdigest()})
+    print(f"  files: {len(list(BIB_DIR.glob('*.bib')))} bib files")
+
+    if failed:
+        print(f"ERROR: {failed} input(s) could not be fetched; no bundle written",
+              file=sys.stderr)
+        sys.exit(1)
+
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "captured_on": date.today().isoformat(),
+        "entries": sorted(entries, key=lambda e: e["name"]),
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(zipfile.ZipInfo("manifest.json", ZIP_DATE),
+                    json.dumps(manifest, indent=2) + "\n", zipfile.ZIP_DEFLATED)
+        for name in sorted(members):
+            zf.writestr(zipfile.ZipInfo(name, ZIP_DATE), members[name], zipfile.ZIP_DEFLATED)
+    print(f"Wrote {path} ({len(entries)} entries)")
+
+
+def verify(path):
+    """Check every bundle entry against its manifest hash. Returns True if intact."""
+    bundle = Bundle(path)
+    bad = 0
+    for entry in bundle.manifest["entries"]:
+        body = bundle.zip.read(entry["name"])
+        if hashlib.sha256(body).hexdigest() != entry["sha256"]:
+            print(f"  MISMATCH {entry['name']} ({entry.get('url') or entry.get('path')})")
+            bad += 1
+    print(f"{len(bundle.manifest['entries']) - bad} ok, {bad} mismatched")
+    return bad == 0
+
+
+def restore(path):
+    """Write the bundled local files (static/bib/) back into the tree."""
+    bundle = Bundle(path)
+    for entry in bundle.files("static/bib/"):
+        dest = PROJECT_DIR / entry["path"]
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(bundle.zip.read(entry["name"]))
+        print(f"  Restored {entry['path']}")
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("capture", "verify", "restore"):
+        print(__doc__)
+        sys.exit(2)
+    command = sys.argv[1]
+    path = sys.argv[2] if len(sys.argv) > 2 else None
+
+    if command == "capture":
+        capture(path or SNAPSHOT_DIR / f"{date.today().isoformat()}.zip")
+    elif not path:
+        print(f"Usage: python3 scripts/offline_bundle.py {command} PATH")
+        sys.exit(2)
+    elif command == "verify":
+        sys.exit(0 if verify(path) else 1)
+    else:
+        restore(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Where the scripts read and write, and which sheet they read, resolved once
+from the environment so another site can be built from this checkout (see
+farm.py):
+
+  SITE_DIR: the site checkout to read and write (default: this checkout)
+  SHEET_ID: the Google Sheet to fetch (default: SHEET_ID below)
+  HTTP_CACHE_DIR: the HTTP response cache (default: cache/http/ in the site;
+    see http_client.py)
+"""
+
+import os
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_DIR = Path(os.environ.get("SITE_DIR") or SCRIPT_DIR.parent)
+CACHE_DIR = PROJECT_DIR / "cache"
+
+SHEET_ID = os.environ.get("SHEET_ID") or "1X7VKV3pwBoYjQoUHpxckYJAgaErCYkevc47bJoMV0J0"
+
+HTTP_CACHE_DIR = Path(os.environ.get("HTTP_CACHE_DIR") or CACHE_DIR / "http")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Local SQLite store of every tab's records, with indexes and full-text search.
+
+run_pipeline keeps cache/records.sqlite in step with the sheet as tabs
+arrive: a tab whose stored version is the one sheet_diff diffed against gets
+only its inserted/updated/deleted rows applied; any other stale tab is
+reloaded. Each tab has its own table (one column per sheet column, plus the
+row's sheet_diff key, its sheet position and ISO `day`/`end_day`), indexed on
+the columns queries filter by. The `search` FTS5 table covers titles,
+abstracts and places (event, location) of talks, travel and publications.
+A search QUERY that is not valid FTS5 syntax is searched for as a phrase.
+
+Usage:
+  python3 scripts/record_store.py search QUERY [--tab TAB] [--limit N]
+  python3 scripts/record_store.py talks [--at PLACE] [--since DATE] [--until DATE]
+  python3 scripts/record_store.py sql "SELECT ..."
+
+  python3 scripts/record_store.py talks --at ETH --since 2022-01-01
+  python3 scripts/record_store.py search 'decoupling NOT cantor' --tab talks
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+from paths import PROJECT_DIR
+from records import RECORD_TYPES
+from sheet_diff import baseline_digest, keyed
+
+STORE_PATH = PROJECT_DIR / "cache" / "records.sqlite"
+
+# Tab → columns to index
+INDEXES = {
+    "talks": ("day", "event", "type", "block"),
+    "travel": ("day", "end_day", "location"),
+    "publications": ("date", "type"),
+    "teaching": ("institution", "term"),
+}
+
+# Tab → (title column, place columns) for the full-text index
+SEARCHABLE = {
+    "talks": ("title", ("event", "short_location")),
+    "travel": ("title", ("location", "short_location")),
+    "publications": ("title", ()),
+}
+
+
+def columns(tab_name):
+    """Stored columns of a tab: its sheet columns plus parsed dates."""
+    cls = RECORD_TYPES[tab_name]
+    extra = tuple(c for c in ("day", "end_day") if c in cls.__slots__)
+    return cls.COLUMNS + extra
+
+
+def row_values(record, cols):
+    values = []
+    for c in cols:
+        value = getattr(record, c)
+        values.append(value.isoformat() if hasattr(value, "isoformat") else value or "")
+    return values
+
+
+class RecordStore:
+    """cache/records.sqlite: one table per tab, plus the `search` FTS5 table."""
+
+    def __init__(self, path=STORE_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.fts = True
+        self.create_schema()
+
+    def close(self):
+        self.db.close()
+
+    def create_schema(self):
+        db = self.db
+        db.execute("CREATE TABLE IF NOT EXISTS tabs (name TEXT PRIMARY KEY, digest TEXT)")
+        for tab_name in RECORD_TYPES:
+            cols = ", ".join(f'"{c}" TEXT' for c in columns(tab_name))
+            db.execute(f'CREATE TABLE IF NOT EXISTS "{tab_name}" '
+                       f'(key TEXT PRIMARY KEY, position INTEGER, {cols})')
+            for c in INDEXES.get(tab_name, ()):
+                db.execute(f'CREATE INDEX IF NOT EXISTS "{tab_name}_{c}" ON "{tab_name}" ("{c}")')
+        try:
+            db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5("
+                       "tab UNINDEXED, key UNINDEXED, title, abstract, place, "
+                       "tokenize = 'unicode61 remove_diacritics 2')")
+        except sqlite3.OperationalError:
+            print("  Warning: this SQLite has no FTS5; full-text search disabled", file=sys.stderr)
+            self.fts = False
+        db.commit()
+
+    def digest(self, tab_name):
+        row = self.db.execute("SELECT digest FROM tabs WHERE name = ?", (tab_name,)).fetchone()
+        return row["digest"] if row else None
+
+    # ─── Ingest ───
+
+    def ingest(self, tab_name, rows, records, digest, changes):
+        """Bring a tab's table up to date with this run's version of it.
+
+        `records` are the tab's typed records, `rows` the same records as row
+        dicts (Collection.rows) and `changes` their TabDiff against the
+        previous run's version.
+        """
+        if tab_name not in RECORD_TYPES:
+            return
+        stored = self.digest(tab_name)
+        if stored == digest:
+            return
+        by_key = dict(zip((key for key, _ in keyed(rows)), records))
+        if stored is not None and stored == baseline_digest(tab_name):
+            self.apply(tab_name, by_key, changes)
+            how = f"applied {changes.summary()}"
+        else:
+            self.reload(tab_name, by_key)
+            how = f"loaded {len(by_key)} rows"
+        self.db.execute("INSERT OR REPLACE INTO tabs (name, digest) VALUES (?, ?)",
+                        (tab_name, digest))
+        self.db.commit()
+        print(f"  Record store: {tab_name} {how}")
+
+    def reload(self, tab_name, by_key):
+        self.db.execute(f'DELETE FROM "{tab_name}"')
+        if self.fts:
+            self.db.execute("DELETE FROM search WHERE tab = ?", (tab_name,))
+        self.insert(tab_name, by_key, by_key)
+
+    def apply(self, tab_name, by_key, changes):
+        gone = list(changes.deleted) + list(changes.updated)
+        self.db.executemany(f'DELETE FROM "{tab_name}" WHERE key = ?', ((k,) for k in gone))
+        if self.fts:
+            self.db.executemany("DELETE FROM search WHERE tab = ? AND key = ?",
+                                ((tab_name, k) for k in gone))
+        self.insert(tab_name, by_key, list(changes.inserted) + list(changes.updated))
+        # Rows may have moved in the sheet
+        self.db.executemany(f'UPDATE "{tab_name}" SET position = ? WHERE key = ?',
+                            ((i, key) for i, key in enumerate(by_key)))
+
+    def insert(self, tab_name, by_key, keys):
+        cols = columns(tab_name)
+        positions = {key: i for i, key in enumerate(by_key)}
+        names = ", ".join(f'"{c}"' for c in ("key", "position") + cols)
+        marks = ", ".join("?" * (len(cols) + 2))
+        self.db.executemany(
+            f'INSERT INTO "{tab_name}" ({names}) VALUES ({marks})',
+            ([key, positions[key]] + row_values(by_key[key], cols) for key in keys))
+        if self.fts and tab_name in SEARCHABLE:
+            title, places = SEARCHABLE[tab_name]
+            self.db.executemany(
+                "INSERT INTO search (tab, key, title, abstract, place) VALUES (?, ?, ?, ?, ?)",
+                ((tab_name, key, getattr(by_key[key], title), getattr(by_key[key], "abstract", ""),
+                  " ".join(getattr(by_key[key], p) for p in places)) for key in keys))
+
+    # ─── Queries ───
+
+    def talks(self, at=None, since=None, until=None):
+        """Talks in date order, optionally at a place (full-text match on event and
+        location) and within [since, until] (ISO dates)."""
+        where, params = ["day != ''"], []
+        if since:
+            where.append("day >= ?")
+            params.append(since)
+        if until:
+            where.append("day <= ?")
+            params.append(until)
+        if at:
+            if self.fts:
+                where.append("key IN (SELECT key FROM search WHERE tab = 'talks' AND search MATCH ?)")
+                params.append(f"place : {fts_phrase(at)}")
+            else:
+                where.append("(event LIKE ? OR short_location LIKE ?)")
+                params += [f"%{at}%", f"%{at}%"]
+        return self.db.execute(
+            f"SELECT * FROM talks WHERE {' AND '.join(where)} ORDER BY day, position",
+            params).fetchall()
+
+    def search(self, query, tab=None, limit=20):
+        """Best full-text matches for an FTS5 query: (tab, key, title) rows."""
+        if not self.fts:
+            return []
+        sql = "SELECT tab, key, title FROM search WHERE search MATCH ?"
+        params = [query]
+        if tab:
+            sql += " AND tab = ?"
+            params.append(tab)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        return self.db.execute(sql, params).fetchall()
+
+
+def fts_phrase(text):
+    """`text` as a quoted FTS5 phrase."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+# ─── CLI ───
+
+def main():
+    from sheet_data import get_option
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("search", "talks", "sql"):
+        print(__doc__)
+        sys.exit(2)
+    if not STORE_PATH.exists():
+        print(f"No record store at {STORE_PATH}; run sync_spreadsheet.py first")
+        sys.exit(1)
+    store = RecordStore()
+    command = sys.argv[1]
+    if command == "search":
+        if len(sys.argv) < 3:
+            print(__doc__)
+            sys.exit(2)
+        query, tab, limit = sys.argv[2], get_option("--tab", None), int(get_option("--limit", 20))
+        try:
+            rows = store.search(query, tab, limit)
+        except sqlite3.Error:
+            # Not FTS5 syntax ("hot-spots"): search for the text as a phrase
+            try:
+                rows = store.search(fts_phrase(query), tab, limit)
+            except sqlite3.Error as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+        for row in rows:
+            print(f"{row['tab']:<13} {row['title']}")
+    elif command == "talks":
+        for row in store.talks(get_option("--at", None), get_option("--since", None),
+                               get_option("--until", None)):
+            print(f"{row['day']}  {row['title'] or 'TBD'} ({row['event']})")
+    else:
+        try:
+            rows = store.db.execute(sys.argv[2]).fetchall()
+        except (IndexError, sqlite3.Error) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        for row in rows:
+            print("\t".join(str(v) for v in tuple(row)))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
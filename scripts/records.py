@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Typed records for the rows of each spreadsheet tab.
+
+run_pipeline turns each tab's rows into records once, as the tab arrives, and
+every generator reads attributes instead of re-stripping dict cells:
+  - one slotted class per tab (Talk, Travel, Publication, Position, ...)
+    whose attributes are the tab's columns, already stripped
+  - date columns keep their sheet text (`date`, `date_end`) and add the
+    parsed datetime.date as `day` / `end_day` (None if unparseable)
+  - repeated categorical values (type, event, block, short_location, ...)
+    are interned, so rows share one string per distinct value
+  - abstracts live once in the content-addressed store (abstract_store.py);
+    records hold `abstract_id` and `abstract` looks the text up
+  - publication author strings are split once into `author_list`
+
+A tab's records come as a Collection: a list in sheet order whose
+`timeline` (a TemporalIndex over `day`), for talks `series` (a
+talk_series.SeriesIndex) and for publications `coauthors` (a
+coauthors.CoauthorIndex) are built on first use and then shared by every
+generator.
+"""
+
+import re
+import sys
+from datetime import date
+
+from abstract_store import ABSTRACTS
+from coauthors import CoauthorIndex, parse_authors
+from talk_series import SeriesIndex
+from temporal_index import TemporalIndex
+
+
+def parse_date(s):
+    """Parse YYYY-MM-DD (possibly with time suffix) into a date object, or None."""
+    if not s:
+        return None
+    m = re.match(r"(\d{4})-(\d{2})-(\d{2})", s)
+    if m:
+        try:
+            return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            return None
+    return None
+
+
+class Record:
+    """Base for tab records: COLUMNS are copied from the row, INTERNED ones interned."""
+
+    __slots__ = ()
+    COLUMNS = ()
+    INTERNED = frozenset()
+
+    def __init__(self, **values):
+        for name in self.COLUMNS:
+            value = values.get(name, "")
+            setattr(self, name, sys.intern(value) if name in self.INTERNED else value)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(**row)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.COLUMNS}
+
+    def __repr__(self):
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.COLUMNS[:3])
+        return f"{type(self).__name__}({fields}, ...)"
+
+
+# The abstract column: stored by id, resolved on read
+ABSTRACT = property(lambda self: ABSTRACTS.get(self.abstract_id),
+                    lambda self, text: setattr(self, "abstract_id", ABSTRACTS.put(text)))
+
+
+class Talk(Record):
+    COLUMNS = ("title", "type", "event", "date", "url", "abstract", "block", "category",
+               "short_location")
+    INTERNED = frozenset({"type", "event", "block", "category", "short_location"})
+    __slots__ = tuple(c for c in COLUMNS if c != "abstract") + ("abstract_id", "day")
+    abstract = ABSTRACT
+
+    def __init__(self, **values):
+        super().__init__(**values)
+        self.day = parse_date(self.date)
+
+
+class Travel(Record):
+    COLUMNS = ("title", "location", "date", "date_end", "url", "short_location")
+    INTERNED = frozenset({"location", "short_location"})
+    __slots__ = COLUMNS + ("day", "end_day")
+
+    def __init__(self, **values):
+        super().__init__(**values)
+        self.day = parse_date(self.date)
+        self.end_day = parse_date(self.date_end)
+
+
+class Publication(Record):
+    COLUMNS = ("title", "authors", "arxiv", "url", "date", "abstract", "type")
+    INTERNED = frozenset({"type"})
+    __slots__ = tuple(c for c in COLUMNS if c != "abstract") + ("abstract_id", "author_list")
+    abstract = ABSTRACT
+
+    def __init__(self, **values):
+        super().__init__(**values)
+        self.author_list = parse_authors(self.authors)
+
+
+class Position(Record):
+    COLUMNS = ("title", "institution", "start", "end", "details")
+    INTERNED = frozenset({"institution"})
+    __slots__ = COLUMNS
+
+
+class Education(Record):
+    COLUMNS = ("degree", "institution", "year", "details", "rank")
+    INTERNED = frozenset({"institution"})
+    __slots__ = COLUMNS
+
+
+class Award(Record):
+    COLUMNS = ("award", "year", "institution", "details")
+    INTERNED = frozenset({"year", "institution"})
+    __slots__ = COLUMNS
+
+
+class Course(Record):
+    COLUMNS = ("course", "institution", "role", "term")
+    INTERNED = frozenset({"institution", "role", "term"})
+    __slots__ = COLUMNS
+
+    def __init__(self, **values):
+        # Sheets without a role column list TA sections
+        values.setdefault("role", "Teaching Assistant")
+        super().__init__(**values)
+
+
+class Service(Record):
+    COLUMNS = ("type", "details", "year")
+    INTERNED = frozenset({"type", "year"})
+    __slots__ = COLUMNS
+
+
+# Tab name → record class
+RECORD_TYPES = {
+    "publications": Publication,
+    "talks": Talk,
+    "travel": Travel,
+    "teaching": Course,
+    "grants_awards": Award,
+    "education": Education,
+    "positions": Position,
+    "service": Service,
+}
+
+
+class Collection(list):
+    """A tab's records in sheet order, with a shared date index."""
+
+    def __init__(self, records=()):
+        super().__init__(records)
+        self._timeline = None
+        self._series = None
+        self._coauthors = None
+
+    def rows(self):
+        """The records as row dicts of their columns, in sheet order."""
+        return (r.as_dict() if isinstance(r, Record) else r for r in self)
+
+    @property
+    def timeline(self):
+        """TemporalIndex over the records' `day` (built once, on first use)."""
+        if self._timeline is None:
+            self._timeline = TemporalIndex(self)
+        return self._timeline
+
+    @property
+    def series(self):
+        """SeriesIndex of talk records (built once, on first use)."""
+        if self._series is None:
+            self._series = SeriesIndex(self)
+        return self._series
+
+    @property
+    def coauthors(self):
+        """CoauthorIndex of publication records (built once, on first use)."""
+        if self._coauthors is None:
+            self._coauthors = CoauthorIndex(self)
+        return self._coauthors
+
+
+def build_records(tab_name, rows):
+    """The typed records of a tab as a Collection (rows as-is for unknown tabs)."""
+    cls = RECORD_TYPES.get(tab_name)
+    if cls is None:
+        return Collection(rows)
+    return Collection(cls.from_row(row) for row in rows)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Talk ↔ publication link index.
+
+Matches each talk series (talk_series.py) to the publications it is about,
+by TF-IDF cosine similarity of titles (weighted up) and abstracts. Blocking
+keeps it from scoring every pair: publications are indexed by their
+distinctive words (ones that appear in at most BLOCK_MAX_DF of them) and a
+series is only scored against publications sharing such a word with its
+title or abstract.
+
+Built once per run (links(talks, publications)) and then read with dict
+lookups by the series pages, the publication pages and the LaTeX CV:
+  index.papers(series)   → publications, best match first
+  index.series_for(pub)  → series, in sheet order
+"""
+
+import math
+import re
+from collections import Counter
+
+# Title words count this many times an abstract word
+TITLE_WEIGHT = 3
+
+# A link needs at least this cosine similarity; each series keeps its best few
+MIN_SCORE = 0.2
+MAX_PAPERS = 2
+
+# Words in more than this fraction of publications are not blocking keys
+BLOCK_MAX_DF = 0.25
+
+STOPWORDS = frozenset("""
+a about above after again all also an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from
+further had has have having here how however i if in into is it its itself just may
+more most no nor not of off on once only or other our out over own same she should so
+some such than that the their them then there these they this those through to too
+under until up very was we were what when where which while who whom why will with
+would you your new via using talk paper show prove result results give given one two
+""".split())
+
+
+def words(text):
+    """Content words of `text`, lowercased and crudely singularized."""
+    out = []
+    for w in re.findall(r"[^\W\d_]+", text.lower()):
+        if len(w) < 3 or w in STOPWORDS:
+            continue
+        if len(w) > 4 and w.endswith("s") and not w.endswith("ss"):
+            w = w[:-1]
+        out.append(w)
+    return out
+
+
+def term_counts(title, abstract):
+    counts = Counter(words(abstract))
+    for w in words(title):
+        counts[w] += TITLE_WEIGHT
+    return counts
+
+
+class LinkIndex:
+    """Series ↔ publication links, precomputed."""
+
+    def __init__(self, series_index, publications):
+        self.pubs = [p for p in publications if p.title]
+        series_list = list(series_index)
+
+        pub_terms = [term_counts(p.title, p.abstract) for p in self.pubs]
+        series_terms = [term_counts(s.title, " ".join(
+            dict.fromkeys(t.abstract for t in s.talks if t.abstract))) for s in series_list]
+
+        # Inverse document frequency over every document on both sides
+        df = Counter()
+        for terms in pub_terms + series_terms:
+            df.update(terms.keys())
+        n_docs = len(pub_terms) + len(series_terms)
+        idf = {w: math.log((n_docs + 1) / (d + 1)) + 1 for w, d in df.items()}
+
+        pub_vectors = [self.vector(terms, idf) for terms in pub_terms]
+
+        # Blocking: distinctive word → publications containing it
+        pub_df = Counter()
+        for terms in pub_terms:
+            pub_df.update(terms.keys())
+        max_df = max(1, int(BLOCK_MAX_DF * len(self.pubs)))
+        postings = {}
+        for i, terms in enumerate(pub_terms):
+            for w in terms:
+                if pub_df[w] <= max_df:
+                    postings.setdefault(w, []).append(i)
+
+        self._papers = {}
+        self._series = {}
+        self.scored = 0
+        for s, terms in zip(series_list, series_terms):
+            candidates = {i for w in terms for i in postings.get(w, ())}
+            vector = self.vector(terms, idf)
+            scores = []
+            for i in candidates:
+                score = sum(weight * pub_vectors[i].get(w, 0.0) for w, weight in vector.items())
+                if score >= MIN_SCORE:
+                    scores.append((score, i))
+            self.scored += len(candidates)
+            scores.sort(key=lambda x: (-x[0], x[1]))
+            papers = [self.pubs[i] for _, i in scores[:MAX_PAPERS]]
+            if papers:
+                self._papers[s.key] = papers
+                for p in papers:
+                    self._series.setdefault(id(p), []).append(s)
+
+    @staticmethod
+    def vector(terms, idf):
+        """Unit-length TF-IDF vector of a term count."""
+        weights = {w: (1 + math.log(c)) * idf[w] for w, c in terms.items()}
+        norm = math.sqrt(sum(v * v for v in weights.values())) or 1.0
+        return {w: v / norm for w, v in weights.items()}
+
+    def papers(self, series):
+        """Publications a talk series is about, best match first."""
+        return self._papers.get(series.key, [])
+
+    def series_for(self, publication):
+        """Talk series about a publication, in sheet order."""
+        return self._series.get(id(publication), [])
+
+    def __len__(self):
+        return sum(len(papers) for papers in self._papers.values())
+
+
+_indexes = {}
+
+
+def links(talks, publications):
+    """The LinkIndex of a run's talks and publications collections (built once)."""
+    key = (id(talks), id(publications))
+    if key not in _indexes:
+        # Keep the collections alive with their index so the ids stay theirs
+        _indexes[key] = (talks, publications, LinkIndex(talks.series, publications))
+    return _indexes[key][2]
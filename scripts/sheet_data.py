@@ -0,0 +1,652 @@
+#!/usr/bin/env python3
+"""
+Shared data-loading layer for the spreadsheet-driven generators.
+
+Fetches each tab of the unified Google Sheet at most once per run, normalizes
+the rows, and keeps them in a Snapshot that both sync_spreadsheet.py (Hugo
+content) and generate_cv.py (LaTeX sections) consume. A snapshot can also be
+written to disk and handed to a later process:
+
+  python3 scripts/sync_spreadsheet.py --save-snapshot cache/snapshot.jsonl
+  python3 scripts/generate_cv.py --from-snapshot cache/snapshot.jsonl
+
+Common options (read from sys.argv):
+  --cached: use local CSV cache instead of fetching from Google Sheets
+  --jobs N: number of tabs fetched concurrently (default: 8, 1 = serial)
+  --xlsx: fetch every tab with a single whole-workbook XLSX export and split
+    it locally, instead of one gviz request per tab
+  --max-age SECONDS: reuse cached tabs fetched less than SECONDS ago without
+    contacting Google (default: 0, always revalidate)
+  --budget SECONDS: wall-clock limit for fetching, retries included; once
+    spent, tabs fall back to their cached copy (default: 120)
+  --retries N: retries per request on timeouts, connection errors and 5xx/429
+    responses, with jittered exponential backoff (default: 3)
+  --stale-while-revalidate: serve cached tabs immediately and refresh them in
+    the background for the next run
+  --force: regenerate every output even if its inputs are unchanged
+  --from-snapshot PATH: read tabs from a saved snapshot instead of fetching
+  --save-snapshot PATH: write this run's snapshot to PATH
+  --bundle PATH: read tabs from an offline bundle (see offline_bundle.py),
+    never touching the network
+  --today YYYY-MM-DD: render as of this date instead of today (defaults to the
+    capture date with --bundle)
+
+Environment (see paths.py):
+  SITE_DIR: the site to read and write (default: this checkout)
+  SHEET_ID: the Google Sheet to fetch
+  HTTP_CACHE_DIR: the HTTP response cache (default: cache/http/; see http_client.py)
+"""
+
+import csv
+import hashlib
+import json
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import http_client
+from build_manifest import BuildManifest, config_values, file_hash, input_hash, module_closure
+from http_client import HTTPError
+from offline_bundle import bundle_from_args
+from paths import CACHE_DIR, SHEET_ID
+from record_store import RecordStore
+from records import build_records
+from sheet_diff import diff_tab, save_changes, write_baseline
+
+# Tab name → gid (for fetching)
+TABS = {
+    "publications": "948751242",
+    "talks": "508483272",
+    "travel": "1947229337",
+    "teaching": "733600881",
+    "grants_awards": "534833029",
+    "education": "741365414",
+    "positions": "1595934787",
+    "service": "756633452",
+}
+
+# Upper bound on concurrent gviz requests (override with --jobs N)
+FETCH_WORKERS = 8
+
+# Wall-clock seconds allowed for all fetching in one run (override with --budget)
+FETCH_BUDGET = 120
+
+# Per-request timeout, capped by what is left of the budget
+REQUEST_TIMEOUT = 30
+
+# Retries per request (override with --retries); the backoff before retry n is
+# drawn uniformly from [0, min(RETRY_CAP, RETRY_BASE * 2**n)] seconds
+FETCH_RETRIES = 3
+RETRY_BASE = 1.0
+RETRY_CAP = 8.0
+
+# Per-run fetch outcome for each tab: "cached" (--cached), "fresh" (within
+# --max-age, not requested), "unchanged" (304 or identical body), "updated",
+# "stale" (fetch failed, fell back to cache), "revalidating" (cache served,
+# refresh running in the background) or "bundled" (--bundle)
+TAB_STATUS = {}
+
+_deadline = None
+_refreshes = []
+
+
+def get_option(flag, default):
+    """Return the value following `flag` in sys.argv, or `default`."""
+    if flag in sys.argv:
+        i = sys.argv.index(flag)
+        if i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return default
+
+
+def build_date():
+    """The date outputs are rendered for ("today").
+
+    --today YYYY-MM-DD overrides it; with --bundle it defaults to the day the
+    bundle was captured, so replaying a bundle reproduces that day's site.
+    """
+    override = get_option("--today", None)
+    if override:
+        return date.fromisoformat(override)
+    bundle = bundle_from_args()
+    if bundle and bundle.manifest.get("captured_on"):
+        return date.fromisoformat(bundle.manifest["captured_on"])
+    return date.today()
+
+
+# ─── Fetching ───
+
+def tab_url(tab_name):
+    """gviz CSV export URL for a tab."""
+    return f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/gviz/tq?tqx=out:csv&gid={TABS[tab_name]}"
+
+
+def read_cache_meta(tab_name):
+    """Read the sidecar metadata (validators, fetch time) for a cached tab."""
+    meta_file = CACHE_DIR / f"{tab_name}.meta.json"
+    if not meta_file.exists():
+        return {}
+    try:
+        return json.loads(meta_file.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+
+
+def write_cache_meta(tab_name, meta):
+    """Write the sidecar metadata for a cached tab."""
+    meta_file = CACHE_DIR / f"{tab_name}.meta.json"
+    meta_file.write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+
+
+def cache_age(meta):
+    """Seconds since the tab was last fetched or revalidated, or None if unknown."""
+    fetched_at = meta.get("fetched_at")
+    if not fetched_at:
+        return None
+    return (datetime.now(timezone.utc) - datetime.fromisoformat(fetched_at)).total_seconds()
+
+
+def time_left():
+    """Seconds left of the --budget for this run (the clock starts on first use)."""
+    global _deadline
+    if _deadline is None:
+        _deadline = time.monotonic() + float(get_option("--budget", FETCH_BUDGET))
+    return _deadline - time.monotonic()
+
+
+def is_retryable(error):
+    """True for errors worth retrying: timeouts, connection failures, 5xx and 429."""
+    import http.client
+
+    if isinstance(error, HTTPError):
+        return error.code == 429 or error.code >= 500
+    return isinstance(error, (OSError, http.client.HTTPException))
+
+
+def fetch_with_retries(name, url, cache_file):
+    """conditional_get with jittered exponential backoff, within the --budget.
+
+    Raises the last error once retries are used up, the error is not worth
+    retrying, or the budget would run out before the next attempt.
+    """
+    retries = int(get_option("--retries", FETCH_RETRIES))
+    attempt = 0
+    while True:
+        left = time_left()
+        if left <= 0:
+            raise TimeoutError("fetch budget exhausted")
+        try:
+            return conditional_get(name, url, cache_file, timeout=min(REQUEST_TIMEOUT, left))
+        except Exception as e:
+            delay = random.uniform(0, min(RETRY_CAP, RETRY_BASE * 2 ** attempt))
+            if attempt >= retries or not is_retryable(e) or delay >= time_left():
+                raise
+            print(f"  Retrying {name} in {delay:.1f}s ({e})", file=sys.stderr)
+            time.sleep(delay)
+            attempt += 1
+
+
+def conditional_get(name, url, cache_file, timeout=REQUEST_TIMEOUT):
+    """Revalidate `cache_file` against `url`, downloading it if it changed.
+
+    The request carries the ETag / Last-Modified recorded in the `name`
+    sidecar, so an unchanged resource comes back as a 304. A changed body is
+    streamed in chunks into a .part file beside `cache_file` (hashing as it
+    goes) and moved into place. The request goes through the shared pooled
+    client (http_client) but bypasses its response cache, since the tab CSV
+    is itself the cached copy. Returns "updated" or "unchanged"; raises if
+    the request fails or the --budget runs out mid-download.
+    """
+    meta = read_cache_meta(name) if cache_file.exists() else {}
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    CACHE_DIR.mkdir(exist_ok=True)
+    part_file = cache_file.with_name(cache_file.name + ".part")
+    digest = None
+    resp = None
+    try:
+        resp = http_client.get(url, headers=headers, timeout=timeout, stream=True)
+        resp_headers = resp.headers
+        if resp.status == 304 and cache_file.exists():
+            resp.close()
+        else:
+            resp.raise_for_status()
+            with open(part_file, "wb") as out:
+                h = hashlib.sha256()
+                for chunk in resp.iter_content():
+                    if time_left() <= 0:
+                        raise TimeoutError("fetch budget exhausted mid-download")
+                    h.update(chunk)
+                    out.write(chunk)
+                digest = h.hexdigest()
+    except Exception:
+        if resp is not None:
+            resp.close()
+        part_file.unlink(missing_ok=True)
+        raise
+
+    # A 304, or a 200 whose body matches the cache byte for byte, is unchanged
+    if digest is None or digest == file_hash(cache_file):
+        status = "unchanged"
+        part_file.unlink(missing_ok=True)
+    else:
+        status = "updated"
+        os.replace(part_file, cache_file)
+
+    write_cache_meta(name, {
+        "url": url,
+        "etag": resp_headers.get("ETag") or meta.get("etag", ""),
+        "last_modified": resp_headers.get("Last-Modified") or meta.get("last_modified", ""),
+        "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    })
+    return status
+
+
+def is_fresh(name, cache_file):
+    """True if `cache_file` was fetched or revalidated less than --max-age seconds ago."""
+    if not cache_file.exists():
+        return False
+    age = cache_age(read_cache_meta(name))
+    return age is not None and age < float(get_option("--max-age", 0))
+
+
+def pinned(cache_file):
+    """A hard link (or copy) of `cache_file` that a background refresh won't replace.
+
+    Rows served while a refresh is running are read from it, so every pass
+    over a tab in this run sees the same version.
+    """
+    served = cache_file.with_name(cache_file.name + ".served")
+    served.unlink(missing_ok=True)
+    try:
+        os.link(cache_file, served)
+    except OSError:
+        shutil.copyfile(cache_file, served)
+    return served
+
+
+def refresh_in_background(name, job):
+    """Run `job` (a cache refresh) on a daemon thread; see wait_for_refreshes."""
+    def run():
+        try:
+            job()
+        except Exception as e:
+            print(f"WARNING: background refresh of {name} failed: {e}", file=sys.stderr)
+
+    thread = threading.Thread(target=run, name=f"refresh-{name}", daemon=True)
+    thread.start()
+    _refreshes.append((name, thread))
+
+
+def wait_for_refreshes():
+    """Give background refreshes what is left of the --budget to finish."""
+    done = 0
+    for name, thread in _refreshes:
+        thread.join(max(0, time_left()))
+        if thread.is_alive():
+            print(f"WARNING: refresh of {name} did not finish within the budget",
+                  file=sys.stderr)
+        else:
+            done += 1
+    if done:
+        print(f"  Refreshed {done} cache entr{'y' if done == 1 else 'ies'} "
+              f"in the background for the next run")
+    _refreshes.clear()
+
+
+def fetch_tab(tab_name):
+    """Fetch a tab from Google Sheets via public CSV export, as TabRows.
+
+    The response is streamed into cache/<tab>.csv (see conditional_get), so
+    the download is never held in memory whole; the rows are then parsed from
+    the cached file once. A cached
+    copy younger than --max-age seconds is used without a request; with
+    --stale-while-revalidate any cached copy is served at once and refreshed
+    in the background. Failed requests are retried within the --budget (see
+    fetch_with_retries). The outcome is recorded in TAB_STATUS.
+    """
+    cache_file = CACHE_DIR / f"{tab_name}.csv"
+    url = tab_url(tab_name)
+
+    bundle = bundle_from_args()
+    if bundle:
+        # Extracted beside the cache, so the cache's validators stay truthful
+        TAB_STATUS[tab_name] = "bundled"
+        return csv_rows(bundle.extract_url(url, CACHE_DIR / "bundle" / f"{tab_name}.csv"))
+
+    if "--cached" in sys.argv and cache_file.exists():
+        TAB_STATUS[tab_name] = "cached"
+        return csv_rows(cache_file)
+
+    if is_fresh(tab_name, cache_file):
+        TAB_STATUS[tab_name] = "fresh"
+        return csv_rows(cache_file)
+
+    if "--stale-while-revalidate" in sys.argv and cache_file.exists():
+        TAB_STATUS[tab_name] = "revalidating"
+        served = pinned(cache_file)
+        refresh_in_background(tab_name, lambda: fetch_with_retries(tab_name, url, cache_file))
+        return csv_rows(served)
+
+    try:
+        TAB_STATUS[tab_name] = fetch_with_retries(tab_name, url, cache_file)
+    except Exception as e:
+        return fetch_failed(tab_name, e)
+    return csv_rows(cache_file)
+
+
+def fetch_failed(tab_name, error):
+    """Fall back to the cached copy of a tab after a failed fetch, or exit."""
+    print(f"ERROR fetching {tab_name}: {error}", file=sys.stderr)
+    (CACHE_DIR / f"{tab_name}.csv.part").unlink(missing_ok=True)
+    cache_file = CACHE_DIR / f"{tab_name}.csv"
+    if cache_file.exists():
+        print(f"  Falling back to cache", file=sys.stderr)
+        TAB_STATUS[tab_name] = "stale"
+        return csv_rows(cache_file)
+    sys.exit(1)
+
+
+def fetch_tabs(tab_names, workers=FETCH_WORKERS):
+    """Fetch several tabs concurrently, yielding (tab_name, records) as each arrives."""
+    workers = max(1, min(workers, len(tab_names)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_tab, name): name for name in tab_names}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def workbook_url():
+    """XLSX export URL for the whole spreadsheet."""
+    return f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=xlsx"
+
+
+def fetch_workbook(tab_names, workers=FETCH_WORKERS):
+    """Fetch tabs with one whole-workbook XLSX export (the --xlsx option).
+
+    The workbook is revalidated and streamed into cache/workbook.xlsx like a
+    single tab, then each requested sheet is split into cache/<tab>.csv one
+    row at a time, so digests and the build manifest see the same per-tab
+    CSVs as with per-tab fetching. Yields (tab_name, records) as each sheet
+    is written. Tabs missing from the workbook fall back to a gviz fetch.
+    """
+    bundle = bundle_from_args()
+    if "--cached" in sys.argv and not bundle:
+        yield from fetch_tabs(tab_names, workers)
+        return
+
+    if bundle:
+        out_dir = CACHE_DIR / "bundle"
+        workbook_file = bundle.extract_url(workbook_url(), out_dir / "workbook.xlsx")
+        status = "bundled"
+    else:
+        out_dir = CACHE_DIR
+        workbook_file = CACHE_DIR / "workbook.xlsx"
+        cached = [out_dir / f"{t}.csv" for t in tab_names]
+        if "--stale-while-revalidate" in sys.argv and all(p.exists() for p in cached):
+            served = [pinned(p) for p in cached]
+
+            def refresh():
+                if fetch_with_retries("workbook", workbook_url(), workbook_file) == "updated":
+                    for _ in split_workbook(workbook_file, tab_names, out_dir, "updated"):
+                        pass
+
+            refresh_in_background("workbook", refresh)
+            for tab_name, served_file in zip(tab_names, served):
+                TAB_STATUS[tab_name] = "revalidating"
+                yield tab_name, csv_rows(served_file)
+            return
+
+        if is_fresh("workbook", workbook_file):
+            status = "fresh"
+        else:
+            try:
+                status = fetch_with_retries("workbook", workbook_url(), workbook_file)
+            except Exception as e:
+                for tab_name in tab_names:
+                    yield tab_name, fetch_failed(tab_name, e)
+                return
+
+    cached = [out_dir / f"{t}.csv" for t in tab_names]
+    if status in ("fresh", "unchanged") and all(p.exists() for p in cached):
+        for tab_name, cache_file in zip(tab_names, cached):
+            TAB_STATUS[tab_name] = status
+            yield tab_name, csv_rows(cache_file)
+        return
+
+    split = set()
+    for tab_name, tab_status in split_workbook(workbook_file, tab_names, out_dir, status):
+        split.add(tab_name)
+        TAB_STATUS[tab_name] = tab_status
+        yield tab_name, csv_rows(out_dir / f"{tab_name}.csv")
+    for tab_name in tab_names:
+        if tab_name not in split:
+            print(f"WARNING: no sheet named {tab_name} in the workbook, "
+                  f"fetching it separately", file=sys.stderr)
+            yield tab_name, fetch_tab(tab_name)
+
+
+def split_workbook(workbook_file, tab_names, out_dir, status):
+    """Write each requested sheet to out_dir/<tab>.csv, yielding (tab_name, status).
+
+    A tab whose CSV comes out identical to the existing one is "unchanged";
+    otherwise it gets `status` ("updated" or "bundled"). Tabs with no sheet
+    in the workbook are skipped.
+    """
+    from workbook import Workbook
+
+    with Workbook(workbook_file) as wb:
+        for tab_name in tab_names:
+            cache_file = out_dir / f"{tab_name}.csv"
+            if tab_name not in wb.sheets:
+                continue
+            part_file = cache_file.with_name(cache_file.name + ".part")
+            wb.write_csv(tab_name, part_file)
+            if status == "bundled" or file_hash(part_file) != file_hash(cache_file):
+                os.replace(part_file, cache_file)
+                yield tab_name, status
+            else:
+                part_file.unlink()
+                yield tab_name, "unchanged"
+
+
+# ─── Rows ───
+
+def normalize_row(row):
+    """Strip keys and values, turn missing cells into "" and drop overflow columns."""
+    return {k.strip(): (v or "").strip() for k, v in row.items() if k}
+
+
+class TabRows(list):
+    """The normalized rows of one tab, parsed once. `source` is the file they
+    were read from (None for rows from a snapshot)."""
+
+    def __init__(self, rows=(), source=None):
+        super().__init__(rows)
+        self.source = source
+
+
+def csv_rows(path):
+    """TabRows read from a CSV file."""
+    with open(path, encoding="utf-8", newline="") as f:
+        return TabRows((normalize_row(row) for row in csv.DictReader(f)), source=path)
+
+
+def write_lines(path, lines):
+    """Write an iterable of lines to `path` as they are produced.
+
+    The file is written next to `path` and moved into place when complete.
+    """
+    path = Path(path)
+    part = path.with_name(path.name + ".part")
+    with open(part, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(line + "\n")
+    os.replace(part, path)
+
+
+# ─── Snapshot ───
+
+class Snapshot:
+    """Records of every tab loaded in this run.
+
+    `typed[tab]` holds the tab's typed records (see records.py), built once
+    when the tab is loaded, `status[tab]` the fetch outcome (see TAB_STATUS)
+    and `digests[tab]` a sha256 of the tab's CSV, used as the tab's input hash
+    by the build manifest. run_pipeline fills `changes[tab]` with the tab's
+    row-level diff against the previous run (see sheet_diff).
+
+    On disk a snapshot is JSON lines: a ["snapshot", {...}] header, then for
+    each tab a ["tab", {...}] line followed by one ["row", {...}] line per row.
+    """
+
+    def __init__(self):
+        self.typed = {}
+        self.status = {}
+        self.digests = {}
+        self.changes = {}
+
+    def add(self, tab_name, rows, status, digest):
+        """Add a tab from its rows, building its typed records."""
+        self.typed[tab_name] = build_records(tab_name, rows)
+        self.status[tab_name] = status
+        self.digests[tab_name] = digest
+
+    def save(self, path):
+        """Write the snapshot to `path`."""
+        def lines():
+            yield json.dumps(["snapshot", {"sheet_id": SHEET_ID}])
+            for name, records in self.typed.items():
+                yield json.dumps(["tab", {"name": name, "status": self.status[name],
+                                          "digest": self.digests[name]}])
+                for row in records.rows():
+                    yield json.dumps(["row", row], ensure_ascii=False)
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        write_lines(path, lines())
+        print(f"  Saved snapshot of {len(self.typed)} tabs to {path}")
+
+    @classmethod
+    def load(cls, path):
+        """Read a snapshot written by save()."""
+        tabs = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                kind, value = json.loads(line)
+                if kind == "tab":
+                    tabs.append((value, TabRows()))
+                elif kind == "row":
+                    tabs[-1][1].append(value)
+        snapshot = cls()
+        for tab, rows in tabs:
+            snapshot.add(tab["name"], rows, tab["status"], tab["digest"])
+        return snapshot
+
+
+def load_tabs(tab_names, snapshot, workers=FETCH_WORKERS):
+    """Yield (tab_name, records) for each tab as it becomes available.
+
+    Tabs already in `snapshot` are served from it; the rest are fetched
+    concurrently and added to it, so no tab is fetched twice in one run.
+    """
+    missing = [t for t in tab_names if t not in snapshot.typed]
+    for tab_name in tab_names:
+        if tab_name in snapshot.typed:
+            yield tab_name, snapshot.typed[tab_name]
+    if not missing:
+        return
+    fetch = fetch_workbook if "--xlsx" in sys.argv else fetch_tabs
+    for tab_name, rows in fetch(missing, workers):
+        digest = file_hash(rows.source)
+        snapshot.add(tab_name, rows, TAB_STATUS.get(tab_name, "updated"), digest)
+        yield tab_name, snapshot.typed[tab_name]
+
+
+def snapshot_from_args():
+    """The snapshot named by --from-snapshot, or an empty one to fill by fetching."""
+    path = get_option("--from-snapshot", None)
+    if path:
+        print(f"  Reading snapshot {path}")
+        return Snapshot.load(path)
+    return Snapshot()
+
+
+# ─── Pipeline ───
+
+def run_pipeline(stages, snapshot=None, manifest=None, workers=None):
+    """Run each stage as soon as all of the tabs it reads have arrived.
+
+    `stages` is a list of (name, tab_names, func, outputs, date_dependent);
+    func is called with the typed records (records.py) of each tab, in the
+    order given, and is expected to write `outputs` (a list of paths, or a
+    function listing them, for stages that write a varying set of pages).
+    Each tab's records are built once, when it arrives, and shared by every
+    stage and by the diff, the record store and the baseline. A stage whose
+    inputs (tab digests, the module defining func and every local module it
+    imports, the CONFIG_ENV settings and today's date if date_dependent) and
+    outputs match the build manifest is skipped. Each tab is also diffed
+    against the version the previous run consumed; the change sets go to
+    cache/changes.json and into the record store (record_store.py), and once
+    every stage has run, this run's versions become the new baselines.
+    Returns the snapshot.
+    """
+    if snapshot is None:
+        snapshot = snapshot_from_args()
+    if manifest is None:
+        manifest = BuildManifest(force="--force" in sys.argv)
+    if workers is None:
+        workers = int(get_option("--jobs", FETCH_WORKERS))
+
+    tab_names = list(dict.fromkeys(t for _, tabs, _, _, _ in stages for t in tabs))
+    pending = list(stages)
+    store = RecordStore()
+    for tab_name, records in load_tabs(tab_names, snapshot, workers):
+        rows = list(records.rows())
+        changes = diff_tab(tab_name, rows, snapshot.digests[tab_name])
+        snapshot.changes[tab_name] = changes
+        store.ingest(tab_name, rows, records, snapshot.digests[tab_name], changes)
+        detail = f"; {changes.summary()}" if changes else ""
+        print(f"  Fetched {tab_name}: {len(records)} rows ({snapshot.status[tab_name]}{detail})")
+        ready = [s for s in pending if all(t in snapshot.typed for t in s[1])]
+        for stage in ready:
+            pending.remove(stage)
+            name, tabs, func, outputs, date_dependent = stage
+            script = sys.modules[func.__module__].__file__
+            stage_id = f"{Path(script).stem}:{name}"
+            values = [snapshot.digests[t] for t in tabs] + config_values()
+            if date_dependent:
+                values.append(build_date().isoformat())
+            key = input_hash(module_closure(script), values)
+            listed = outputs() if callable(outputs) else outputs
+            if manifest.is_current(stage_id, key, listed):
+                print(f"  {name} unchanged, skipping")
+                continue
+            print(f"  Generating {name}...")
+            func(*(snapshot.typed[t] for t in tabs))
+            manifest.record(stage_id, key, outputs() if callable(outputs) else outputs)
+
+    store.close()
+    manifest.save()
+    manifest.report()
+
+    save_changes(snapshot.changes)
+    for tab_name, changes in snapshot.changes.items():
+        if changes:
+            write_baseline(tab_name, snapshot.typed[tab_name].rows(), snapshot.digests[tab_name])
+
+    save_path = get_option("--save-snapshot", None)
+    if save_path:
+        snapshot.save(save_path)
+    wait_for_refreshes()
+    http_client.report()
+    return snapshot
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Row-level diffs between consecutive versions of each spreadsheet tab.
+
+Each run of the pipeline compares every tab it loads with the version the
+previous run consumed (kept in cache/previous/<tab>.csv) and records keyed
+insert/update/delete sets in cache/changes.json, so incremental renderers can
+regenerate only what the changed rows touch.
+
+Rows are keyed on title, date and event (whichever of them the tab has);
+tabs with none of these columns are keyed on the whole row, so an edit shows
+up as a delete plus an insert. Repeated keys are numbered in order ("#2").
+
+Usage:
+  python3 scripts/sheet_diff.py OLD.csv NEW.csv   # print the diff of two tab CSVs
+"""
+
+import csv
+import json
+import os
+import re
+import sys
+
+from paths import PROJECT_DIR
+
+BASELINE_DIR = PROJECT_DIR / "cache" / "previous"
+CHANGES_PATH = PROJECT_DIR / "cache" / "changes.json"
+
+# Columns that identify a row across edits
+KEY_FIELDS = ("title", "date", "event")
+
+
+def key_part(value):
+    return re.sub(r"\s+", " ", value).strip().lower()
+
+
+def row_key(row):
+    """Stable identity of a row: its title, date and event, normalized."""
+    fields = [f for f in KEY_FIELDS if f in row] or sorted(row)
+    return " | ".join(key_part(row.get(f, "")) for f in fields)
+
+
+def keyed(rows):
+    """Yield (key, row), numbering repeated keys so each is unique."""
+    seen = {}
+    for row in rows:
+        key = row_key(row)
+        seen[key] = seen.get(key, 0) + 1
+        yield (key if seen[key] == 1 else f"{key} #{seen[key]}"), row
+
+
+class TabDiff:
+    """Keyed changes between two versions of a tab.
+
+    `inserted` and `deleted` map keys to rows, `updated` maps keys to
+    (old_row, new_row).
+    """
+
+    def __init__(self):
+        self.inserted = {}
+        self.updated = {}
+        self.deleted = {}
+
+    def __bool__(self):
+        return bool(self.inserted or self.updated or self.deleted)
+
+    def summary(self):
+        return f"+{len(self.inserted)} ~{len(self.updated)} -{len(self.deleted)}"
+
+    def to_json(self):
+        return {
+            "inserted": self.inserted,
+            "updated": {k: {"old": old, "new": new} for k, (old, new) in self.updated.items()},
+            "deleted": self.deleted,
+        }
+
+
+def diff_rows(old_rows, new_rows):
+    """Diff two iterables of row dicts. Only the old side is held in memory."""
+    old = dict(keyed(old_rows))
+    diff = TabDiff()
+    for key, row in keyed(new_rows):
+        previous = old.pop(key, None)
+        if previous is None:
+            diff.inserted[key] = row
+        elif previous != row:
+            diff.updated[key] = (previous, row)
+    diff.deleted = old
+    return diff
+
+
+# ─── Baselines ───
+
+def read_csv_rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            yield {k.strip(): (v or "").strip() for k, v in row.items() if k}
+
+
+def baseline_digest(tab_name):
+    """Digest of the tab version the previous run consumed, or None."""
+    index = BASELINE_DIR / "index.json"
+    if not index.exists():
+        return None
+    try:
+        return json.loads(index.read_text(encoding="utf-8")).get(tab_name)
+    except ValueError:
+        return None
+
+
+def diff_tab(tab_name, records, digest):
+    """Changes in `records` since the previous run (everything is new on the first)."""
+    if digest == baseline_digest(tab_name):
+        return TabDiff()
+    baseline = BASELINE_DIR / f"{tab_name}.csv"
+    old_rows = read_csv_rows(baseline) if baseline.exists() else ()
+    return diff_rows(old_rows, records)
+
+
+def write_baseline(tab_name, records, digest):
+    """Make `records` the version the next run diffs against."""
+    BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+    path = BASELINE_DIR / f"{tab_name}.csv"
+    part = path.with_name(path.name + ".part")
+    with open(part, "w", encoding="utf-8", newline="") as f:
+        writer = None
+        for row in records:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+    os.replace(part, path)
+
+    index = BASELINE_DIR / "index.json"
+    digests = json.loads(index.read_text(encoding="utf-8")) if index.exists() else {}
+    digests[tab_name] = digest
+    index.write_text(json.dumps(digests, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def save_changes(diffs):
+    """Record this run's change sets in cache/changes.json, replacing those of the
+    same tabs from earlier runs and keeping the rest."""
+    changes = {}
+    if CHANGES_PATH.exists():
+        try:
+            changes = json.loads(CHANGES_PATH.read_text(encoding="utf-8"))
+        except ValueError:
+            pass
+    for tab_name, diff in diffs.items():
+        changes[tab_name] = diff.to_json()
+    CHANGES_PATH.parent.mkdir(exist_ok=True)
+    CHANGES_PATH.write_text(json.dumps(changes, indent=2, ensure_ascii=False) + "\n",
+                            encoding="utf-8")
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(2)
+    diff = diff_rows(read_csv_rows(sys.argv[1]), read_csv_rows(sys.argv[2]))
+    for key in diff.inserted:
+        print(f"+ {key}")
+    for key, (old, new) in diff.updated.items():
+        fields = [f for f in new if old.get(f) != new[f]]
+        print(f"~ {key} ({', '.join(fields)})")
+    for key in diff.deleted:
+        print(f"- {key}")
+    print(diff.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -7,22 +7,30 @@ Data sources:
   - Curriculum_Vitae spreadsheet (published CSVs): conferences + talks
   - arXiv API: publication metadata + abstracts
   - Hardcoded enrichment data from CV (journal info, descriptions)
+
+Pass --bundle PATH to read the CSVs and arXiv feed from an offline bundle
+(see offline_bundle.py) instead of the network.
 """
 
 import csv
 import io
-import json
 import os
 import re
 import sys
 import time
 import xml.etree.ElementTree as ET
-from pathlib import Path
-from urllib.request import urlopen, Request
-from urllib.error import URLError
 
-CONTENT_DIR = Path("content")
-DATA_DIR = Path("data")
+from abstract_store import store_abstract
+from cv_data import write_collection
+import http_client
+from offline_bundle import bundle_from_args
+from paths import PROJECT_DIR
+from records import build_records
+from sheet_data import normalize_row
+from sync_spreadsheet import write_section_pages
+
+CONTENT_DIR = PROJECT_DIR / "content"
+DATA_DIR = PROJECT_DIR / "data"
 
 # Published CSV URLs from the Curriculum_Vitae spreadsheet
 SHEET_BASE = "https://docs.google.com/spreadsheets/d/e/2PACX-1vRchAxHUEFwDxDinsba7BZqejlUPdOdiD1jjQv6NAXtEufiZU1_UfPlAAzks4tw3AHUf5h105w-AN-c/pub"
@@ -145,24 +153,35 @@ def slugify(text: str) -> str:
 
 
 def download_csv(url: str) -> list[dict]:
+    bundle = bundle_from_args()
+    if bundle:
+        return list(csv.DictReader(io.StringIO(bundle.read_url(url).decode("utf-8"))))
     try:
-        with urlopen(url, timeout=30) as resp:
-            text = resp.read().decode("utf-8")
-        return list(csv.DictReader(io.StringIO(text)))
-    except URLError as e:
+        resp = http_client.get(url, timeout=30)
+        resp.raise_for_status()
+        return list(csv.DictReader(io.StringIO(resp.content.decode("utf-8"))))
+    except (OSError, http_client.HTTPError) as e:
         print(f"  Warning: Could not download CSV: {e}", file=sys.stderr)
         return []
 
 
+def arxiv_query_url(arxiv_ids: list[str]) -> str:
+    id_list = ",".join(arxiv_ids)
+    return f"http://export.arxiv.org/api/query?id_list={id_list}&max_results={len(arxiv_ids)}"
+
+
 def fetch_arxiv_papers(arxiv_ids: list[str]) -> list[dict]:
     """Fetch paper metadata from arXiv API."""
     papers = []
-    id_list = ",".join(arxiv_ids)
-    url = f"http://export.arxiv.org/api/query?id_list={id_list}&max_results={len(arxiv_ids)}"
+    url = arxiv_query_url(arxiv_ids)
+    bundle = bundle_from_args()
     try:
-        req = Request(url, headers={"User-Agent": "academic-site-builder/1.0"})
-        with urlopen(req, timeout=30) as resp:
-            xml_text = resp.read().decode("utf-8")
+        if bundle:
+            xml_text = bundle.read_url(url).decode("utf-8")
+        else:
+            resp = http_client.get(url, timeout=30)
+            resp.raise_for_status()
+            xml_text = resp.content.decode("utf-8")
         root = ET.fromstring(xml_text)
         ns = {"atom": "http://www.w3.org/2005/Atom"}
         for entry in root.findall("atom:entry", ns):
@@ -294,43 +313,10 @@ params:
 
 
 def generate_travel(conferences: list[dict]):
-    travel_dir = CONTENT_DIR / "travel"
-    travel_dir.mkdir(parents=True, exist_ok=True)
-    for f in travel_dir.glob("*.md"):
-        if f.name != "_index.md":
-            f.unlink()
-
-    sorted_conf = sorted(conferences, key=lambda r: r.get("date", ""), reverse=True)
-    current = [c for c in sorted_conf if c.get("tags", "").strip() == "Current"]
-    past = [c for c in sorted_conf if c.get("tags", "").strip() == "Past"]
-
-    lines = ['---', 'title: "Travel"', '---', '',
-             "Travel plans for upcoming events. If I'm travelling near you and want to meet, contact me!\n"]
-
-    if current:
-        lines.append("## Upcoming\n")
-        lines.append("| Event | Location | Dates |")
-        lines.append("|-------|----------|-------|")
-        for c in current:
-            t = c.get("title", ""); u = c.get("url", ""); loc = c.get("location", "")
-            d1 = c.get("date", ""); d2 = c.get("date_end", "")
-            link = f"[{t}]({u})" if u and u != "#" else t
-            lines.append(f"| {link} | {loc} | {d1} — {d2} |")
-        lines.append("")
-
-    if past:
-        lines.append("## Past\n")
-        lines.append("| Event | Location | Dates |")
-        lines.append("|-------|----------|-------|")
-        for c in past[:30]:
-            t = c.get("title", ""); u = c.get("url", ""); loc = c.get("location", "")
-            d1 = c.get("date", ""); d2 = c.get("date_end", "")
-            link = f"[{t}]({u})" if u and u != "#" else t
-            lines.append(f"| {link} | {loc} | {d1} — {d2} |")
-        lines.append("")
-
-    (travel_dir / "_index.md").write_text("\n".join(lines))
-    print(f"  Generated travel page ({len(current)} upcoming, {len(past)} past)")
+    """Travel index and per-year archive, written by sync_spreadsheet.py's
+    section writer so both syncs produce the same content/travel/ pages."""
+    trips = build_records("travel", (normalize_row(r) for r in conferences))
+    write_section_pages("travel", trips)
 
 
 def main():
@@ -358,16 +344,16 @@ def main():
     generate_talks(talks)
     generate_travel(conferences)
 
-    # Save combined data for CV builder
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    cv_data = {
-        "publications": publications,
-        "conferences": [{k: v for k, v in r.items() if k and v} for r in conferences],
-        "talks": [{k: v for k, v in r.items() if k and v} for r in talks],
-    }
-    (DATA_DIR / "cv.json").write_text(json.dumps(cv_data, indent=2, ensure_ascii=False))
-    print("  Generated data/cv.json")
+    # Save per-collection data for CV builder
+    cv_dir, abstracts_path = DATA_DIR / "cv", DATA_DIR / "abstracts.json"
+    write_collection("publications", (store_abstract(p) for p in publications),
+                     cv_dir, abstracts_path)
+    write_collection("conferences", ({k: v for k, v in r.items() if k and v} for r in conferences),
+                     cv_dir, abstracts_path)
+    write_collection("talks", (store_abstract({k: v for k, v in r.items() if k and v}) for r in talks),
+                     cv_dir, abstracts_path)
 
+    http_client.report()
     print("\nDone!")
 
 
@@ -3,88 +3,40 @@
 Sync Google Sheets spreadsheet data into the Hugo site.
 
 Updates:
-  - data/cv.json (publications, conferences/travel, talks)
+  - data/cv/ (publications, conferences/travel, talks; see cv_data.py)
   - content/_index.md (upcoming talks & travel sections)
-  - content/talks/_index.md (full talks list page)
-  - content/travel/_index.md (full travel list page)
-
-Usage: python3 scripts/sync_spreadsheet.py [--cached]
+  - content/talks/ (upcoming talks, and a page per year of past talks)
+  - content/travel/ (upcoming travel, and a page per year of past trips)
+  - content/series/ (a page per talk series; see talk_series.py)
+  - content/coauthors/ (a page per co-author; see coauthors.py)
+  - content/publications/ ("Talks on this paper" sections; see related.py)
+  - static/upcoming.json (date-sorted upcoming talks and trips, read by
+    department.py)
+
+Usage: python3 scripts/sync_spreadsheet.py [--cv] [options]
+  --cv: also generate the LaTeX CV sections (generate_cv.py) from the same data
+
+See scripts/sheet_data.py for the shared options (--cached, --jobs, --max-age,
+--force, --from-snapshot, --save-snapshot).
 """
 
-import csv
-import io
+import hashlib
 import json
-import os
 import re
 import sys
-from datetime import datetime, date
-from pathlib import Path
-
-SCRIPT_DIR = Path(__file__).parent
-PROJECT_DIR = SCRIPT_DIR.parent
-CACHE_DIR = PROJECT_DIR / "cache"
-
-SHEET_ID = "1X7VKV3pwBoYjQoUHpxckYJAgaErCYkevc47bJoMV0J0"
-
-TABS = {
-    "publications": "948751242",
-    "talks": "508483272",
-    "travel": "1947229337",
-    "teaching": "733600881",
-    "grants_awards": "534833029",
-    "education": "741365414",
-    "positions": "1595934787",
-    "service": "756633452",
-}
+
+from abstract_store import ABSTRACTS
+from cv_data import CV_DIR, write_collection, write_if_changed
+from paths import PROJECT_DIR
+from related import links
+from sheet_data import build_date, run_pipeline, write_lines
+from temporal_index import IntervalIndex, TemporalIndex
+from templates import Templates, html_escape, md_escape, yaml_escape
 
 MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
           "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
 
 
-def fetch_tab(tab_name):
-    """Fetch a tab from Google Sheets via public CSV export."""
-    import urllib.request
-
-    cache_file = CACHE_DIR / f"{tab_name}.csv"
-
-    if "--cached" in sys.argv and cache_file.exists():
-        with open(cache_file) as f:
-            return list(csv.DictReader(f))
-
-    gid = TABS[tab_name]
-    url = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/gviz/tq?tqx=out:csv&gid={gid}"
-
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            text = resp.read().decode("utf-8")
-    except Exception as e:
-        print(f"ERROR fetching {tab_name}: {e}", file=sys.stderr)
-        if cache_file.exists():
-            print(f"  Falling back to cache", file=sys.stderr)
-            with open(cache_file) as f:
-                return list(csv.DictReader(f))
-        sys.exit(1)
-
-    records = list(csv.DictReader(io.StringIO(text)))
-
-    CACHE_DIR.mkdir(exist_ok=True)
-    with open(cache_file, "w", newline="") as f:
-        f.write(text)
-
-    return records
-
-
-def parse_date(s):
-    """Parse YYYY-MM-DD (possibly with time suffix) into a date object, or None."""
-    if not s:
-        return None
-    m = re.match(r"(\d{4})-(\d{2})-(\d{2})", s)
-    if m:
-        return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
-    return None
-
-
 def format_month_day(d):
     """Format date as 'Mon DD', e.g. 'Feb 19'."""
     return f"{MONTHS[d.month - 1]} {d.day:02d}"
@@ -120,81 +72,184 @@ def extract_arxiv_from_url(url):
     return ""
 
 
-# ─── cv.json generation ───
-
-def build_cv_json(publications, talks, travel):
-    """Build cv.json structure matching existing format."""
-    pubs = []
-    for r in publications:
-        url = r.get("url", "").strip()
-        # Get arxiv ID from column (strip "arXiv:" prefix) or fall back to URL
-        raw_arxiv = r.get("arxiv", "").strip()
-        if raw_arxiv.lower().startswith("arxiv:"):
-            arxiv_id = raw_arxiv.split(":", 1)[1].strip()
-        else:
-            arxiv_id = extract_arxiv_from_url(url) or raw_arxiv
-        authors = r.get("authors", "").replace(";", ",").strip()
-        # Clean up author formatting
-        authors = re.sub(r'\s*,\s*', ', ', authors)
-
-        pub = {
-            "id": arxiv_id or "",
-            "title": r.get("title", "").strip(),
-            "authors": authors,
-            "journal": r.get("type", "Preprint").strip() or "Preprint",
-            "date": r.get("date", "").strip(),
-            "abstract": r.get("abstract", "").strip(),
-            "description": "",
-            "arxiv_url": f"https://arxiv.org/abs/{arxiv_id}" if arxiv_id else url,
-            "pdf_url": f"https://arxiv.org/pdf/{arxiv_id}" if arxiv_id else "",
-        }
-        pubs.append(pub)
-
-    today = date.today()
-
-    confs = []
-    for r in travel:
-        d = parse_date(r.get("date", ""))
-        tags = "Current" if d and d >= today else "Past"
-        conf = {
-            "id": "",
-            "title": r.get("title", "").strip(),
-            "url": r.get("url", "").strip(),
-            "location": r.get("location", "").strip(),
-            "short_location": r.get("short_location", "").strip(),
-            "tags": tags,
-            "date": r.get("date", "").strip(),
-            "date_end": r.get("date_end", "").strip(),
-        }
-        confs.append(conf)
-
-    talk_list = []
-    for r in talks:
-        d = parse_date(r.get("date", ""))
-        tags = "Current" if d and d >= today else "Past"
-        title = r.get("title", "").strip()
-        talk = {
-            "id": "",
-            "title": title or "TBD",
-            "type": r.get("type", "").strip() or "Seminar",
-            "event": r.get("event", "").strip(),
-            "short_location": r.get("short_location", "").strip(),
-            "url": r.get("url", "").strip(),
-            "abstract": r.get("abstract", "").strip(),
-            "tags": tags,
-            "date": r.get("date", "").strip(),
-            "date_end": "",
-            "time_zone": "",
-        }
-        talk_list.append(talk)
+# ─── CV data (data/cv/) ───
+#
+# Entries are a pure function of their row, in sheet order: nothing here looks
+# at today's date. Upcoming/past is decided when pages are rendered.
 
+def cv_publication(p):
+    """data/cv/publications.json entry for one Publication."""
+    # Get arxiv ID from column (strip "arXiv:" prefix) or fall back to URL
+    if p.arxiv.lower().startswith("arxiv:"):
+        arxiv_id = p.arxiv.split(":", 1)[1].strip()
+    else:
+        arxiv_id = extract_arxiv_from_url(p.url) or p.arxiv
     return {
-        "publications": pubs,
-        "conferences": confs,
-        "talks": talk_list,
+        "id": arxiv_id or "",
+        "title": p.title,
+        "authors": ", ".join(p.author_list),
+        "author_list": list(p.author_list),
+        "journal": p.type or "Preprint",
+        "date": p.date,
+        "abstract_id": p.abstract_id,
+        "description": "",
+        "arxiv_url": f"https://arxiv.org/abs/{arxiv_id}" if arxiv_id else p.url,
+        "pdf_url": f"https://arxiv.org/pdf/{arxiv_id}" if arxiv_id else "",
     }
 
 
+def cv_conference(t):
+    """data/cv/conferences.json entry for one Travel."""
+    return {
+        "id": "",
+        "title": t.title,
+        "url": t.url,
+        "location": t.location,
+        "short_location": t.short_location,
+        "date": t.date,
+        "date_end": t.date_end,
+    }
+
+
+def cv_talk(t):
+    """data/cv/talks.json entry for one Talk."""
+    return {
+        "id": "",
+        "title": t.title or "TBD",
+        "type": t.type or "Seminar",
+        "event": t.event,
+        "short_location": t.short_location,
+        "url": t.url,
+        "abstract_id": t.abstract_id,
+        "date": t.date,
+        "date_end": "",
+        "time_zone": "",
+    }
+
+
+def cv_series(s, papers=()):
+    """data/cv/series.json entry for one TalkSeries (`papers`: its related publications)."""
+    return {
+        "id": s.slug,
+        "title": s.title,
+        "block": s.block,
+        "count": len(s.talks),
+        "first": s.first.isoformat() if s.first else "",
+        "last": s.last.isoformat() if s.last else "",
+        "venues": s.venues,
+        "abstract_id": s.abstract_id,
+        "deliveries": [
+            {"date": t.date, "event": t.event, "short_location": t.short_location, "url": t.url}
+            for t in s.deliveries
+        ],
+        "papers": [p.title for p in papers],
+    }
+
+
+def cv_coauthor(c):
+    """data/cv/coauthors.json entry for one Coauthor."""
+    return {
+        "id": c.slug,
+        "name": c.name,
+        "count": c.count,
+        "publications": [p.title for p in c.publications],
+    }
+
+
+# ─── Page templates ───
+#
+# The repeated pieces of the generated pages (see templates.py).
+# Views are built from records by the *_view / *_row functions below.
+
+HTML = Templates({
+    "link": '{{?url}}<a href="{{url}}" target="_blank">{{title}}</a>{{:}}{{title}}{{/url}}',
+    "section_head": '<div class="upcoming-past-section">\n{{?heading}}  <h2>{{heading}}</h2>\n\n{{/heading}}',
+    "talk_section": '{{>section_head}}{{#items}}{{>talk_item}}\n\n{{/items}}</div>',
+    "talk_item": (
+        '<div class="talk-item">\n'
+        '  <h3>{{>link}}</h3>\n'
+        '  <div class="talk-meta">\n'
+        '    <span class="talk-type">{{type}}</span>\n'
+        '    <span class="talk-event">{{event}}</span>\n'
+        '    <span class="talk-date">{{day|date_full}}</span>\n'
+        '  </div>\n'
+        '</div>'
+    ),
+    "travel_section": '{{>section_head}}{{#items}}{{>travel_item}}\n\n{{/items}}</div>',
+    "travel_item": (
+        '<div class="travel-item">\n'
+        '  <h3>{{>link}}</h3>\n'
+        '  <div class="travel-meta">\n'
+        '    <span class="travel-location">{{location}}</span>\n'
+        '    <span class="travel-date">{{dates}}</span>\n'
+        '  </div>\n'
+        '</div>'
+    ),
+    "archive": (
+        '<div class="upcoming-past-section">\n'
+        '  <h2>Past</h2>\n'
+        '\n'
+        '<ul class="archive-years">\n'
+        '{{#years}}  <li><a href="{{< ref \\"/{{section|raw}}/{{year}}\\" >}}">{{year}}</a> · {{count}}</li>\n{{/years}}'
+        '</ul>\n'
+        '</div>'
+    ),
+    "upcoming": (
+        '<!-- BEGIN UPCOMING_TALKS -->\n'
+        '<div class="section-header"><h2>Upcoming Talks & Travel</h2><span class="see-all-links">'
+        '<a class="see-all-btn" href="{{< ref \\"/talks\\" >}}">All talks →</a> '
+        '<a class="see-all-btn" href="{{< ref \\"/travel\\" >}}">All travel →</a></span></div>\n'
+        '\n'
+        '<div class="upcoming-compact">\n'
+        '{{#rows}}{{>upcoming_row}}\n{{/rows}}'
+        '</div>\n'
+        '<!-- END UPCOMING_TALKS -->'
+    ),
+    "upcoming_row": (
+        '  <div class="upcoming-row{{?talk}} upcoming-talk{{/talk}}">\n'
+        '    <span class="upcoming-row-title">{{?talk}}Talk: {{/talk}}{{>link}}</span>\n'
+        '    <span class="upcoming-row-meta">{{meta}}</span>\n'
+        '  </div>'
+    ),
+}, escape=html_escape, filters={"date_full": format_date_full})
+
+# Markdown list items of the series, co-author and publication pages
+MD = Templates({
+    "link": '{{?url}}[{{title}}]({{url|raw}}){{:}}{{title}}{{/url}}',
+    "publication": '{{>link}}{{year}}',
+    "delivery": '- {{?date}}{{date}} — {{/date}}{{?url}}[{{event}}]({{url|raw}}){{:}}{{event}}{{/url}}',
+    "coauthor_item": '- [{{name}}]({{< ref "/coauthors/{{slug|raw}}" >}}) · {{papers}}',
+    "series_item": '- [{{title}}]({{< ref "/series/{{slug|raw}}" >}}){{times}}',
+}, escape=md_escape)
+
+
+def talk_view(r):
+    return {"title": r.title or "TBD", "url": r.url, "type": r.type or "Seminar",
+            "event": r.event, "day": r.day}
+
+
+def trip_view(r):
+    dates = format_date_range_full(r.day, r.end_day) if r.end_day else format_date_full(r.day)
+    return {"title": r.title, "url": r.url, "location": r.location, "dates": dates}
+
+
+def trip_row(r):
+    """Homepage row for a trip."""
+    date_str = format_date_range(r.day, r.end_day) if r.end_day else format_month_day(r.day)
+    location = r.short_location or r.location
+    return {"talk": False, "title": r.title, "url": r.url,
+            "meta": f"{location} · {date_str}" if location else date_str}
+
+
+def talk_row(r, day):
+    """Homepage row for a talk; TBD talks are not linked."""
+    title = r.title or "TBD"
+    place = r.short_location or r.event
+    date_str = format_month_day(day)
+    return {"talk": True, "title": title, "url": r.url if title.upper() != "TBD" else "",
+            "meta": f"{place} · {date_str}" if place else date_str}
+
+
 # ─── Homepage upcoming sections ───
 
 def gen_upcoming_combined_html(talks, travel):
@@ -203,92 +258,32 @@ def gen_upcoming_combined_html(talks, travel):
     Travel sorted by end date. Talks appear after travel on the same start date,
     prefixed with 'Talk:' to look like sub-items of travel.
     """
-    today = date.today()
+    today = build_date()
 
     # Collect travel items with end_date for sorting
-    travel_items = []
-    for r in travel:
-        d = parse_date(r.get("date", ""))
-        if d and d >= today:
-            d_end = parse_date(r.get("date_end", "")) or d
-            travel_items.append((d_end, d, "travel", r))
+    travel_items = [(t.end_day or t.day, t.day, "travel", t)
+                    for t in travel.timeline.upcoming(today)]
 
     # Collect talk items (sort key = start date, after travel)
-    talk_items = []
-    for r in talks:
-        d = parse_date(r.get("date", ""))
-        if d and d >= today:
-            talk_items.append((d, d, "talk", r))
+    talk_items = [(t.day, t.day, "talk", t) for t in talks.timeline.upcoming(today)]
 
     # For each talk, find if it falls within a travel date range; if so, sort it
     # right after that travel (using travel's end_date + 0.5 day offset).
     # Otherwise sort by its own date.
+    trips = IntervalIndex(t for _, _, _, t in travel_items)
     for i, (d, d_start, typ, r) in enumerate(talk_items):
-        best_end = None
-        for t_end, t_start, _, tr in travel_items:
-            if t_start <= d <= t_end:
-                if best_end is None or t_end < best_end:
-                    best_end = t_end
-        if best_end:
-            # Sort just after the matching travel's end date
-            talk_items[i] = (best_end, d, "talk", r)
+        trip = trips.enclosing(d)
+        if trip:
+            # Sort just after the tightest matching travel's end date
+            talk_items[i] = (trip[1], d, "talk", r)
     
     # Sort: by first key (end_date), then type (travel=0 before talk=1)
     combined = travel_items + talk_items
     combined.sort(key=lambda x: (x[0], 0 if x[2] == "travel" else 1))
 
-    lines = []
-    lines.append('<!-- BEGIN UPCOMING_TALKS -->')
-    lines.append('<div class="section-header"><h2>Upcoming Talks & Travel</h2><span class="see-all-links"><a class="see-all-btn" href="{{< ref \\"/talks\\" >}}">All talks →</a> <a class="see-all-btn" href="{{< ref \\"/travel\\" >}}">All travel →</a></span></div>')
-    lines.append('')
-    lines.append('<div class="upcoming-compact">')
-
-    for sort_key, start_date, item_type, r in combined:
-        if item_type == "travel":
-            title = r.get("title", "").strip()
-            url = r.get("url", "").strip()
-            location = r.get("short_location", "").strip() or r.get("location", "").strip()
-            d_end = parse_date(r.get("date_end", ""))
-
-            if url:
-                title_html = f'<a href="{url}" target="_blank">{title}</a>'
-            else:
-                title_html = title
-
-            if d_end:
-                date_str = format_date_range(start_date, d_end)
-            else:
-                date_str = format_month_day(start_date)
-
-            meta = f"{location} · {date_str}" if location else date_str
-
-            lines.append('  <div class="upcoming-row">')
-            lines.append(f'    <span class="upcoming-row-title">{title_html}</span>')
-            lines.append(f'    <span class="upcoming-row-meta">{meta}</span>')
-            lines.append('  </div>')
-        else:
-            title = r.get("title", "").strip() or "TBD"
-            url = r.get("url", "").strip()
-            short_loc = r.get("short_location", "").strip() or r.get("event", "").strip()
-            date_str = format_month_day(start_date)
-
-            if title and title.upper() != "TBD" and url:
-                title_html = f'Talk: <a href="{url}" target="_blank">{title}</a>'
-            elif title.upper() == "TBD":
-                title_html = "Talk: TBD"
-            else:
-                title_html = f"Talk: {title}"
-
-            meta = f"{short_loc} · {date_str}" if short_loc else date_str
-
-            lines.append('  <div class="upcoming-row upcoming-talk">')
-            lines.append(f'    <span class="upcoming-row-title">{title_html}</span>')
-            lines.append(f'    <span class="upcoming-row-meta">{meta}</span>')
-            lines.append('  </div>')
-
-    lines.append('</div>')
-    lines.append('<!-- END UPCOMING_TALKS -->')
-    return "\n".join(lines)
+    rows = [trip_row(r) if item_type == "travel" else talk_row(r, start_date)
+            for _, start_date, item_type, r in combined]
+    return HTML.render("upcoming", {"rows": rows})
 
 
 def update_index_md(talks, travel):
@@ -313,204 +308,346 @@ def update_index_md(talks, travel):
     print(f"  Updated {index_path}")
 
 
-# ─── Full talks page ───
+# ─── Upcoming feed ───
+
+FEED_PATH = PROJECT_DIR / "static" / "upcoming.json"
+
+
+def upcoming_feed(talks, travel):
+    """{"talks": [...], "travel": [...]}: talks from today on by date, and trips
+    not yet over by start date. Only the upcoming rows are read."""
+    today = build_date()
+    trips = TemporalIndex(travel, key=lambda t: t.end_day or t.day).upcoming(today)
+    return {
+        "talks": [
+            {"date": t.day.isoformat(), "title": t.title or "TBD", "event": t.event,
+             "location": t.short_location, "url": t.url}
+            for t in talks.timeline.upcoming(today)
+        ],
+        "travel": [
+            {"start": t.day.isoformat(), "end": (t.end_day or t.day).isoformat(),
+             "title": t.title, "location": t.short_location or t.location, "url": t.url}
+            for t in sorted(trips, key=lambda t: t.day)
+        ],
+    }
+
+
+def write_upcoming_feed(talks, travel):
+    """Write static/upcoming.json, this site's stream for department.py."""
+    text = json.dumps(upcoming_feed(talks, travel), indent=2, ensure_ascii=False) + "\n"
+    if write_if_changed(FEED_PATH, text):
+        print(f"  Updated {FEED_PATH}")
+    else:
+        print(f"  {FEED_PATH.name} unchanged")
+
+
+# ─── Talks and travel pages ───
+#
+# content/<section>/_index.md lists what is coming up and links to the
+# archive: a page per year of past items, content/<section>/<year>.md. A year
+# page records a digest of its items and is only rewritten when they change,
+# so a new talk touches the index and the current year, not the whole history.
+
+# Section → (title, section template, view, noun)
+ARCHIVE_SECTIONS = {
+    "talks": ("Talks", "talk_section", talk_view, "talk"),
+    "travel": ("Travel", "travel_section", trip_view, "trip"),
+}
+
 
 def gen_talks_page(talks):
-    """Generate the full content/talks/_index.md page."""
-    today = date.today()
-    upcoming = []
-    past = []
-
-    for r in talks:
-        d = parse_date(r.get("date", ""))
-        if d and d >= today:
-            upcoming.append((d, r))
-        elif d:
-            past.append((d, r))
-
-    upcoming.sort(key=lambda x: x[0])
-    past.sort(key=lambda x: x[0], reverse=True)
-
-    lines = ['---', 'title: "Talks"', 'date: 2024-01-01', '---', '', '# Talks', '']
-    lines.append('<div class="upcoming-past-section">')
-    lines.append('  <h2>Upcoming</h2>')
-    lines.append('')
-
-    for d, r in upcoming:
-        title = r.get("title", "").strip() or "TBD"
-        url = r.get("url", "").strip()
-        talk_type = r.get("type", "").strip() or "Seminar"
-        event = r.get("event", "").strip()
-        date_str = format_date_full(d)
-
-        if url and title.upper() != "TBD":
-            title_html = f'<a href="{url}" target="_blank">{title}</a>'
-        elif url:
-            title_html = f'<a href="{url}" target="_blank">{title}</a>'
-        else:
-            title_html = title
-
-        lines.append('<div class="talk-item">')
-        lines.append(f'  <h3>{title_html}</h3>')
-        lines.append('  <div class="talk-meta">')
-        lines.append(f'    <span class="talk-type">{talk_type}</span>')
-        lines.append(f'    <span class="talk-event">{event}</span>')
-        lines.append(f'    <span class="talk-date">{date_str}</span>')
-        lines.append('  </div>')
-        lines.append('</div>')
-        lines.append('')
-
-    lines.append('</div>')
-    lines.append('')
-    lines.append('<div class="upcoming-past-section">')
-    lines.append('  <h2>Past</h2>')
-    lines.append('')
-
-    for d, r in past:
-        title = r.get("title", "").strip() or "TBD"
-        url = r.get("url", "").strip()
-        talk_type = r.get("type", "").strip() or "Seminar"
-        event = r.get("event", "").strip()
-        date_str = format_date_full(d)
-
-        if url:
-            title_html = f'<a href="{url}" target="_blank">{title}</a>'
-        else:
-            title_html = title
-
-        lines.append('<div class="talk-item">')
-        lines.append(f'  <h3>{title_html}</h3>')
-        lines.append('  <div class="talk-meta">')
-        lines.append(f'    <span class="talk-type">{talk_type}</span>')
-        lines.append(f'    <span class="talk-event">{event}</span>')
-        lines.append(f'    <span class="talk-date">{date_str}</span>')
-        lines.append('  </div>')
-        lines.append('</div>')
-        lines.append('')
-
-    lines.append('</div>')
-
-    path = PROJECT_DIR / "content" / "talks" / "_index.md"
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-    print(f"  Updated {path}")
-
-
-# ─── Full travel page ───
+    """Generate content/talks/_index.md and the per-year talk archive."""
+    write_section_pages("talks", talks)
+
 
 def gen_travel_page(travel):
-    """Generate the full content/travel/_index.md page."""
-    today = date.today()
-    upcoming = []
-    past = []
-
-    for r in travel:
-        d = parse_date(r.get("date", ""))
-        if d and d >= today:
-            upcoming.append((d, r))
-        elif d:
-            past.append((d, r))
-
-    upcoming.sort(key=lambda x: x[0])
-    past.sort(key=lambda x: x[0], reverse=True)
-
-    lines = ['---', 'title: "Travel"', 'date: 2024-01-01', '---', '', '# Travel', '']
-    lines.append('<div class="upcoming-past-section">')
-    lines.append('  <h2>Upcoming</h2>')
-    lines.append('')
-
-    for d, r in upcoming:
-        title = r.get("title", "").strip()
-        url = r.get("url", "").strip()
-        location = r.get("location", "").strip()
-        d_end = parse_date(r.get("date_end", ""))
-        date_str = format_date_range_full(d, d_end) if d_end else format_date_full(d)
-
-        if url:
-            title_html = f'<a href="{url}" target="_blank">{title}</a>'
-        else:
-            title_html = title
-
-        lines.append('<div class="travel-item">')
-        lines.append(f'  <h3>{title_html}</h3>')
-        lines.append('  <div class="travel-meta">')
-        lines.append(f'    <span class="travel-location">{location}</span>')
-        lines.append(f'    <span class="travel-date">{date_str}</span>')
-        lines.append('  </div>')
-        lines.append('</div>')
-        lines.append('')
-
-    lines.append('</div>')
-    lines.append('')
-    lines.append('<div class="upcoming-past-section">')
-    lines.append('  <h2>Past</h2>')
-    lines.append('')
-
-    for d, r in past:
-        title = r.get("title", "").strip()
-        url = r.get("url", "").strip()
-        location = r.get("location", "").strip()
-        d_end = parse_date(r.get("date_end", ""))
-        date_str = format_date_range_full(d, d_end) if d_end else format_date_full(d)
-
-        if url:
-            title_html = f'<a href="{url}" target="_blank">{title}</a>'
-        else:
-            title_html = title
-
-        lines.append('<div class="travel-item">')
-        lines.append(f'  <h3>{title_html}</h3>')
-        lines.append('  <div class="travel-meta">')
-        lines.append(f'    <span class="travel-location">{location}</span>')
-        lines.append(f'    <span class="travel-date">{date_str}</span>')
-        lines.append('  </div>')
-        lines.append('</div>')
-        lines.append('')
-
-    lines.append('</div>')
-
-    path = PROJECT_DIR / "content" / "travel" / "_index.md"
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-    print(f"  Updated {path}")
+    """Generate content/travel/_index.md and the per-year travel archive."""
+    write_section_pages("travel", travel)
+
+
+def archive_pages(section):
+    """The pages write_section_pages writes: the section index and its year pages."""
+    section_dir = PROJECT_DIR / "content" / section
+    return [section_dir / "_index.md"] + sorted(section_dir.glob("[0-9][0-9][0-9][0-9].md"))
+
+
+def write_section_pages(section, records):
+    title, template, view, noun = ARCHIVE_SECTIONS[section]
+    section_dir = PROJECT_DIR / "content" / section
+    today = build_date()
+    years = {}  # newest year first, items newest first
+    for r in records.timeline.past(today):
+        years.setdefault(r.day.year, []).append(view(r))
+    rewritten = sum(write_year_page(section_dir / f"{year}.md", title, template, year, views)
+                    for year, views in years.items())
+    # Years with no past items any more
+    for path in section_dir.glob("[0-9][0-9][0-9][0-9].md"):
+        if int(path.stem) not in years:
+            path.unlink()
+
+    path = section_dir / "_index.md"
+    upcoming = [view(r) for r in records.timeline.upcoming(today)]
+    archive = [{"section": section, "year": year,
+                "count": f"{len(views)} {noun}{'' if len(views) == 1 else 's'}"}
+               for year, views in years.items()]
+    write_lines(path, [
+        '---', f'title: "{title}"', 'date: 2024-01-01', '---', '', f'# {title}', '',
+        HTML.render(template, {"heading": "Upcoming", "items": upcoming}),
+        '',
+        HTML.render("archive", {"years": archive}),
+    ])
+    print(f"  Updated {path} and {rewritten} of {len(years)} year pages")
+
+
+def page_digest(views):
+    """Digest of a year page's items and the templates that render them."""
+    h = hashlib.sha256(json.dumps(views, default=str, sort_keys=True).encode("utf-8"))
+    for name in sorted(HTML.sources):
+        h.update(HTML.sources[name].encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def write_year_page(path, title, template, year, views):
+    """Write one year of the archive unless it is already current; returns whether written."""
+    digest = page_digest(views)
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            head = "".join(line for _, line in zip(range(8), f))
+        if f'digest: "{digest}"' in head:
+            return False
+    write_lines(path, [
+        '---', f'title: "{title} in {year}"', 'params:', f'  year: {year}',
+        f'  digest: "{digest}"', '---', '',
+        HTML.render(template, {"heading": "", "items": views}),
+    ])
+    return True
+
+
+# ─── Talk series pages ───
+
+SERIES_DIR = PROJECT_DIR / "content" / "series"
+
+
+def series_pages():
+    return sorted(SERIES_DIR.glob("*.md"))
+
+
+def gen_series_pages(talks, publications):
+    """Write content/series/<slug>.md for every talk series, plus the section index."""
+    SERIES_DIR.mkdir(parents=True, exist_ok=True)
+    related = links(talks, publications)
+    pages = set()
+    for s in talks.series:
+        if s.title.upper() == "TBD":
+            continue
+        path = SERIES_DIR / f"{s.slug}.md"
+        write_lines(path, series_page_lines(s, related.papers(s)))
+        pages.add(path.name)
+    # Series that no longer exist
+    for path in SERIES_DIR.glob("*.md"):
+        if path.name != "_index.md" and path.name not in pages:
+            path.unlink()
+    write_lines(SERIES_DIR / "_index.md", [
+        '---', 'title: "Talk series"', '---', '',
+        'Each talk with every venue it was given at.',
+    ])
+    print(f"  Updated {len(pages)} series pages in {SERIES_DIR}")
+
+
+def series_page_lines(s, papers=()):
+    """Yield the lines of one content/series/<slug>.md page."""
+    times = "once" if len(s.talks) == 1 else f"{len(s.talks)} times"
+    span = ""
+    if s.first:
+        span = str(s.first.year) if s.first.year == s.last.year else f"{s.first.year}–{s.last.year}"
+
+    yield '---'
+    yield f'title: "{yaml_escape(s.title)}"'
+    if s.last:
+        yield f'date: {s.last.isoformat()}'
+    yield 'params:'
+    yield f'  block: "{yaml_escape(s.block)}"'
+    yield f'  count: {len(s.talks)}'
+    yield f'  event: "Given {times}{f" · {span}" if span else ""}"'
+    yield '---'
+    yield ''
+    if s.block:
+        yield f'**{s.block}**'
+        yield ''
+    yield from MD.render_all("delivery", (
+        {"date": format_date_full(t.day) if t.day else t.date, "event": t.event,
+         "url": t.url if t.event else ""}
+        for t in s.deliveries))
+    if papers:
+        yield ''
+        yield '### Related papers'
+        yield ''
+        for p in papers:
+            yield f'- {publication_link(p)}'
+    abstract = ABSTRACTS.get(s.abstract_id)
+    if abstract:
+        yield ''
+        yield '### Abstract'
+        yield ''
+        yield abstract
+
+
+# ─── Co-author pages ───
+
+COAUTHORS_DIR = PROJECT_DIR / "content" / "coauthors"
+
+
+def coauthor_pages():
+    return sorted(COAUTHORS_DIR.glob("*.md"))
+
+
+def gen_coauthor_pages(publications):
+    """Write content/coauthors/<slug>.md for every co-author, plus the listing page."""
+    COAUTHORS_DIR.mkdir(parents=True, exist_ok=True)
+    coauthors = publications.coauthors.by_count()
+    pages = set()
+    for c in coauthors:
+        path = COAUTHORS_DIR / f"{c.slug}.md"
+        write_lines(path, coauthor_page_lines(c))
+        pages.add(path.name)
+    # Co-authors who are no longer in the sheet
+    for path in COAUTHORS_DIR.glob("*.md"):
+        if path.name != "_index.md" and path.name not in pages:
+            path.unlink()
+    write_lines(COAUTHORS_DIR / "_index.md", coauthors_index_lines(coauthors))
+    print(f"  Updated {len(pages)} co-author pages in {COAUTHORS_DIR}")
+
+
+def publication_link(p):
+    entry = cv_publication(p)
+    url = entry["arxiv_url"]
+    year = f" ({p.date[:4]})" if p.date else ""
+    return MD.render("publication", {"title": p.title, "url": url, "year": year})
+
+
+def coauthors_index_lines(coauthors):
+    """Yield the lines of content/coauthors/_index.md (most joint papers first)."""
+    yield from ['---', 'title: "Co-authors"', '---', '', '# Co-authors', '']
+    for c in coauthors:
+        papers = "1 paper" if c.count == 1 else f"{c.count} papers"
+        yield MD.render("coauthor_item", {"name": c.name, "slug": c.slug, "papers": papers})
+
+
+def coauthor_page_lines(c):
+    """Yield the lines of one content/coauthors/<slug>.md page."""
+    yield '---'
+    yield f'title: "{yaml_escape(c.name)}"'
+    yield 'params:'
+    yield f'  count: {c.count}'
+    yield '---'
+    yield ''
+    yield f'Joint publications with {c.name}:'
+    yield ''
+    for p in c.publications:
+        yield f'- {publication_link(p)}'
+
+
+# ─── Publication pages ───
+
+PUBLICATIONS_DIR = PROJECT_DIR / "content" / "publications"
+
+
+def publication_pages():
+    return sorted(p for p in PUBLICATIONS_DIR.glob("*.md") if p.name != "_index.md")
+
+
+def update_publication_pages(talks, publications):
+    """Refresh the marker-delimited "Talks on this paper" section of each
+    content/publications/ page, matched to its publication by arXiv id."""
+    related = links(talks, publications)
+    by_arxiv = {}
+    for p in publications:
+        arxiv_id = cv_publication(p)["id"]
+        if arxiv_id:
+            by_arxiv[arxiv_id] = p
+    pattern = r'\n*<!-- BEGIN PAPER_TALKS -->.*?<!-- END PAPER_TALKS -->\n?'
+    updated = 0
+    for path in publication_pages():
+        content = path.read_text(encoding="utf-8")
+        m = re.search(r'^arxiv:\s*"?([^"\n]+)"?\s*$', content, re.MULTILINE)
+        p = by_arxiv.get(m.group(1).strip()) if m else None
+        series = related.series_for(p) if p else []
+        new = re.sub(pattern, '\n', content, flags=re.DOTALL)
+        if series:
+            new = new.rstrip("\n") + "\n\n" + "\n".join(paper_talks_lines(series)) + "\n"
+        if new != content:
+            path.write_text(new, encoding="utf-8")
+            updated += 1
+    print(f"  Updated {updated} publication pages in {PUBLICATIONS_DIR}")
+
+
+def paper_talks_lines(series):
+    yield '<!-- BEGIN PAPER_TALKS -->'
+    yield '## Talks on this paper'
+    yield ''
+    for s in series:
+        times = "" if len(s.talks) == 1 else f" · given {len(s.talks)} times"
+        yield MD.render("series_item", {"title": s.title, "slug": s.slug, "times": times})
+    yield '<!-- END PAPER_TALKS -->'
 
 
 # ─── Main ───
 
+def write_publications_data(publications):
+    write_collection("publications", (cv_publication(p) for p in publications))
+
+
+def write_conferences_data(travel):
+    write_collection("conferences", (cv_conference(t) for t in travel))
+
+
+def write_talks_data(talks):
+    write_collection("talks", (cv_talk(t) for t in talks))
+
+
+def write_series_data(talks, publications):
+    related = links(talks, publications)
+    write_collection("series", (cv_series(s, related.papers(s)) for s in talks.series))
+
+
+def write_coauthors_data(publications):
+    write_collection("coauthors", (cv_coauthor(c) for c in publications.coauthors.by_count()))
+
+
 def main():
     print("Syncing spreadsheet data...")
 
-    # Fetch data
-    print("  Fetching publications...")
-    publications = fetch_tab("publications")
-    print(f"    {len(publications)} rows")
-
-    print("  Fetching talks...")
-    talks = fetch_tab("talks")
-    print(f"    {len(talks)} rows")
-
-    print("  Fetching travel...")
-    travel = fetch_tab("travel")
-    print(f"    {len(travel)} rows")
-
-    # Update data/cv.json
-    print("  Building cv.json...")
-    cv = build_cv_json(publications, talks, travel)
-    cv_path = PROJECT_DIR / "data" / "cv.json"
-    cv_path.parent.mkdir(exist_ok=True)
-    with open(cv_path, "w", encoding="utf-8") as f:
-        json.dump(cv, f, indent=2, ensure_ascii=False)
-    print(f"  Updated {cv_path}")
-
-    # Update homepage upcoming sections
-    print("  Updating homepage...")
-    update_index_md(talks, travel)
-
-    # Update full talks page
-    print("  Updating talks page...")
-    gen_talks_page(talks)
-
-    # Update full travel page
-    print("  Updating travel page...")
-    gen_travel_page(travel)
+    content_dir = PROJECT_DIR / "content"
+
+    # Each stage runs as soon as the tabs it needs have been fetched. Every
+    # page here partitions on today's date; the CV data does not depend on the
+    # date, and each collection is its own stage, so a collection is only
+    # rewritten when its tab changes.
+    stages = [
+        ("talks page", ["talks"], gen_talks_page, lambda: archive_pages("talks"), True),
+        ("travel page", ["travel"], gen_travel_page, lambda: archive_pages("travel"), True),
+        ("homepage", ["talks", "travel"], update_index_md, [content_dir / "_index.md"], True),
+        ("upcoming feed", ["talks", "travel"], write_upcoming_feed, [FEED_PATH], True),
+        ("publications data", ["publications"], write_publications_data,
+         [CV_DIR / "publications.json"], False),
+        ("conferences data", ["travel"], write_conferences_data, [CV_DIR / "conferences.json"], False),
+        ("talks data", ["talks"], write_talks_data, [CV_DIR / "talks.json"], False),
+        ("series data", ["talks", "publications"], write_series_data,
+         [CV_DIR / "series.json"], False),
+        ("series pages", ["talks", "publications"], gen_series_pages,
+         series_pages, False),
+        ("publication pages", ["talks", "publications"], update_publication_pages,
+         publication_pages, False),
+        ("coauthors data", ["publications"], write_coauthors_data,
+         [CV_DIR / "coauthors.json"], False),
+        ("coauthor pages", ["publications"], gen_coauthor_pages, coauthor_pages,
+         False),
+    ]
+    if "--cv" in sys.argv:
+        import generate_cv
+        generate_cv.check_self_names()
+        stages += generate_cv.cv_stages()
+    run_pipeline(stages)
 
     print("\nDone!")
 
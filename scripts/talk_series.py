@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Talk-series index: repeat deliveries of the same talk, grouped.
+
+A series is every talk with the same `block` (topic) and the same
+normalized title; talks with no block are grouped on title alone. Built
+once per run (records.Collection.series) and read by every renderer:
+  - generate_cv.gen_talks lists each topic's deliveries
+  - data/cv/series.json (sync_spreadsheet.py) feeds build-cv.py
+  - the per-series pages under content/series/
+
+Series are numbered in order of their first appearance in the sheet and
+know their deliveries, first and last dates and venues.
+"""
+
+import re
+
+
+def normalize_title(title):
+    """Title with case, punctuation and spacing ignored."""
+    return " ".join(re.sub(r"[^\w\s]", " ", title.lower()).split())
+
+
+def slugify(text):
+    text = re.sub(r"[^\w\s-]", "", text.lower().strip())
+    return re.sub(r"[\s_-]+", "-", text).strip("-")[:80]
+
+
+class TalkSeries:
+    """Deliveries of one talk. `talks` are in sheet order, `deliveries` by date."""
+
+    __slots__ = ("key", "block", "slug", "talks", "position")
+
+    def __init__(self, key, block, position):
+        self.key = key
+        self.block = block
+        self.slug = ""
+        self.talks = []
+        self.position = position
+
+    @property
+    def deliveries(self):
+        """Talks oldest first; undated ones last, in sheet order."""
+        dated = sorted((t for t in self.talks if t.day), key=lambda t: t.day)
+        return dated + [t for t in self.talks if not t.day]
+
+    @property
+    def latest(self):
+        """The most recent delivery (the first listed if none is dated)."""
+        dated = [t for t in self.talks if t.day]
+        return max(dated, key=lambda t: t.day) if dated else self.talks[0]
+
+    @property
+    def title(self):
+        return self.latest.title
+
+    @property
+    def first(self):
+        days = [t.day for t in self.talks if t.day]
+        return min(days) if days else None
+
+    @property
+    def last(self):
+        days = [t.day for t in self.talks if t.day]
+        return max(days) if days else None
+
+    @property
+    def venues(self):
+        """Events where the talk was given, oldest first, without repeats."""
+        return list(dict.fromkeys(t.event for t in self.deliveries if t.event))
+
+    @property
+    def abstract_id(self):
+        """Abstract of the latest delivery that has one ("" if none)."""
+        for t in reversed(self.deliveries):
+            if t.abstract_id:
+                return t.abstract_id
+        return ""
+
+
+class SeriesIndex:
+    """Series of a talks collection, in order of first appearance."""
+
+    def __init__(self, talks):
+        self.talks = [t for t in talks if t.title]
+        self.series = []
+        self._by_key = {}
+        self._by_talk = {}
+        for position, t in enumerate(self.talks):
+            key = (t.block, normalize_title(t.title))
+            series = self._by_key.get(key)
+            if series is None:
+                series = self._by_key[key] = TalkSeries(key, t.block, position)
+                self.series.append(series)
+            series.talks.append(t)
+            self._by_talk[id(t)] = series
+        # Slugs from titles, numbered on collision, in sheet order so they are stable
+        taken = set()
+        for series in self.series:
+            base = slugify(series.title) or "talk"
+            slug, n = base, 1
+            while slug in taken:
+                n += 1
+                slug = f"{base}-{n}"
+            taken.add(slug)
+            series.slug = slug
+
+    def __iter__(self):
+        return iter(self.series)
+
+    def __len__(self):
+        return len(self.series)
+
+    def of(self, talk):
+        """The series a talk belongs to (None for untitled talks)."""
+        return self._by_talk.get(id(talk))
+
+    def topics(self, keep=None):
+        """[(block, talks)]: talks passing `keep` grouped by block, in sheet order.
+
+        Blocks are ordered by their first kept talk; blocks with none are left out.
+        """
+        blocks = {}
+        for t in self.talks:
+            if keep is None or keep(t):
+                blocks.setdefault(t.block, []).append(t)
+        return list(blocks.items())
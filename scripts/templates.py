@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Compiled templates for the generated pages and CV sections.
+
+A Templates set holds named templates for one output language (HTML,
+markdown or LaTeX) and that language's escape function. Each template is
+parsed once, on first use, into a Python function of a view (a dict of the
+record's display fields), so rendering a record is a single call. Slots:
+
+  {{field}}                     the field, escaped
+  {{field|name}}                the field through filters[name], then escaped
+  {{field|raw}}                 the field as is (already-rendered markup)
+  {{?field}}...{{:}}...{{/field}}  first part if the field is truthy, else the second
+  {{#field}}...{{/field}}       the body once per item of a list field, with the
+                                item as the view
+  {{>name}}                     another template of the set, same view
+
+Anything else, including LaTeX braces and Hugo's {{< shortcodes >}}, is
+literal text.
+
+  HTML = Templates({"link": '<a href="{{url}}">{{title}}</a>'}, escape=html_escape)
+  HTML.render("link", {"url": r.url, "title": r.title})
+"""
+
+import html
+import re
+
+SLOT = re.compile(r"\{\{([?#/>]?\w+(?:\|\w+)?|:)\}\}")
+
+
+def html_escape(text):
+    return html.escape(text, quote=False)
+
+
+def md_escape(text):
+    """Escape what would break a markdown link's text."""
+    return text.replace("[", "\\[").replace("]", "\\]")
+
+
+def table_escape(text):
+    """Escape what would break a markdown table cell: pipes and line breaks."""
+    return " ".join(text.replace("|", "\\|").splitlines())
+
+
+def yaml_escape(text):
+    """Escape text for a double-quoted front-matter string."""
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+class TemplateError(Exception):
+    pass
+
+
+class Templates:
+    """Named templates in one output language, each compiled on first use."""
+
+    def __init__(self, sources, escape, filters=None):
+        self.sources = dict(sources)
+        self.escape = escape
+        self.filters = dict(filters or {})
+        self._compiled = {}
+
+    def __getitem__(self, name):
+        """The render function of a template: view → text."""
+        fn = self._compiled.get(name)
+        if fn is None:
+            if name not in self.sources:
+                raise TemplateError(f"no template named {name!r}")
+            fn = self._compiled[name] = self.compile(name, self.sources[name])
+        return fn
+
+    def render(self, name, view):
+        return self[name](view)
+
+    def render_all(self, name, views):
+        """Render each view, yielding the texts."""
+        fn = self[name]
+        return (fn(v) for v in views)
+
+    # ─── Compiling ───
+
+    def compile(self, name, source):
+        tokens = SLOT.split(source)  # literal, slot, literal, slot, ...
+        expr, end = self.parse(tokens, 0, None, name)
+        namespace = {"_esc": self.escape, "_str": str, "_f": self.filters, "_t": self}
+        code = f"def _render(v):\n    return {expr}\n"
+        exec(compile(code, f"<template {name}>", "exec"), namespace)
+        return namespace["_render"]
+
+    def parse(self, tokens, i, closing, name):
+        """Python expression for tokens[i:] up to {{/closing}} (or {{:}} inside a
+        conditional); returns (expression, index after the closing tag)."""
+        parts = []
+        while i < len(tokens):
+            token = tokens[i]
+            if i % 2 == 0:
+                if token:
+                    parts.append(repr(token))
+                i += 1
+                continue
+            i += 1
+            if token == ":" or token.startswith("/"):
+                if closing is None or (token != ":" and token[1:] != closing):
+                    raise TemplateError(f"{name}: unexpected {{{{{token}}}}}")
+                return self.join(parts), i - 1
+            if token.startswith("?"):
+                field = token[1:]
+                then, i = self.parse(tokens, i, field, name)
+                otherwise = "''"
+                if tokens[i] == ":":
+                    otherwise, i = self.parse(tokens, i + 1, field, name)
+                parts.append(f"({then} if v[{field!r}] else {otherwise})")
+                i += 1
+            elif token.startswith("#"):
+                field = token[1:]
+                body, i = self.parse(tokens, i, field, name)
+                if tokens[i] == ":":
+                    raise TemplateError(f"{name}: {{{{:}}}} in a loop")
+                parts.append(f"''.join([{body} for v in v[{field!r}]])")
+                i += 1
+            elif token.startswith(">"):
+                self[token[1:]]  # compile now, so a missing template fails early
+                parts.append(f"_t[{token[1:]!r}](v)")
+            else:
+                field, _, filter_name = token.partition("|")
+                value = f"v[{field!r}]"
+                if filter_name == "raw":
+                    parts.append(f"_str({value})")
+                    continue
+                if filter_name:
+                    if filter_name not in self.filters:
+                        raise TemplateError(f"{name}: no filter named {filter_name!r}")
+                    value = f"_f[{filter_name!r}]({value})"
+                parts.append(f"_esc(_str({value}))")
+        if closing is not None:
+            raise TemplateError(f"{name}: {{{{{closing}}}}} is never closed")
+        return self.join(parts), i
+
+    @staticmethod
+    def join(parts):
+        return "(" + " + ".join(parts) + ")" if parts else "''"
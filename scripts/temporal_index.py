@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Date indexes over collections of dated records.
+
+TemporalIndex — records sorted by date, for upcoming/past splits and years.
+IntervalIndex — records as [start, end] date ranges (trips), for "which
+trip encloses this day" and "which trips overlap this week".
+
+TemporalIndex:
+
+Built once per tab (see records.Collection.timeline) and shared by every
+Hugo and LaTeX generator, so rows are sorted once and each upcoming/past
+split is a bisect rather than a scan. Records whose date does not parse are
+left out of the index (and kept in `undated`).
+
+Ties keep sheet order in every view, including the newest-first past().
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+
+class TemporalIndex:
+    """Records sorted by `day`, with bisect-based date views."""
+
+    def __init__(self, records, key=lambda r: r.day):
+        dated = [r for r in records if key(r)]
+        self.undated = [r for r in records if not key(r)]
+        self.items = sorted(dated, key=key)
+        self.days = [key(r) for r in self.items]
+        # Newest first; a stable reverse sort keeps ties in sheet order
+        self._newest_first = sorted(dated, key=key, reverse=True)
+
+    def __len__(self):
+        return len(self.items)
+
+    def upcoming(self, today):
+        """Records dated today or later, oldest first."""
+        return self.items[bisect_left(self.days, today):]
+
+    def after(self, today):
+        """Records dated strictly after today, oldest first."""
+        return self.items[bisect_right(self.days, today):]
+
+    def past(self, today):
+        """Records dated before today, newest first."""
+        n_upcoming = len(self.items) - bisect_left(self.days, today)
+        return self._newest_first[n_upcoming:]
+
+    def between(self, start, end):
+        """Records dated within [start, end], oldest first."""
+        return self.items[bisect_left(self.days, start):bisect_right(self.days, end)]
+
+    def by_year(self):
+        """{year: records of that year, oldest first}, years ascending."""
+        years = {}
+        for r, day in zip(self.items, self.days):
+            years.setdefault(day.year, []).append(r)
+        return years
+
+
+class IntervalIndex:
+    """Records as closed [start, end] date ranges.
+
+    enclosing(day) is a single bisect: the sweep in __init__ precomputes,
+    for every stretch between consecutive range boundaries, the enclosing
+    range that ends first. overlapping() walks a max-end segment tree over
+    the ranges sorted by start, so it costs O(log n) per range returned.
+    Ranges without a start, or ending before they start, are left out.
+    """
+
+    def __init__(self, records, start=lambda r: r.day,
+                 end=lambda r: getattr(r, "end_day", None) or r.day):
+        spans = []
+        for r in records:
+            s, e = start(r), end(r)
+            if s and e and e >= s:
+                spans.append((s, e, r))
+        # Sorted by start; ties keep the order given
+        self.spans = sorted(spans, key=lambda span: span[0])
+        self.starts = [s for s, _, _ in self.spans]
+        self._build_enclosing()
+        self._build_max_end()
+
+    def __len__(self):
+        return len(self.spans)
+
+    # ─── Enclosing range ───
+
+    def _build_enclosing(self):
+        # Sweep the boundaries (each start, and the day after each end); between
+        # two boundaries the set of open ranges, hence the answer, is fixed.
+        boundaries = sorted({s for s, _, _ in self.spans}
+                            | {e + timedelta(days=1) for _, e, _ in self.spans})
+        self.boundaries = boundaries
+        self.enclosing_at = []
+        open_spans = []
+        i = 0
+        for b in boundaries:
+            while i < len(self.spans) and self.starts[i] <= b:
+                heapq.heappush(open_spans, (self.spans[i][1], i))
+                i += 1
+            while open_spans and open_spans[0][0] < b:
+                heapq.heappop(open_spans)
+            self.enclosing_at.append(self.spans[open_spans[0][1]] if open_spans else None)
+
+    def enclosing(self, day):
+        """The (start, end, record) containing `day` that ends first, or None.
+
+        Among ranges ending the same day, the first in start order wins.
+        """
+        k = bisect_right(self.boundaries, day) - 1
+        return self.enclosing_at[k] if k >= 0 else None
+
+    # ─── Overlap queries ───
+
+    def _build_max_end(self):
+        size = 1
+        while size < len(self.spans):
+            size *= 2
+        self._size = size
+        tree = [None] * (2 * size)
+        for i, (_, e, _) in enumerate(self.spans):
+            tree[size + i] = e
+        for node in range(size - 1, 0, -1):
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = max(left, right) if left and right else left or right
+        self._max_end = tree
+
+    def overlapping(self, start, end):
+        """Records whose range shares at least one day with [start, end], in start order."""
+        limit = bisect_right(self.starts, end)  # only ranges starting by `end`
+        found = []
+        stack = [(1, 0, self._size)] if self.spans else []
+        while stack:
+            node, lo, hi = stack.pop()
+            max_end = self._max_end[node]
+            if lo >= limit or max_end is None or max_end < start:
+                continue
+            if hi - lo == 1:
+                found.append(self.spans[lo][2])
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+        return found
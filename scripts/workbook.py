@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Minimal streaming reader for Google Sheets XLSX exports.
+
+Splits a downloaded workbook into per-sheet rows without loading whole
+worksheets: each sheet's XML is walked with iterparse and rows are yielded
+one at a time. Cell values are rendered the way the gviz CSV export shows
+them for this spreadsheet (dates as YYYY-MM-DD, whole numbers without ".0"),
+so the per-tab CSVs written from a workbook match the ones fetched per tab.
+
+Only the stdlib is used (zipfile + xml.etree).
+"""
+
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime, timedelta
+from xml.etree.ElementTree import iterparse
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Built-in number formats that display dates/times
+DATE_FORMAT_IDS = set(range(14, 23)) | {45, 46, 47}
+
+
+def column_index(ref):
+    """Zero-based column of a cell reference like "AB12"."""
+    n = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        n = n * 26 + (ord(ch.upper()) - ord("A") + 1)
+    return n - 1
+
+
+def is_date_format(code):
+    """True if a custom number format code displays a date."""
+    # Drop quoted literals and [color]/[locale] sections before looking for d/m/y
+    code = re.sub(r'"[^"]*"|\[[^\]]*\]', "", code)
+    return bool(re.search(r"[dy]", code, re.IGNORECASE))
+
+
+class Workbook:
+    """Sheets of an XLSX file, readable one row at a time."""
+
+    def __init__(self, path):
+        self.zip = zipfile.ZipFile(path)
+        self.date1904 = False
+        self.sheets = self._sheet_paths()
+        self.shared_strings = self._shared_strings()
+        self.date_styles = self._date_styles()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.zip.close()
+
+    def _sheet_paths(self):
+        """Sheet name → worksheet XML path inside the zip."""
+        rels = {}
+        with self.zip.open("xl/_rels/workbook.xml.rels") as f:
+            for _, el in iterparse(f):
+                if el.tag == f"{PKG_REL_NS}Relationship":
+                    target = el.get("Target").lstrip("/")
+                    rels[el.get("Id")] = target if target.startswith("xl/") else "xl/" + target
+        sheets = {}
+        with self.zip.open("xl/workbook.xml") as f:
+            for _, el in iterparse(f):
+                if el.tag == f"{NS}sheet":
+                    sheets[el.get("name")] = rels[el.get(f"{REL_NS}id")]
+                elif el.tag == f"{NS}workbookPr":
+                    self.date1904 = el.get("date1904") in ("1", "true")
+        return sheets
+
+    def _shared_strings(self):
+        if "xl/sharedStrings.xml" not in self.zip.namelist():
+            return []
+        strings = []
+        with self.zip.open("xl/sharedStrings.xml") as f:
+            for _, el in iterparse(f):
+                if el.tag == f"{NS}si":
+                    strings.append("".join(t.text or "" for t in el.iter(f"{NS}t")))
+                    el.clear()
+        return strings
+
+    def _date_styles(self):
+        """Indices of cell styles (cellXfs) whose number format is a date."""
+        if "xl/styles.xml" not in self.zip.namelist():
+            return set()
+        custom_dates = set()
+        styles = set()
+        in_cell_xfs = False
+        index = 0
+        with self.zip.open("xl/styles.xml") as f:
+            for event, el in iterparse(f, events=("start", "end")):
+                if event == "start" and el.tag == f"{NS}cellXfs":
+                    in_cell_xfs = True
+                elif event == "end" and el.tag == f"{NS}cellXfs":
+                    in_cell_xfs = False
+                elif event == "end" and el.tag == f"{NS}numFmt":
+                    if is_date_format(el.get("formatCode", "")):
+                        custom_dates.add(int(el.get("numFmtId")))
+                elif event == "end" and el.tag == f"{NS}xf" and in_cell_xfs:
+                    fmt = int(el.get("numFmtId", "0"))
+                    if fmt in DATE_FORMAT_IDS or fmt in custom_dates:
+                        styles.add(index)
+                    index += 1
+        return styles
+
+    def _serial_to_text(self, serial):
+        base = date(1904, 1, 1) if self.date1904 else date(1899, 12, 30)
+        days = int(serial)
+        fraction = serial - days
+        if fraction:
+            moment = datetime.combine(base, datetime.min.time()) + timedelta(days=serial)
+            return moment.strftime("%Y-%m-%d %H:%M:%S")
+        return (base + timedelta(days=days)).isoformat()
+
+    def _cell_text(self, cell):
+        kind = cell.get("t", "n")
+        if kind == "inlineStr":
+            return "".join(t.text or "" for t in cell.iter(f"{NS}t"))
+        v = cell.find(f"{NS}v")
+        raw = v.text if v is not None and v.text is not None else ""
+        if kind == "s":
+            return self.shared_strings[int(raw)] if raw else ""
+        if kind == "b":
+            return "TRUE" if raw == "1" else "FALSE"
+        if kind != "n" or not raw:
+            return raw
+        number = float(raw)
+        if int(cell.get("s", "0")) in self.date_styles:
+            return self._serial_to_text(number)
+        return str(int(number)) if number.is_integer() else raw
+
+    def iter_rows(self, sheet_name):
+        """Yield each row of a sheet as a list of cell strings."""
+        with self.zip.open(self.sheets[sheet_name]) as f:
+            for _, el in iterparse(f):
+                if el.tag != f"{NS}row":
+                    continue
+                values = []
+                for cell in el.iter(f"{NS}c"):
+                    col = column_index(cell.get("r", "")) if cell.get("r") else len(values)
+                    values.extend([""] * (col - len(values)))
+                    values.append(self._cell_text(cell))
+                el.clear()
+                yield values
+
+    def write_csv(self, sheet_name, path):
+        """Write a sheet to `path` in the gviz CSV layout.
+
+        Like gviz: every field quoted, "\n" between rows, no final newline.
+        """
+        buf = io.StringIO()
+        writer = csv.writer(buf, quoting=csv.QUOTE_ALL, lineterminator="")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            width = None
+            for values in self.iter_rows(sheet_name):
+                if width is None:
+                    # Header row fixes the width; trailing empty headers are dropped
+                    while values and not values[-1]:
+                        values.pop()
+                    width = len(values)
+                elif not any(values):
+                    continue
+                else:
+                    f.write("\n")
+                buf.seek(0)
+                buf.truncate()
+                writer.writerow((values + [""] * width)[:width])
+                f.write(buf.getvalue())
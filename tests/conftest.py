@@ -0,0 +1,90 @@
+"""
+Shared test setup: scripts/ is put on sys.path, and every script is pointed
+at a scratch site (SITE_DIR) and HTTP cache before any of them is imported,
+since they read those locations at import time. The `server` fixture is a
+local HTTP server that answers with responses queued by the test.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+SITE = Path(tempfile.mkdtemp(prefix="site-"))
+os.environ["SITE_DIR"] = str(SITE)
+os.environ["HTTP_CACHE_DIR"] = str(SITE / "cache" / "http")
+for name in ("SHEET_ID", "SELF_NAMES"):
+    os.environ.pop(name, None)
+
+
+@pytest.fixture(autouse=True)
+def argv(monkeypatch):
+    """Scripts read their options from sys.argv; start every test with none."""
+    monkeypatch.setattr(sys, "argv", ["test"])
+    return sys.argv
+
+
+@pytest.fixture(autouse=True)
+def site():
+    """The scratch site directory the scripts read and write, emptied after each test."""
+    yield SITE
+    for path in SITE.iterdir():
+        shutil.rmtree(path) if path.is_dir() else path.unlink()
+
+
+class Server:
+    """A local server answering every GET with the next of `responses`."""
+
+    def __init__(self):
+        self.requests = []
+        self.responses = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests.append((self.command, self.path, dict(self.headers)))
+                status, headers, body = server.responses.pop(0)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_CONNECT(self):
+                server.requests.append((self.command, self.path, dict(self.headers)))
+                self.send_response(502)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.address = "127.0.0.1:%d" % self.httpd.server_address[1]
+        self.url = f"http://{self.address}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """A Server, with no proxy configured and no pooled connections to an earlier one."""
+    import http_client
+
+    monkeypatch.setattr(http_client, "POOL", http_client.Pool())
+    for name in ("http_proxy", "https_proxy", "no_proxy", "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    s = Server()
+    yield s
+    s.httpd.shutdown()
+    s.httpd.server_close()
@@ -0,0 +1,33 @@
+import json
+
+from abstract_store import AbstractStore, abstract_id, store_abstract
+
+
+def test_identical_abstracts_are_stored_once():
+    store = AbstractStore()
+    first = store.put("Eigenfunctions of the Laplacian.")
+    assert store.put("Eigenfunctions of the Laplacian.") == first
+    assert store.put("") == "" and store.get("") == ""
+    assert len(store) == 1 and store.get(first) == "Eigenfunctions of the Laplacian."
+    assert first == abstract_id("Eigenfunctions of the Laplacian.") and len(first) == 16
+
+
+def test_store_abstract_replaces_the_text_with_its_id():
+    store = AbstractStore()
+    entry = store_abstract({"title": "Hot spots", "abstract": "Text."}, store)
+    assert entry == {"title": "Hot spots", "abstract_id": abstract_id("Text.")}
+
+
+def test_save_keeps_texts_of_ids_not_rebuilt_and_skips_unchanged_writes(tmp_path):
+    path = tmp_path / "abstracts.json"
+    old = AbstractStore()
+    kept, dropped = old.put("Kept."), old.put("Dropped.")
+    assert old.save(path)
+
+    new = AbstractStore()
+    fresh = new.put("New.")
+    assert new.save(path, ids=[kept, fresh])
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved == {kept: "Kept.", fresh: "New."} and list(saved) == sorted(saved)
+    assert dropped not in path.read_text(encoding="utf-8")
+    assert not new.save(path, ids=[kept, fresh])
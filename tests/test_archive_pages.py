@@ -0,0 +1,25 @@
+from records import build_records
+from sync_spreadsheet import write_section_pages
+
+TRAVEL = [
+    {"title": "Visit", "location": "Providence, RI", "date": "2023-04-01", "date_end": "2023-04-03"},
+    {"title": "Workshop", "location": "Oberwolfach", "date": "2024-05-01", "date_end": "2024-05-05"},
+    {"title": "Conference", "location": "Madrid", "date": "2030-07-01", "date_end": "2030-07-05"},
+]
+
+
+def test_travel_archive_gets_one_page_per_past_year(site, argv):
+    argv += ["--today", "2025-01-01"]
+    travel = site / "content" / "travel"
+    travel.mkdir(parents=True)
+    write_section_pages("travel", build_records("travel", TRAVEL))
+    assert sorted(p.name for p in travel.iterdir()) == ["2023.md", "2024.md", "_index.md"]
+    assert "Oberwolfach" in (travel / "2024.md").read_text(encoding="utf-8")
+    index = (travel / "_index.md").read_text(encoding="utf-8")
+    assert "Madrid" in index and "Oberwolfach" not in index
+
+    # Unchanged years are not rewritten; years with nothing left are removed
+    mtime = (travel / "2024.md").stat().st_mtime_ns
+    write_section_pages("travel", build_records("travel", TRAVEL[1:]))
+    assert (travel / "2024.md").stat().st_mtime_ns == mtime
+    assert not (travel / "2023.md").exists()
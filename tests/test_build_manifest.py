@@ -0,0 +1,84 @@
+from build_manifest import BuildManifest, file_hash, input_hash, module_closure
+from sheet_data import Snapshot, run_pipeline
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_file_hash_of_a_missing_file_is_empty(tmp_path):
+    assert file_hash(tmp_path / "nope") == ""
+    assert file_hash(write(tmp_path / "a", "x")) == file_hash(write(tmp_path / "b", "x"))
+
+
+def test_input_hash_covers_file_contents_and_values(site):
+    script = write(site / "s.py", "A = 1\n")
+    key = input_hash([script], ["digest"])
+    assert input_hash([script], ["digest"]) == key
+    assert input_hash([script], ["other"]) != key
+    write(script, "A = 2\n")
+    assert input_hash([script], ["digest"]) != key
+
+
+def test_recorded_stage_is_current_until_an_output_changes(site, tmp_path):
+    out = write(site / "content" / "page.md", "v1")
+    manifest = BuildManifest(tmp_path / "manifest.json")
+    assert not manifest.is_current("s", "k", [out])
+    manifest.record("s", "k", [out])
+    manifest.save()
+
+    manifest = BuildManifest(tmp_path / "manifest.json")
+    assert manifest.is_current("s", "k", [out])
+    assert not manifest.is_current("s", "other key", [out])
+    assert not BuildManifest(tmp_path / "manifest.json", force=True).is_current("s", "k", [out])
+    write(out, "edited by hand")
+    assert not manifest.is_current("s", "k", [out])
+
+
+def test_deleted_output_not_listed_any_more_invalidates(site, tmp_path):
+    pages = [write(site / "content" / f"{year}.md", year) for year in ("2024", "2025")]
+    manifest = BuildManifest(tmp_path / "manifest.json")
+    manifest.record("s", "k", pages)
+    pages[0].unlink()
+    # A stage listing its outputs by glob no longer sees the deleted page
+    assert not manifest.is_current("s", "k", pages[1:])
+
+
+def test_module_closure_follows_local_imports(tmp_path):
+    write(tmp_path / "main.py", "import os\nimport helper\n")
+    write(tmp_path / "helper.py", "def f():\n    from nested import x\n")
+    write(tmp_path / "nested.py", "x = 1\n")
+    write(tmp_path / "unused.py", "")
+    names = [p.name for p in module_closure(str(tmp_path / "main.py"))]
+    assert names == ["helper.py", "main.py", "nested.py"]
+
+
+def stage_runs(tmp_path):
+    """Stages that ran in one pipeline run over a one-tab snapshot."""
+    ran = []
+
+    def stage(talks):
+        ran.append(talks)
+
+    snapshot = Snapshot()
+    snapshot.add("talks", [{"title": "T", "date": "2025-01-01"}], "cached", "digest")
+    run_pipeline([("talks", ["talks"], stage, [], False)], snapshot=snapshot,
+                 manifest=BuildManifest(tmp_path / "manifest.json"))
+    return len(ran)
+
+
+def test_unchanged_stage_is_skipped(tmp_path):
+    assert stage_runs(tmp_path) == 1
+    assert stage_runs(tmp_path) == 0
+
+
+def test_config_environment_is_part_of_the_key(tmp_path, monkeypatch):
+    monkeypatch.delenv("SELF_NAMES", raising=False)
+    assert stage_runs(tmp_path) == 1
+    monkeypatch.setenv("SELF_NAMES", "A. N. Other")
+    assert stage_runs(tmp_path) == 1
+    assert stage_runs(tmp_path) == 0
+    monkeypatch.setenv("SHEET_ID", "another-sheet")
+    assert stage_runs(tmp_path) == 1
@@ -0,0 +1,47 @@
+import pytest
+
+from coauthors import SELF_NAMES, CoauthorIndex, is_self, name_key, parse_authors
+from records import build_records
+
+
+@pytest.mark.parametrize("authors, names", [
+    ("de Dios Pont, J., Guth, L., Tao, T.", ("de Dios Pont, J.", "Guth, L.", "Tao, T.")),
+    ("Guth, Larry, Tao, Terence", ("Guth, Larry", "Tao, Terence")),
+    ("de Dios Pont, J. M., A. Other", ("de Dios Pont, J. M.", "A. Other")),
+    ("Jaume de Dios Pont, Terence Tao, Larry Guth",
+     ("Jaume de Dios Pont", "Terence Tao", "Larry Guth")),
+    ("Dios Pont, Jaume de; Tao, Terence", ("Dios Pont, Jaume de", "Tao, Terence")),
+    ("", ()),
+])
+def test_author_strings_split_into_names(authors, names):
+    assert parse_authors(authors) == names
+
+
+def test_names_match_across_spellings():
+    assert name_key("José Madrid") == name_key("Jose  Madrid") == name_key("Madrid, José")
+    assert name_key("J. de Dios") == name_key("j de dios")
+    assert all(is_self(name) for name in SELF_NAMES)
+    assert not is_self("Terence Tao")
+
+
+def test_every_self_name_renders_as_me(capsys):
+    from generate_cv import check_self_names, format_authors
+
+    for name in SELF_NAMES:
+        assert format_authors(parse_authors(name)) == "\\me"
+        assert format_authors(parse_authors(f"{name}, Terence Tao")) == "\\me \\& Terence Tao"
+    check_self_names()
+    assert capsys.readouterr().err == ""
+
+
+def test_coauthor_index_merges_spellings_and_leaves_out_the_owner():
+    pubs = build_records("publications", [
+        {"title": "A", "authors": "Jaume de Dios Pont, José Madrid, Terence Tao"},
+        {"title": "B", "authors": "de Dios Pont, J., Madrid, Jose"},
+        {"title": "C", "authors": "Jose Madrid, José Madrid"},
+    ])
+    index = CoauthorIndex(pubs)
+    assert [(c.name, c.count) for c in index.by_count()] == [("José Madrid", 3), ("Terence Tao", 1)]
+    assert [p.title for p in index.publications_with("madrid, jose")] == ["A", "B", "C"]
+    assert index.get("Jaume de Dios Pont") is None
+    assert [c.slug for c in index] == ["jose-madrid", "terence-tao"]
@@ -0,0 +1,37 @@
+import json
+
+from abstract_store import ABSTRACTS
+from cv_data import iter_list_chunks, load_cv, read_index, write_collection
+
+TALKS = [{"title": "Hot spots", "date": "2024-05-01"}, {"title": "Décou|pling", "date": ""}]
+
+
+def test_streamed_list_matches_json_dumps():
+    for entries in ([], TALKS):
+        assert "".join(iter_list_chunks(iter(entries))) == json.dumps(
+            entries, indent=2, ensure_ascii=False)
+
+
+def test_each_collection_is_written_on_its_own(tmp_path):
+    cv_dir, abstracts = tmp_path / "cv", tmp_path / "abstracts.json"
+    assert write_collection("talks", TALKS, cv_dir, abstracts)
+    assert write_collection("publications", [], cv_dir, abstracts)
+    talks_file = cv_dir / "talks.json"
+    mtime = talks_file.stat().st_mtime_ns
+    assert not write_collection("talks", iter(TALKS), cv_dir, abstracts)
+    assert talks_file.stat().st_mtime_ns == mtime
+    assert not (cv_dir / "talks.json.tmp").exists()
+
+    index = read_index(cv_dir)
+    assert index["talks"]["count"] == 2 and index["publications"]["count"] == 0
+    assert load_cv("talks", "series", cv_dir=cv_dir) == {"talks": TALKS, "series": []}
+
+
+def test_abstracts_file_follows_the_ids_collections_refer_to(tmp_path):
+    cv_dir, abstracts = tmp_path / "cv", tmp_path / "abstracts.json"
+    ref = ABSTRACTS.put("Only in talks.")
+    write_collection("talks", [{"title": "T", "abstract_id": ref}], cv_dir, abstracts)
+    assert json.loads(abstracts.read_text(encoding="utf-8")) == {ref: "Only in talks."}
+    assert read_index(cv_dir)["talks"]["abstracts"] == [ref]
+    write_collection("talks", [{"title": "T"}], cv_dir, abstracts)
+    assert json.loads(abstracts.read_text(encoding="utf-8")) == {}
@@ -0,0 +1,45 @@
+from datetime import date
+
+import department
+
+ADA = {"name": "Ada", "url": "https://ada.example"}
+BOB = {"name": "Bob"}
+
+
+def test_unsorted_feed_is_merged_in_date_order():
+    ada = department.parse_feed(ADA, {"talks": [
+        {"title": "Late", "date": "2024-03-01"},
+        {"title": "Early", "date": "2024-01-10"},
+        {"title": "", "date": "2024-01-11"},
+        {"title": "No date"},
+    ]})
+    bob = department.parse_feed(BOB, {"talks": [{"title": "Middle", "date": "2024-02-01"}]})
+    today = date(2024, 1, 1)
+    talks = department.merged([department.talk_stream(m, f, today)
+                               for m, f in ((ADA, ada), (BOB, bob))], until=date(2024, 12, 31))
+    assert [t["title"] for _, _, t in talks] == ["Early", "Middle", "Late"]
+    assert department.merged([department.talk_stream(ADA, ada, today)],
+                             until=date(2024, 2, 1)) == [(date(2024, 1, 10), ADA, ada["talks"][0][1])]
+
+
+def test_trips_are_merged_by_start_and_split_into_away_and_coming_up():
+    feed = department.parse_feed(BOB, {"travel": [
+        {"title": "Workshop", "location": "Oberwolfach", "start": "2024-05-01", "end": "2024-05-05"},
+        {"title": "Visit", "location": "Paris", "start": "2024-04-01", "end": "2024-04-20"},
+        {"title": "Backwards", "start": "2024-04-02", "end": "2024-04-01"},
+    ]})
+    today = date(2024, 4, 10)
+    trips = department.merged([department.trip_stream(BOB, feed, today)], until=date(2024, 12, 31))
+    lines = list(department.travel_page_lines("Maths", trips, today))
+    assert lines.index("## Away now") < lines.index("| Apr 01–20 | Bob | Paris | Visit |") \
+        < lines.index("## Coming up")
+    assert [t["title"] for _, _, _, t in trips] == ["Visit", "Workshop"]
+
+
+def test_pipes_and_quotes_are_escaped():
+    talks = [(date(2024, 1, 10), ADA,
+              {"title": "A | B", "url": "https://x.example", "event": 'The "Seminar"', "location": None})]
+    lines = list(department.talks_page_lines('The "Maths" Dept', talks))
+    assert lines[1] == 'title: "The \\"Maths\\" Dept: upcoming talks"'
+    assert lines[-1] == ('| Jan 10, 2024 | [Ada](https://ada.example) | '
+                         '[A \\| B](https://x.example) | The "Seminar" |')
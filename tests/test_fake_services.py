@@ -0,0 +1,69 @@
+import http.client
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import fake_services
+import http_client
+from sheet_data import tab_url
+
+
+@pytest.fixture
+def sheet_dir(tmp_path):
+    (tmp_path / "talks.csv").write_text('"Title","Date"\n"Seminar","2024-05-01"\n', encoding="utf-8")
+    return tmp_path
+
+
+def serve(sheet_dir, faults):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), fake_services.handler(
+        fake_services.Recordings(sheet_dir=sheet_dir), faults))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def restore(monkeypatch):
+    """`run` swaps http_client.connect and edits sys.path; undo both, and start
+    with no pooled connections to a previous test's server."""
+    monkeypatch.setattr(http_client, "connect", http_client.connect)
+    monkeypatch.setattr(http_client, "POOL", http_client.Pool())
+    monkeypatch.setattr(sys, "path", list(sys.path))
+
+
+def test_run_sends_a_scripts_requests_to_the_server(sheet_dir, tmp_path, restore, capsys):
+    server = serve(sheet_dir, fake_services.Faults())
+    script = tmp_path / "fetch.py"
+    script.write_text(
+        "import sys, http_client\n"
+        "print(http_client.get(sys.argv[1], cache=False).text)\n", encoding="utf-8")
+    try:
+        fake_services.run("127.0.0.1:%d" % server.server_address[1], str(script),
+                          [tab_url("talks")])
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert '"Seminar","2024-05-01"' in capsys.readouterr().out
+
+
+def test_unrecorded_urls_and_injected_failures(sheet_dir, restore):
+    server = serve(sheet_dir, fake_services.Faults(fail_first=1, fail_status=503))
+    http_client.connect = lambda scheme, host, port, timeout: http.client.HTTPConnection(
+        "127.0.0.1", server.server_address[1], timeout=timeout)
+    try:
+        assert http_client.get(tab_url("talks"), cache=False).status == 503
+        assert http_client.get(tab_url("talks"), cache=False).status == 200
+        assert http_client.get("https://example.org/nope", cache=False).status == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_gog_update_and_clear_edit_the_tab_csv(sheet_dir, monkeypatch):
+    monkeypatch.setenv("FAKE_GOG_SHEET_DIR", str(sheet_dir))
+    assert fake_services.gog(["sheets", "update", "ID", "talks!A3:B3", "Colloquium", "2024-06-01"]) == 0
+    assert fake_services.gog(["sheets", "clear", "ID", "talks!B2"]) == 0
+    assert fake_services.read_grid(sheet_dir / "talks.csv") == [
+        ["Title", "Date"], ["Seminar", ""], ["Colloquium", "2024-06-01"]]
+    assert fake_services.gog(["sheets", "append", "ID", "talks!A1"]) == 2
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+import farm
+
+PREAMBLE = "\\documentclass{article}\n\\usepackage{cvstyle}\n"
+
+
+@pytest.fixture
+def tenants(tmp_path):
+    for name in ("ada", "bob"):
+        (tmp_path / "sites" / name / "content").mkdir(parents=True)
+    path = tmp_path / "tenants.json"
+    path.write_text(json.dumps([
+        {"name": "ada", "root": "sites/ada", "sheet_id": "sheet-ada",
+         "self_names": ["Ada Lovelace", "A. Lovelace"]},
+        {"name": "bob", "root": "sites/bob", "args": ["--max-age", "60"]},
+        {"name": "eve", "root": "sites/eve"},
+    ]), encoding="utf-8")
+    return farm.load_tenants(path)
+
+
+def test_tenants_get_absolute_roots_and_their_own_environment(tenants, tmp_path):
+    ada = tenants[0]
+    assert ada["root"] == tmp_path / "sites" / "ada"
+    env = farm.tenant_env(ada)
+    assert env["SITE_DIR"] == str(ada["root"])
+    assert env["SHEET_ID"] == "sheet-ada"
+    assert env["SELF_NAMES"] == "Ada Lovelace; A. Lovelace"
+    assert env["HTTP_CACHE_DIR"] == str(farm.FARM_DIR / "http")
+
+
+def test_duplicate_tenant_names_are_rejected(tmp_path):
+    path = tmp_path / "tenants.json"
+    path.write_text(json.dumps([{"name": "a", "root": "x"}, {"name": "a", "root": "y"}]),
+                    encoding="utf-8")
+    with pytest.raises(SystemExit):
+        farm.load_tenants(path)
+
+
+def test_failing_tenant_does_not_stop_the_others(tenants, tmp_path, monkeypatch):
+    # A stand-in sync step that records its environment and fails for bob
+    scripts = tmp_path / "scripts"
+    scripts.mkdir()
+    (scripts / "sync_spreadsheet.py").write_text(
+        "import os, sys\n"
+        "open(os.path.join(os.environ['SITE_DIR'], 'synced'), 'w').write(' '.join(sys.argv[1:]))\n"
+        "sys.exit(1 if os.environ['SITE_DIR'].endswith('bob') else 0)\n", encoding="utf-8")
+    monkeypatch.setattr(farm, "SCRIPT_DIR", scripts)
+
+    results = {name: error for name, error, _ in
+               (farm.build_tenant(t, {}, pdf=False, hugo=False) for t in tenants)}
+    assert results["ada"] is None
+    assert results["bob"].startswith("sync failed")
+    assert results["eve"].startswith("no site at")
+    assert (tenants[0]["root"] / "synced").read_text() == "--cv --xlsx"
+    assert (tenants[1]["root"] / "synced").read_text() == "--cv --xlsx --max-age 60"
+
+
+def test_format_name_follows_the_preamble_and_local_styles(tmp_path):
+    cv = tmp_path / "cv"
+    cv.mkdir()
+    main = cv / "main.tex"
+    main.write_text(PREAMBLE + "\\begin{document}\n", encoding="utf-8")
+    assert farm.format_name(cv) is None
+
+    main.write_text(PREAMBLE + farm.DUMP_MARKER + "\n\\begin{document}A", encoding="utf-8")
+    name = farm.format_name(cv)
+    main.write_text(PREAMBLE + farm.DUMP_MARKER + "\n\\begin{document}B", encoding="utf-8")
+    assert farm.format_name(cv) == name
+    (cv / "cvstyle.sty").write_text("% style\n", encoding="utf-8")
+    assert farm.format_name(cv) != name
@@ -0,0 +1,77 @@
+import gzip
+import zlib
+
+import pytest
+
+import http_client
+
+
+def decode(encoding, data, chunk_size):
+    decompress, flush = http_client.decoder(encoding)
+    out = b"".join(decompress(data[i:i + chunk_size]) for i in range(0, len(data), chunk_size))
+    return out + flush()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_gzip_zlib_and_raw_deflate_bodies_decode(chunk_size):
+    body = b"title,year\n" * 200
+    raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    raw_deflate = raw.compress(body) + raw.flush()
+    assert decode("gzip", gzip.compress(body), chunk_size) == body
+    assert decode("deflate", zlib.compress(body), chunk_size) == body
+    assert decode("deflate", raw_deflate, chunk_size) == body
+    assert http_client.decoder("identity") is None
+
+
+def test_fresh_response_is_served_from_the_cache(server):
+    server.responses.append((200, {"Cache-Control": "max-age=600"}, b"fresh"))
+    first = http_client.get(f"{server.url}/fresh")
+    second = http_client.get(f"{server.url}/fresh")
+    assert first.content == second.content == b"fresh"
+    assert second.from_cache
+    assert len(server.requests) == 1
+
+
+def test_stale_response_is_revalidated_with_its_etag(server):
+    server.responses += [
+        (200, {"Cache-Control": "no-cache", "ETag": '"v1"'}, b"body"),
+        (304, {"ETag": '"v1"'}, b""),
+    ]
+    before = http_client.STATS.revalidated
+    http_client.get(f"{server.url}/etag")
+    again = http_client.get(f"{server.url}/etag")
+    assert again.content == b"body"
+    assert server.requests[1][2]["If-None-Match"] == '"v1"'
+    assert http_client.STATS.revalidated == before + 1
+
+
+def test_no_store_response_is_not_cached(server):
+    server.responses += [(200, {"Cache-Control": "no-store"}, b"a"), (200, {}, b"b")]
+    assert http_client.get(f"{server.url}/private").content == b"a"
+    assert http_client.get(f"{server.url}/private").content == b"b"
+
+
+def test_plain_http_goes_to_the_proxy_in_absolute_form(server, monkeypatch):
+    monkeypatch.setenv("http_proxy", f"http://user:pw@{server.address}")
+    server.responses.append((200, {}, b"via proxy"))
+    resp = http_client.get("http://example.invalid/page?x=1", cache=False)
+    assert resp.content == b"via proxy"
+    method, path, headers = server.requests[0]
+    assert path == "http://example.invalid/page?x=1"
+    assert headers["Host"] == "example.invalid"
+    assert headers["Proxy-Authorization"] == "Basic dXNlcjpwdw=="
+
+
+def test_https_is_tunnelled_through_the_proxy_with_connect(server, monkeypatch):
+    monkeypatch.setenv("https_proxy", server.url)
+    with pytest.raises(OSError, match="Tunnel connection failed"):
+        http_client.get("https://example.invalid/page", cache=False)
+    assert server.requests[0][:2] == ("CONNECT", "example.invalid:443")
+
+
+def test_no_proxy_hosts_bypass_the_proxy(monkeypatch):
+    monkeypatch.setenv("http_proxy", "proxy.example:3128")
+    monkeypatch.setenv("no_proxy", "docs.google.com")
+    assert http_client.proxy_for("http", "export.arxiv.org") == "http://proxy.example:3128"
+    assert http_client.proxy_for("http", "docs.google.com") is None
+    assert http_client.proxy_for("https", "export.arxiv.org") is None
@@ -0,0 +1,67 @@
+import zipfile
+from datetime import date
+
+import pytest
+
+import offline_bundle
+
+URLS = {
+    "https://docs.google.com/talks.csv": b"title,date\nSeminar,2024-05-01\n",
+    "https://export.arxiv.org/api/query": b"<feed/>",
+}
+
+
+@pytest.fixture
+def upstream(site, monkeypatch):
+    """Fake external inputs: URLS, plus one bib file in the site."""
+    monkeypatch.setattr(offline_bundle, "external_urls", lambda: [("sheet", u) for u in URLS])
+    monkeypatch.setattr(offline_bundle, "download", URLS.__getitem__)
+    monkeypatch.setattr(offline_bundle, "_bundle", None)
+    bib = site / "static" / "bib" / "paper.bib"
+    bib.parent.mkdir(parents=True)
+    bib.write_text("@article{x}\n", encoding="utf-8")
+    return bib
+
+
+def test_capture_is_byte_stable_and_verifies(upstream, tmp_path):
+    offline_bundle.capture(tmp_path / "a.zip")
+    offline_bundle.capture(tmp_path / "b.zip")
+    assert (tmp_path / "a.zip").read_bytes() == (tmp_path / "b.zip").read_bytes()
+    assert offline_bundle.verify(tmp_path / "a.zip")
+
+    bundle = offline_bundle.Bundle(tmp_path / "a.zip")
+    url = "https://docs.google.com/talks.csv"
+    assert bundle.read_url(url) == URLS[url]
+    assert bundle.extract_url(url, tmp_path / "out" / "talks.csv").read_bytes() == URLS[url]
+    with pytest.raises(SystemExit):
+        bundle.read_url("https://example.org/not-captured")
+
+
+def test_tampered_entry_fails_verification(upstream, tmp_path):
+    offline_bundle.capture(tmp_path / "a.zip")
+    with zipfile.ZipFile(tmp_path / "a.zip") as src, \
+            zipfile.ZipFile(tmp_path / "bad.zip", "w") as dst:
+        for info in src.infolist():
+            body = src.read(info)
+            dst.writestr(info, body.replace(b"Seminar", b"Seminal"))
+    assert not offline_bundle.verify(tmp_path / "bad.zip")
+
+
+def test_restore_writes_the_bib_files_back(upstream, tmp_path):
+    offline_bundle.capture(tmp_path / "a.zip")
+    upstream.unlink()
+    offline_bundle.restore(tmp_path / "a.zip")
+    assert upstream.read_text(encoding="utf-8") == "@article{x}\n"
+
+
+def test_bundle_replay_reads_tabs_and_date_from_the_bundle(upstream, tmp_path, argv, monkeypatch):
+    import sheet_data
+
+    monkeypatch.setattr(sheet_data, "tab_url", lambda tab: f"https://docs.google.com/{tab}.csv")
+    offline_bundle.capture(tmp_path / "a.zip")
+    argv += ["--bundle", str(tmp_path / "a.zip")]
+    rows = sheet_data.fetch_tab("talks")
+    assert [row["title"] for row in rows] == ["Seminar"]
+    assert sheet_data.TAB_STATUS["talks"] == "bundled"
+    offline_bundle.bundle_from_args().manifest["captured_on"] = "2020-02-02"
+    assert sheet_data.build_date() == date(2020, 2, 2)
@@ -0,0 +1,63 @@
+import pytest
+
+import record_store
+from record_store import RecordStore
+from records import build_records
+from sheet_diff import diff_tab, write_baseline
+
+TALKS = [
+    {"title": "Hot spots", "type": "Seminar", "event": "Brown University", "date": "2024-05-01",
+     "abstract": "Eigenfunctions of the Laplacian."},
+    {"title": "Decoupling", "type": "Colloquium", "event": "ETH Zürich", "date": "2023-06-01"},
+]
+
+
+def ingest(store, rows, digest):
+    records = build_records("talks", rows)
+    rows = list(records.rows())
+    store.ingest("talks", rows, records, digest, diff_tab("talks", rows, digest))
+    write_baseline("talks", rows, digest)
+
+
+@pytest.fixture
+def store(site):
+    store = RecordStore(record_store.STORE_PATH)
+    if not store.fts:
+        pytest.skip("SQLite without FTS5")
+    yield store
+    store.close()
+
+
+def titles(rows):
+    return [row["title"] for row in rows]
+
+
+def test_changed_tab_gets_only_its_changes_applied(store, capsys):
+    ingest(store, TALKS, "d1")
+    assert "talks loaded 2 rows" in capsys.readouterr().out
+    edited = [{**TALKS[0], "type": "Colloquium"}, TALKS[1],
+              {"title": "Kakeya", "type": "Seminar", "event": "IAS", "date": "2025-01-01"}]
+    ingest(store, edited, "d2")
+    assert "talks applied +1 ~1 -0" in capsys.readouterr().out
+    ingest(store, edited, "d2")
+    assert capsys.readouterr().out == ""
+
+    assert titles(store.talks()) == ["Decoupling", "Hot spots", "Kakeya"]
+    assert titles(store.talks(at="brown")) == ["Hot spots"]
+    assert titles(store.talks(since="2024-01-01", until="2024-12-31")) == ["Hot spots"]
+    assert [row["position"] for row in store.talks()] == [1, 0, 2]
+
+
+def test_search_covers_titles_abstracts_and_places(store):
+    ingest(store, TALKS, "d1")
+    assert titles(store.search("laplacian")) == ["Hot spots"]
+    assert titles(store.search("zurich", tab="talks")) == ["Decoupling"]
+    assert titles(store.search("decoupling NOT eth")) == []
+
+
+def test_search_cli_falls_back_to_a_phrase_on_bad_query_syntax(store, argv, capsys):
+    ingest(store, TALKS, "d1")
+    capsys.readouterr()
+    argv[1:] = ["search", "hot-spots"]
+    record_store.main()
+    assert capsys.readouterr().out.split() == ["talks", "Hot", "spots"]
@@ -0,0 +1,54 @@
+from datetime import date
+
+import pytest
+
+from records import Collection, Course, Talk, build_records, parse_date
+
+ROWS = [
+    {"title": "Hot spots", "type": "Seminar", "event": "Brown", "date": "2024-05-01",
+     "abstract": "About eigenfunctions.", "notes": "not a column"},
+    {"title": "Hot spots II", "type": "".join(["Semi", "nar"]), "event": "".join(["Bro", "wn"]),
+     "date": "2024-13-01", "abstract": "About eigenfunctions."},
+]
+
+
+def test_talk_rows_become_slotted_typed_records():
+    talks = build_records("talks", ROWS)
+    assert isinstance(talks, Collection) and [type(t) for t in talks] == [Talk, Talk]
+    first, second = talks
+    assert first.day == date(2024, 5, 1) and second.day is None
+    assert first.url == ""
+    assert first.event is second.event and first.type is second.type
+    with pytest.raises(AttributeError):
+        first.notes = "no such column"
+
+
+def test_abstracts_are_stored_once_and_round_trip():
+    first, second = build_records("talks", ROWS)
+    assert first.abstract_id == second.abstract_id
+    assert first.abstract == "About eigenfunctions."
+    assert list(build_records("talks", ROWS).rows())[0] == {
+        "title": "Hot spots", "type": "Seminar", "event": "Brown", "date": "2024-05-01",
+        "url": "", "abstract": "About eigenfunctions.", "block": "", "category": "",
+        "short_location": ""}
+
+
+def test_publications_teaching_and_unknown_tabs():
+    [pub] = build_records("publications", [{"title": "Kakeya", "authors": "A. Author, B. Author"}])
+    assert len(pub.author_list) == 2
+    [course] = build_records("teaching", [{"course": "Calculus", "institution": "UCLA"}])
+    assert isinstance(course, Course) and course.role == "Teaching Assistant"
+    rows = [{"anything": "goes"}]
+    assert list(build_records("other", rows).rows()) == rows
+
+
+def test_collection_indexes_are_built_once():
+    talks = build_records("talks", ROWS)
+    assert talks.timeline is talks.timeline
+    assert talks.series is talks.series
+
+
+def test_parse_date():
+    assert parse_date("2024-05-01T10:00") == date(2024, 5, 1)
+    assert parse_date("May 2024") is None
+    assert parse_date("") is None
@@ -0,0 +1,48 @@
+from records import build_records
+from related import MAX_PAPERS, links, words
+
+PUBLICATIONS = [
+    {"title": "The hot spots conjecture for Neumann eigenfunctions", "authors": "A"},
+    {"title": "Decoupling inequalities for curves", "authors": "A",
+     "abstract": "Sharp decoupling for moment curves."},
+    {"title": "Kakeya sets over finite fields", "authors": "A"},
+    {"title": "Sharp Strichartz estimates", "authors": "A"},
+    {"title": "", "authors": "A"},
+]
+TALKS = [
+    {"title": "Hot spots", "block": "Spectral", "abstract": "Where Neumann eigenfunctions peak."},
+    {"title": "Hot spots", "block": "Spectral", "abstract": "Where Neumann eigenfunctions peak."},
+    {"title": "Decoupling and moment curves", "block": "Fourier"},
+    {"title": "Lattice points in convex bodies", "block": "Other"},
+]
+
+
+def index():
+    talks = build_records("talks", TALKS)
+    pubs = build_records("publications", PUBLICATIONS)
+    return talks, pubs, links(talks, pubs)
+
+
+def test_series_link_to_the_publications_they_are_about():
+    talks, pubs, related = index()
+    hot, decoupling, lattice = talks.series
+    assert related.papers(hot) == [pubs[0]]
+    assert related.papers(decoupling)[0] is pubs[1]
+    assert related.papers(lattice) == []
+    assert related.series_for(pubs[0]) == [hot]
+    assert related.series_for(pubs[2]) == []
+    assert all(len(related.papers(s)) <= MAX_PAPERS for s in talks.series)
+
+
+def test_only_publications_sharing_a_distinctive_word_are_scored():
+    talks, pubs, related = index()
+    assert related.scored < len(talks.series) * len([p for p in pubs if p.title])
+
+
+def test_index_is_built_once_per_pair_of_collections():
+    talks, pubs, related = index()
+    assert links(talks, pubs) is related
+
+
+def test_words_drop_stopwords_and_plural_s():
+    assert words("The Kakeya sets over finite fields, 2024") == ["kakeya", "sets", "finite", "field"]
@@ -0,0 +1,153 @@
+import json
+
+import pytest
+
+from build_manifest import BuildManifest
+from records import Talk, Travel
+from sheet_data import Snapshot, run_pipeline
+
+TALKS = [
+    {"title": "Hot spots", "type": "Seminar", "event": "Brown", "date": "2026-05-01"},
+    {"title": "Decoupling", "type": "Colloquium", "event": "ETH", "date": "2023-06-01"},
+]
+TRAVEL = [
+    {"title": "Visit", "location": "Providence, RI", "date": "2026-05-01",
+     "date_end": "2026-05-02"},
+]
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    """Start each fetching test with a fresh --budget clock and quick retries."""
+    import sheet_data
+
+    monkeypatch.setattr(sheet_data, "_deadline", None)
+    monkeypatch.setattr(sheet_data, "RETRY_BASE", 0.01)
+
+
+def write_snapshot(path, tabs):
+    lines = [["snapshot", {"sheet_id": "test"}]]
+    for name, rows in tabs.items():
+        lines.append(["tab", {"name": name, "status": "cached", "digest": f"{name}-digest"}])
+        lines += [["row", row] for row in rows]
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+
+
+def test_multi_tab_stage_runs_from_snapshot(tmp_path):
+    path = tmp_path / "snapshot.jsonl"
+    write_snapshot(path, {"talks": TALKS, "travel": TRAVEL})
+    seen = []
+
+    def stage(talks, travel):
+        seen.append((talks, travel))
+
+    run_pipeline([("both", ["talks", "travel"], stage, [], False)],
+                 snapshot=Snapshot.load(path),
+                 manifest=BuildManifest(tmp_path / "manifest.json"))
+
+    [(talks, travel)] = seen
+    assert [type(t) for t in talks] == [Talk, Talk]
+    assert [t.title for t in talks] == ["Hot spots", "Decoupling"]
+    assert isinstance(travel[0], Travel) and travel[0].location == "Providence, RI"
+
+
+def test_each_tab_is_parsed_once(site, argv, monkeypatch, tmp_path):
+    import sheet_data
+
+    (site / "cache").mkdir(exist_ok=True)
+    with open(site / "cache" / "talks.csv", "w", encoding="utf-8") as f:
+        f.write("title,type,event,date\n")
+        f.writelines(f"{t['title']},{t['type']},{t['event']},{t['date']}\n" for t in TALKS)
+    parsed = []
+    normalize = sheet_data.normalize_row
+    monkeypatch.setattr(sheet_data, "normalize_row", lambda row: parsed.append(row) or normalize(row))
+    argv.append("--cached")
+    seen = []
+
+    def stage(talks):
+        seen.append(talks)
+
+    snapshot = run_pipeline([("talks", ["talks"], stage, [], False)],
+                            manifest=BuildManifest(tmp_path / "manifest.json"))
+
+    assert len(parsed) == len(TALKS)
+    assert seen == [snapshot.typed["talks"]]
+    assert (site / "cache" / "previous" / "talks.csv").exists()
+
+
+def test_conditional_get_revalidates_with_the_stored_etag(site, server, argv, budget):
+    import sheet_data
+
+    cache_file = site / "cache" / "talks.csv"
+    url = f"{server.url}/talks.csv"
+    server.responses += [
+        (200, {"ETag": '"v1"'}, b"title\nA\n"),
+        (304, {"ETag": '"v1"'}, b""),
+        (200, {"ETag": '"v1"'}, b"title\nA\n"),
+        (200, {"ETag": '"v2"'}, b"title\nB\n"),
+    ]
+    assert sheet_data.conditional_get("talks", url, cache_file) == "updated"
+    assert sheet_data.conditional_get("talks", url, cache_file) == "unchanged"
+    assert server.requests[1][2]["If-None-Match"] == '"v1"'
+    assert sheet_data.conditional_get("talks", url, cache_file) == "unchanged"
+    assert sheet_data.conditional_get("talks", url, cache_file) == "updated"
+    assert cache_file.read_text(encoding="utf-8") == "title\nB\n"
+    assert sheet_data.read_cache_meta("talks")["etag"] == '"v2"'
+    assert not cache_file.with_name("talks.csv.part").exists()
+
+    assert not sheet_data.is_fresh("talks", cache_file)
+    argv += ["--max-age", "60"]
+    assert sheet_data.is_fresh("talks", cache_file)
+
+
+def test_server_errors_are_retried_and_client_errors_are_not(site, server, budget):
+    import sheet_data
+    from http_client import HTTPError
+
+    cache_file = site / "cache" / "talks.csv"
+    server.responses += [(503, {}, b""), (429, {}, b""), (200, {}, b"title\nA\n"), (404, {}, b"")]
+    assert sheet_data.fetch_with_retries("talks", f"{server.url}/a", cache_file) == "updated"
+    assert len(server.requests) == 3
+    with pytest.raises(HTTPError):
+        sheet_data.fetch_with_retries("talks", f"{server.url}/b", cache_file)
+    assert len(server.requests) == 4
+
+
+def test_spent_budget_stops_fetching(site, monkeypatch, budget):
+    import time
+
+    import sheet_data
+
+    monkeypatch.setattr(sheet_data, "_deadline", time.monotonic() - 1)
+    with pytest.raises(TimeoutError):
+        sheet_data.fetch_with_retries("talks", "http://127.0.0.1:9/", site / "cache" / "talks.csv")
+
+
+def test_failed_fetch_falls_back_to_the_cached_tab(site, server, argv, budget, monkeypatch):
+    import sheet_data
+
+    (site / "cache").mkdir()
+    (site / "cache" / "talks.csv").write_text("title\nCached\n", encoding="utf-8")
+    monkeypatch.setattr(sheet_data, "tab_url", lambda tab: f"{server.url}/{tab}.csv")
+    server.responses.append((404, {}, b""))
+    assert [row["title"] for row in sheet_data.fetch_tab("talks")] == ["Cached"]
+    assert sheet_data.TAB_STATUS["talks"] == "stale"
+
+
+def test_stale_while_revalidate_serves_the_cache_and_refreshes_it(site, server, argv, budget,
+                                                                   monkeypatch):
+    import sheet_data
+
+    cache_file = site / "cache" / "talks.csv"
+    cache_file.parent.mkdir()
+    cache_file.write_text("title\nOld\n", encoding="utf-8")
+    monkeypatch.setattr(sheet_data, "tab_url", lambda tab: f"{server.url}/{tab}.csv")
+    server.responses.append((200, {}, b"title\nNew\n"))
+    argv.append("--stale-while-revalidate")
+
+    rows = sheet_data.fetch_tab("talks")
+    sheet_data.wait_for_refreshes()
+    assert sheet_data.TAB_STATUS["talks"] == "revalidating"
+    assert [row["title"] for row in rows] == ["Old"]
+    assert cache_file.read_text(encoding="utf-8") == "title\nNew\n"
+    assert [row["title"] for row in sheet_data.csv_rows(rows.source)] == ["Old"]
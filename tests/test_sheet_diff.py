@@ -0,0 +1,45 @@
+import json
+
+import sheet_diff
+from sheet_diff import diff_rows, diff_tab, row_key, save_changes, write_baseline
+
+OLD = [
+    {"title": "Hot spots", "date": "2024-05-01", "event": "Brown", "location": "RI"},
+    {"title": "Decoupling", "date": "2023-06-01", "event": "ETH", "location": "Zurich"},
+    {"title": "Decoupling", "date": "2023-06-01", "event": "ETH", "location": "Zurich"},
+]
+
+
+def test_rows_are_keyed_on_title_date_and_event():
+    assert row_key({"title": "  Hot   Spots ", "date": "2024-05-01", "notes": "x"}) \
+        == "hot spots | 2024-05-01"
+    assert row_key({"school": "MIT", "degree": "PhD"}) == "phd | mit"
+
+
+def test_edits_inserts_deletes_and_repeated_keys():
+    new = [
+        {**OLD[0], "location": "Providence, RI"},
+        OLD[1],
+        {"title": "Kakeya", "date": "2025-01-01", "event": "IAS", "location": "Princeton"},
+    ]
+    diff = diff_rows(OLD, new)
+    assert list(diff.updated) == ["hot spots | 2024-05-01 | brown"]
+    assert list(diff.inserted) == ["kakeya | 2025-01-01 | ias"]
+    assert list(diff.deleted) == ["decoupling | 2023-06-01 | eth #2"]
+    assert diff.summary() == "+1 ~1 -1"
+    assert not diff_rows(OLD, OLD)
+
+
+def test_diff_tab_against_the_previous_runs_baseline(site):
+    assert diff_tab("talks", OLD, "d1").summary() == "+3 ~0 -0"
+    write_baseline("talks", OLD, "d1")
+    assert not diff_tab("talks", OLD, "d1")
+    assert diff_tab("talks", OLD[:1], "d2").summary() == "+0 ~0 -2"
+
+
+def test_save_changes_keeps_other_tabs(site):
+    save_changes({"talks": diff_rows([], OLD[:1]), "travel": diff_rows([], [])})
+    save_changes({"talks": diff_rows(OLD[:1], [])})
+    changes = json.loads(sheet_diff.CHANGES_PATH.read_text(encoding="utf-8"))
+    assert changes["talks"]["deleted"] == {"hot spots | 2024-05-01 | brown": OLD[0]}
+    assert changes["travel"] == {"inserted": {}, "updated": {}, "deleted": {}}
@@ -0,0 +1,46 @@
+from datetime import date
+
+from records import build_records
+from talk_series import SeriesIndex, normalize_title
+
+TALKS = [
+    {"title": "Hot spots!", "block": "Spectral", "event": "Brown", "date": "2024-05-01",
+     "abstract": "Old."},
+    {"title": "Decoupling", "block": "Fourier", "event": "ETH", "date": "2023-06-01"},
+    {"title": "hot  spots", "block": "Spectral", "event": "MIT", "date": "2022-01-10",
+     "abstract": "Older."},
+    {"title": "Hot spots", "block": "Other", "event": "UCLA", "date": ""},
+    {"title": "", "block": "Spectral", "event": "TBD", "date": "2025-01-01"},
+    {"title": "Hot spots", "block": "Spectral", "event": "Brown", "date": "2024-09-01"},
+]
+
+
+def test_talks_are_grouped_by_block_and_normalized_title():
+    talks = build_records("talks", TALKS)
+    index = SeriesIndex(talks)
+    assert [(s.block, len(s.talks)) for s in index] == [("Spectral", 3), ("Fourier", 1),
+                                                        ("Other", 1)]
+    assert index.of(talks[2]) is index.of(talks[0])
+    assert index.of(talks[4]) is None
+    assert normalize_title("Hot-spots,  again!") == "hot spots again"
+
+
+def test_series_know_their_deliveries_dates_venues_and_abstract():
+    talks = build_records("talks", TALKS)
+    hot = SeriesIndex(talks).of(talks[0])
+    assert [t.event for t in hot.deliveries] == ["MIT", "Brown", "Brown"]
+    assert (hot.first, hot.last) == (date(2022, 1, 10), date(2024, 9, 1))
+    assert hot.title == "Hot spots" and hot.venues == ["MIT", "Brown"]
+    assert hot.abstract_id == talks[0].abstract_id
+
+
+def test_slugs_are_numbered_on_collision_in_sheet_order():
+    assert [s.slug for s in SeriesIndex(build_records("talks", TALKS))] == [
+        "hot-spots", "decoupling", "hot-spots-2"]
+
+
+def test_topics_group_kept_talks_by_block():
+    index = SeriesIndex(build_records("talks", TALKS))
+    topics = index.topics(keep=lambda t: t.day and t.day.year >= 2023)
+    assert [(block, [t.event for t in talks]) for block, talks in topics] == [
+        ("Spectral", ["Brown", "Brown"]), ("Fourier", ["ETH"])]
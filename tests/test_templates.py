@@ -0,0 +1,45 @@
+import pytest
+
+from templates import (TemplateError, Templates, html_escape, md_escape, table_escape,
+                       yaml_escape)
+
+HTML = Templates({
+    "link": '<a href="{{url|raw}}">{{title}}</a>',
+    "item": "<li>{{>link}}{{?venue}} at {{venue|upper}}{{:}} (no venue){{/venue}}</li>",
+    "list": "<ul>{{#items}}{{>item}}{{/items}}</ul>",
+    "shortcode": '{{< figure src="x" >}}{\\bf {{title}}}',
+}, escape=html_escape, filters={"upper": str.upper})
+
+
+def test_slots_escape_filter_and_branch():
+    view = {"url": "/a?b=1&c=2", "title": "Fourier & <friends>", "venue": "ias"}
+    assert HTML.render("item", view) == (
+        '<li><a href="/a?b=1&c=2">Fourier &amp; &lt;friends&gt;</a> at IAS</li>')
+    assert HTML.render("item", {**view, "venue": ""}).endswith(" (no venue)</li>")
+
+
+def test_loops_render_each_item_with_its_own_view():
+    items = [{"url": f"/{n}", "title": n, "venue": ""} for n in ("a", "b")]
+    assert HTML.render("list", {"items": items}).count("<li>") == 2
+    assert list(HTML.render_all("link", items)) == ['<a href="/a">a</a>', '<a href="/b">b</a>']
+
+
+def test_hugo_shortcodes_and_latex_braces_are_literal():
+    assert HTML.render("shortcode", {"title": "T"}) == '{{< figure src="x" >}}{\\bf T}'
+
+
+def test_templates_compile_once():
+    assert HTML["link"] is HTML["link"]
+
+
+@pytest.mark.parametrize("source", [
+    "{{?a}}open", "{{/a}}", "{{#a}}x{{:}}y{{/a}}", "{{a|nope}}", "{{>missing}}"])
+def test_malformed_templates_are_rejected(source):
+    with pytest.raises(TemplateError):
+        Templates({"t": source}, escape=str).render("t", {"a": "x"})
+
+
+def test_escapes():
+    assert md_escape("[1] see") == "\\[1\\] see"
+    assert table_escape("a | b\nc") == "a \\| b c"
+    assert yaml_escape('say "\\hi"') == 'say \\"\\\\hi\\"'
@@ -0,0 +1,79 @@
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from temporal_index import IntervalIndex, TemporalIndex
+
+
+def dated(name, day):
+    return SimpleNamespace(name=name, day=day)
+
+
+RECORDS = [
+    dated("b", date(2024, 3, 1)),
+    dated("undated", None),
+    dated("a", date(2023, 6, 1)),
+    dated("c1", date(2024, 5, 1)),
+    dated("c2", date(2024, 5, 1)),
+    dated("d", date(2025, 1, 1)),
+]
+
+
+def names(records):
+    return [r.name for r in records]
+
+
+def test_upcoming_and_past_split_on_today_keeping_ties_in_sheet_order():
+    index = TemporalIndex(RECORDS)
+    today = date(2024, 5, 1)
+    assert len(index) == 5 and names(index.undated) == ["undated"]
+    assert names(index.upcoming(today)) == ["c1", "c2", "d"]
+    assert names(index.after(today)) == ["d"]
+    assert names(index.past(today)) == ["b", "a"]
+    assert names(index.past(date(2024, 5, 2))) == ["c1", "c2", "b", "a"]
+
+
+def test_between_and_by_year():
+    index = TemporalIndex(RECORDS)
+    assert names(index.between(date(2024, 3, 1), date(2024, 5, 1))) == ["b", "c1", "c2"]
+    assert {year: names(rs) for year, rs in index.by_year().items()} == {
+        2023: ["a"], 2024: ["b", "c1", "c2"], 2025: ["d"]}
+    assert list(index.by_year()) == [2023, 2024, 2025]
+
+
+def trip(name, start, end):
+    return SimpleNamespace(name=name, day=start, end_day=end)
+
+
+def test_enclosing_picks_the_range_that_ends_first():
+    index = IntervalIndex([
+        trip("long", date(2024, 5, 1), date(2024, 5, 31)),
+        trip("short", date(2024, 5, 10), date(2024, 5, 12)),
+        trip("backwards", date(2024, 5, 11), date(2024, 5, 1)),
+        trip("one day", date(2024, 6, 3), None),
+    ])
+    assert len(index) == 3
+    assert index.enclosing(date(2024, 5, 11))[2].name == "short"
+    assert index.enclosing(date(2024, 5, 13))[2].name == "long"
+    assert index.enclosing(date(2024, 6, 3))[2].name == "one day"
+    assert index.enclosing(date(2024, 6, 2)) is None
+    assert index.enclosing(date(2024, 4, 30)) is None
+
+
+def test_queries_match_a_linear_scan():
+    rng = random.Random(7)
+    base = date(2024, 1, 1)
+    trips = []
+    for i in range(200):
+        start = base + timedelta(days=rng.randrange(365))
+        trips.append(trip(i, start, start + timedelta(days=rng.randrange(20))))
+    index = IntervalIndex(trips)
+    by_start = sorted(trips, key=lambda t: t.day)
+    for _ in range(200):
+        lo = base + timedelta(days=rng.randrange(-10, 380))
+        hi = lo + timedelta(days=rng.randrange(10))
+        assert index.overlapping(lo, hi) == [t for t in by_start if t.day <= hi and t.end_day >= lo]
+        inside = [t for t in by_start if t.day <= lo <= t.end_day]
+        expected = min(inside, key=lambda t: t.end_day) if inside else None
+        found = index.enclosing(lo)
+        assert (found and found[2]) is expected
@@ -0,0 +1,72 @@
+import zipfile
+
+import pytest
+
+from workbook import Workbook, column_index, is_date_format
+
+MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# Title, Date, Year, Done, (empty header); a blank row; a row with a gap
+SHEET = f"""<worksheet xmlns="{MAIN}"><sheetData>
+<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c>
+  <c r="C1" t="inlineStr"><is><t>Year</t></is></c><c r="D1" t="s"><v>2</v></c><c r="E1"/></row>
+<row r="2"><c r="A2" t="s"><v>3</v></c><c r="B2" s="1"><v>45413</v></c><c r="C2"><v>2024.0</v></c>
+  <c r="D2" t="b"><v>1</v></c><c r="E2" t="s"><v>3</v></c></row>
+<row r="3"><c r="A3"/></row>
+<row r="4"><c r="A4" t="inlineStr"><is><t>Say "hi", all</t></is></c><c r="C4"><v>2.5</v></c></row>
+</sheetData></worksheet>"""
+
+
+@pytest.fixture
+def xlsx(tmp_path):
+    path = tmp_path / "book.xlsx"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/workbook.xml",
+                    f'<workbook xmlns="{MAIN}" xmlns:r="{REL}"><workbookPr/><sheets>'
+                    f'<sheet name="talks" sheetId="1" r:id="rId1"/></sheets></workbook>')
+        zf.writestr("xl/_rels/workbook.xml.rels",
+                    f'<Relationships xmlns="{PKG_REL}"><Relationship Id="rId1" '
+                    f'Target="worksheets/sheet1.xml"/></Relationships>')
+        zf.writestr("xl/sharedStrings.xml",
+                    f'<sst xmlns="{MAIN}"><si><t>Title</t></si><si><t>Date</t></si>'
+                    f'<si><t>Done</t></si><si><r><t>Hot </t></r><r><t>spots</t></r></si></sst>')
+        zf.writestr("xl/styles.xml",
+                    f'<styleSheet xmlns="{MAIN}"><cellXfs><xf numFmtId="0"/><xf numFmtId="14"/>'
+                    f'</cellXfs></styleSheet>')
+        zf.writestr("xl/worksheets/sheet1.xml", SHEET)
+    return path
+
+
+def test_cells_render_like_the_gviz_export(xlsx):
+    with Workbook(xlsx) as wb:
+        rows = list(wb.iter_rows("talks"))
+    assert rows[0] == ["Title", "Date", "Year", "Done", ""]
+    assert rows[1] == ["Hot spots", "2024-05-01", "2024", "TRUE", "Hot spots"]
+    assert rows[3] == ['Say "hi", all', "", "2.5"]
+
+
+def test_write_csv_matches_the_gviz_layout(xlsx, tmp_path):
+    with Workbook(xlsx) as wb:
+        wb.write_csv("talks", tmp_path / "talks.csv")
+    assert (tmp_path / "talks.csv").read_text(encoding="utf-8") == (
+        '"Title","Date","Year","Done"\n'
+        '"Hot spots","2024-05-01","2024","TRUE"\n'
+        '"Say ""hi"", all","","2.5",""')
+
+
+def test_column_references_and_date_formats():
+    assert [column_index(ref) for ref in ("A1", "Z9", "AA10", "ab3")] == [0, 25, 26, 27]
+    assert is_date_format("yyyy-mm-dd")
+    assert is_date_format('[$-409]d "de" mmmm')
+    assert not is_date_format('0.00" days"')
+
+
+def test_split_workbook_reports_unchanged_tabs(xlsx, tmp_path):
+    from sheet_data import split_workbook
+
+    assert list(split_workbook(xlsx, ["talks", "travel"], tmp_path, "updated")) == [
+        ("talks", "updated")]
+    assert list(split_workbook(xlsx, ["talks"], tmp_path, "updated")) == [("talks", "unchanged")]
+    assert not (tmp_path / "talks.csv.part").exists()